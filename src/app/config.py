@@ -9,14 +9,43 @@ class Config:
     IP = socket.gethostbyname(socket.gethostname())
     API_BASE_URL = "/vs/v1/system"
     API_BASE_URL_STAR = "/vs/v1/star"
+    API_METRICS_URL = "/vs/v1/metrics"
 
     # UDP-Konfiguration
     TIMEOUT_LISTENING_FOR_UPD_RESPONSE = 5  # in Sekunden
+    # "asyncio": eine Event-Loop für alle UDP-Ports, "thread": ein blockierender Thread pro Port,
+    # "batched": ein Thread pro Port, liest stapelweise in vorallokierte Puffer mit begrenzter Queue
+    UDP_LISTENER_MODE = "asyncio"
+    UDP_HANDLER_WORKERS = 8  # Worker-Threads für die Verarbeitung empfangener Datagramme
+    UDP_RECEIVE_QUEUE_SIZE = 256  # Plätze im Empfangs-Ringpuffer (batched)
+    UDP_RECEIVE_BATCH_SIZE = 32  # max. Datagramme pro Lesedurchgang (batched)
+
+    # Discovery über Subnetz-Broadcast ("broadcast") oder IP-Multicast ("multicast");
+    # gilt für HELLO? (STAR_PORT) und HELLO? I AM (GALAXY_PORT)
+    DISCOVERY_MODE = "broadcast"
+    MULTICAST_GROUP = "239.255.81.21"  # Gruppe für Discovery-Nachrichten
+    MULTICAST_TTL = 1  # 1 = nur lokales Subnetz, größere Werte überqueren Router
+    MULTICAST_INTERFACE = "0.0.0.0"  # IP des Interfaces für Senden und Gruppenbeitritt (0.0.0.0 = Standard)
 
     # Broadcast-Konfiguration
     BROADCAST_INTERVAL = 5  # Interval in Sekunden für Broadcasts
     BROADCAST_RETRY_ATTEMPTS = 2  # Anzahl der Widerholungen für HALLO?
     GALAXY_BROADCAST_RETRY_ATTEMPTS = 2
+    GALAXY_BROADCAST_INTERVAL = 4  # Abstand in Sekunden zwischen zwei Galaxy-Broadcasts
+    GALAXY_HANDSHAKE_WORKERS = 4  # parallele Galaxy-Handshakes (POST/PATCH an andere SOLs)
+
+    # HELLO?-Schutz: Token-Bucket und Dedup-Fenster pro Quell-IP
+    HELLO_RATE_LIMIT = 5  # erlaubte HELLO? pro Sekunde und Quelle
+    HELLO_RATE_BURST = 10  # maximale Burst-Größe pro Quelle
+    HELLO_DEDUP_WINDOW = 2.0  # Sekunden, in denen Wiederholungen die gecachte Antwort erhalten
+    HELLO_TRACKED_SOURCES = 4096  # max. verfolgte Quellen (LRU)
+
+    # Discovery: nach der ersten gültigen Antwort nur noch kurz auf weitere SOLs warten
+    DISCOVERY_EARLY_EXIT = True
+    DISCOVERY_GRACE_WINDOW = 0.2  # Sekunden Wartezeit auf konkurrierende SOLs nach der ersten Antwort
+    DISCOVERY_INITIAL_TIMEOUT = 1.0  # Timeout des ersten Versuchs, verdoppelt sich pro Versuch
+    # "text": HELLO?/JSON, "binary": kompaktes Binärformat mit Rückfall auf Text (siehe discovery_codec)
+    DISCOVERY_WIRE_FORMAT = "text"
 
     # Stern- und Komponenten-Konfiguration
     MAX_COMPONENTS = 4  # Maximale Anzahl an Komponenten in einem Stern
@@ -28,23 +57,68 @@ class Config:
     STATUS_UPDATE_RETRY_INTERVALS = [10, 20]  # Retry-Intervalle in Sekunden
     STATUS_UPDATE_MAX_ATTEMPTS = 3  # Maximale Wiederholungsversuche
 
+    # Scheduler für verzögerte und periodische Aufgaben
+    SCHEDULER_WORKERS = 4  # Threads, die fällige Aufgaben ausführen
+
     # Timeout-Konfiguration
     STATUS_UPDATE_TIMEOUT = 5  # Timeout für die HTTP-Requests in Sekunden
 
+    # HTTP-Client (gemeinsamer Keep-Alive-Pool für alle ausgehenden Requests)
+    HTTP_CONNECT_TIMEOUT = 5  # Timeout für den Verbindungsaufbau in Sekunden
+    HTTP_READ_TIMEOUT = 5  # Timeout für die Antwort in Sekunden
+    HTTP_POOL_CONNECTIONS = 16  # Anzahl Hosts mit eigenem Verbindungspool
+    HTTP_POOL_MAXSIZE = 8  # max. Keep-Alive-Verbindungen pro Host
+    HTTP_POOL_BLOCK = False  # bei vollem Pool warten (True) statt zusätzliche Verbindung öffnen
+
+    # HTTP-Server der Komponente ("pooled": feste Worker-Anzahl, "werkzeug": Flask-Entwicklungsserver)
+    HTTP_SERVER_BACKEND = "pooled"
+    HTTP_SERVER_WORKERS = 16  # Worker-Threads pro Server
+    HTTP_SERVER_QUEUE_SIZE = 64  # angenommene Verbindungen, die auf einen Worker warten; darüber 503
+    HTTP_SERVER_BACKLOG = 128  # Länge der Accept-Queue des Sockets (listen backlog)
+    HTTP_SERVER_READ_TIMEOUT = 5  # Sekunden für das Lesen/Schreiben eines Requests, sobald er begonnen hat (belegt so lange einen Worker)
+    HTTP_SERVER_KEEPALIVE_TIMEOUT = 5  # Sekunden, bis eine inaktive Keep-Alive-Verbindung geschlossen wird (belegt keinen Worker)
+    SOL_STARTUP_TIMEOUT = 5  # Sekunden, die eine neue SOL auf ihren HTTP-Server wartet, bevor sie auf HELLO? antwortet
+
+    # Circuit Breaker und Wiederholungen pro Ziel (ip:port)
+    CIRCUIT_FAILURE_THRESHOLD = 3  # aufeinanderfolgende Verbindungsfehler bis zum Öffnen
+    CIRCUIT_OPEN_TIMEOUT = 5  # erste Öffnungszeit in Sekunden, verdoppelt sich bei jedem erneuten Öffnen
+    CIRCUIT_MAX_OPEN_TIMEOUT = 120  # maximale Öffnungszeit in Sekunden
+    RETRY_BASE_DELAY = 0.5  # Basis für exponentielles Backoff in Sekunden
+    RETRY_MAX_DELAY = 8  # maximale Wartezeit zwischen zwei Versuchen in Sekunden
+    GALAXY_REQUEST_ATTEMPTS = 2  # Versuche für Galaxy-POST/PATCH
+
     # Exit-Request-Konfiguration
     EXIT_REQUEST_RETRIES = 2  # Anzahl der Wiederholungen für Exit-Requests
     # fmt: off
     EXIT_REQUEST_WAIT = [10, 20] # Wartezeit zwischen Exit-Request-Versuchen in Sekunden
     # fmt: on
 
+    # Nachrichten
+    MESSAGES_MAX_PAGE_SIZE = 1000  # größter erlaubter Wert für limit bei GET messages
+    # Listen (messages, stars) mit mehr Einträgen werden chunked aus einem Generator gestreamt
+    STREAM_THRESHOLD = 200
+    STREAM_BATCH_SIZE = 100  # Einträge pro gestreamtem Chunk
+    STREAM_READ_SIZE = 16384  # Bytes pro Lesevorgang beim Empfang gestreamter Listen
+    # Persistenz der Nachrichten: Append-only-Log mit Snapshot (None: nur im Speicher)
+    MESSAGE_STORE_DIR = "data"  # relativ zum Arbeitsverzeichnis, wie logs/; darin ein Unterverzeichnis pro STAR_PORT
+    MESSAGE_LOG_SYNC_INTERVAL = 0.05  # Sekunden, in denen Schreibvorgänge für ein gemeinsames fsync gesammelt werden
+    MESSAGE_LOG_COMPACT_BYTES = 4 * 1024 * 1024  # ab dieser Log-Größe wird ein Snapshot geschrieben und das Log gekürzt
+    MESSAGE_SNAPSHOT_INTERVAL = 60  # Sekunden zwischen zwei Prüfungen, ob ein Snapshot nötig ist
+
     # Gesundheitsprüfung
     HEALTH_CHECK_INTERVAL = 30  # Intervall in Sekunden für die Gesundheitsprüfung
     PEER_INACTIVITY_THRESHOLD = 60  # Inaktivitätsgrenze in Sekunden
+    HEALTH_CHECK_WORKERS = 8  # Maximale Anzahl paralleler Status-Abfragen
 
     # Abmeldeversuche
     UNREGISTER_RETRY_COUNT = 2  # Anzahl der Wiederholungen für Abmeldeversuche
     UNREGISTER_RETRY_DELAY = [10, 20]  # Verzögerung in Sekunden zwischen Wiederholungen
 
+    # Shutdown der SOL (paralleles Abmelden bei Komponenten und Sternen)
+    SHUTDOWN_DEADLINE = 8  # Gesamtbudget in Sekunden für alle DELETE-Requests inkl. Wiederholungen
+    SHUTDOWN_WORKERS = 16  # Maximale Anzahl paralleler DELETE-Requests
+    SHUTDOWN_RETRY_DELAY = 0.5  # Basis in Sekunden für das Backoff zwischen zwei Versuchen pro Ziel
+
     # API-Felder
     STAR_UUID_FIELD = "star"
     SOL_UUID_FIELD = "sol"
@@ -1,9 +1,8 @@
 import os
-import threading
-import time
 from app.config import Config
 from flask import after_this_request, request, jsonify
 from utils.logger import global_logger
+from utils.scheduler import scheduler
 
 from model.peer import Peer
 
@@ -62,15 +61,13 @@ def initialize_peer_endpoints(app, peer_service):
 
         @after_this_request
         def shutdown(response):
-            # Run shutdown in a separate thread to avoid blocking response
-            threading.Thread(target=shutdown_system).start()
+            # delay slightly before exiting to ensure response message to sol is sent
+            scheduler.schedule(1, shutdown_system)
             return response
 
         return jsonify({"message": "Shutdown accepted, exiting."}), 200
 
     def shutdown_system():
-        # delay slightly before exiting to ensure response message to sol is sent
-        time.sleep(1)
         # Push the Flask application context to the new thread
         with app.app_context():
             global_logger.info("Shutting down system...")
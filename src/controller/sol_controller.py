@@ -1,12 +1,16 @@
+import functools
+import json
 import os
 import threading
 import time
 from app.config import Config
-from flask import after_this_request, app, request, jsonify
+from flask import Response, after_this_request, app, request, jsonify
+from utils.json_stream import iter_json_object
 from utils.logger import global_logger
 from model.message import Message
 
 from model.peer import Peer
+from model.registry import DUPLICATE, FULL
 
 
 def initialize_sol_endpoints(app, sol_service, message_service):
@@ -16,10 +20,49 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         global_logger.error(logger_message)
         return jsonify({"error": error_message}), status_code
 
+    def messages_response(envelope, fragments, status_code=200):
+        """
+        Baut die JSON-Antwort aus `envelope` und den vorkodierten Nachrichten-Fragmenten (Message.to_json)
+        zusammen, ohne die Nachrichten erneut zu serialisieren.
+        """
+        body = "".join(iter_json_object(envelope, "messages", [fragments]))
+        return Response(body, status=status_code, mimetype="application/json")
+
+    def streamed_response(envelope, key, batches, trailer=None):
+        """
+        Streamt eine große Liste chunked: der Body wird erst beim Senden stückweise aus `batches` erzeugt.
+        """
+        return Response(
+            iter_json_object(envelope, key, batches, trailer), mimetype="application/json"
+        )
+
+    def only_on_port(port):
+        """
+        Beschränkt eine Route auf den Socket mit dem angegebenen Port (STAR_PORT oder GALAXY_PORT);
+        über den anderen Port wird mit 404 geantwortet.
+        """
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                server_port = request.environ.get("SERVER_PORT")
+                if server_port != str(port):
+                    return error_response(
+                        f"{request.method} {request.path} is not served on port {server_port}",
+                        "Not Found",
+                        404,
+                    )
+                return view(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
     def validate_star_uuid(star_uuid, expected_star_uuid):
         return star_uuid == expected_star_uuid
 
     @app.route(Config.API_BASE_URL, methods=["POST"])
+    @only_on_port(Config.STAR_PORT)
     def register_component():
         """
         Handles registration of a new peer.
@@ -51,21 +94,6 @@ def initialize_sol_endpoints(app, sol_service, message_service):
                 401,
             )
 
-        if len(sol_service.sol.registered_peers) >= Config.MAX_COMPONENTS:
-            return error_response(
-                f"Registration failed: SOL is full. Max components: {Config.MAX_COMPONENTS}",
-                "Registration failed: Maximum number of components reached.",
-                403,
-            )
-
-        if sol_service.sol.find_peer(data[Config.COMPONENT_UUID_FIELD]):
-            global_logger.warning()
-            return error_response(
-                f"Registration failed: Component is already registered.",
-                "Conflict: Component {data[Config.COMPONENT_UUID_FIELD]} is already registered.",
-                409,
-            )
-
         peer = Peer(
             ip=data[Config.COMPONENT_IP_FIELD],
             port=data[Config.COMPONENT_TCP_FIELD],
@@ -74,7 +102,22 @@ def initialize_sol_endpoints(app, sol_service, message_service):
             status=data[Config.STATUS_FIELD],
         )
         # TODO: Ist port===com_tcp
-        sol_service.sol.add_peer(peer)
+        peer.set_last_interaction_timestamp()
+        # Kapazitäts- und Duplikatprüfung erfolgen atomar mit dem Einfügen
+        result = sol_service.sol.add_peer(peer, capacity=Config.MAX_COMPONENTS)
+        if result == DUPLICATE:
+            return error_response(
+                f"Registration failed: Component is already registered.",
+                f"Conflict: Component {peer.com_uuid} is already registered.",
+                409,
+            )
+        if result == FULL:
+            return error_response(
+                f"Registration failed: SOL is full. Max components: {Config.MAX_COMPONENTS}",
+                "Registration failed: Maximum number of components reached.",
+                403,
+            )
+        sol_service.touch_peer(peer)
         global_logger.info(f"Component registered successfully: {peer}")
         return (
             jsonify(
@@ -87,6 +130,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         )
 
     @app.route(f"{Config.API_BASE_URL}/<com_uuid>", methods=["GET"])
+    @only_on_port(Config.STAR_PORT)
     def get_component_status(com_uuid):
         """
         Retrieves the status of a registered peer.
@@ -110,7 +154,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
                 404,
             )
 
-        peer.set_last_interaction_timestamp()
+        sol_service.touch_peer(peer)
         return (
             jsonify(
                 {
@@ -126,6 +170,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         )
 
     @app.route(f"{Config.API_BASE_URL}/<com_uuid>", methods=["DELETE"])
+    @only_on_port(Config.STAR_PORT)
     def unregister_component(com_uuid):
         """
         Unregisters a registered peer from the star.
@@ -159,10 +204,12 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         peer.status = "left"
         peer.set_last_interaction_timestamp()
         sol_service.sol.remove_peer(peer)
+        sol_service.forget_peer(peer)
         global_logger.info(f"Component {com_uuid} unregistered successfully.")
         return "ok", 200
 
     @app.route(f"{Config.API_BASE_URL}/<com_uuid>", methods=["PATCH"])
+    @only_on_port(Config.STAR_PORT)
     def update_component_status(com_uuid):
         data = request.get_json()
         com_uuid = int(com_uuid)
@@ -195,12 +242,13 @@ def initialize_sol_endpoints(app, sol_service, message_service):
                 409,
             )
 
-        peer.set_last_interaction_timestamp()
+        sol_service.touch_peer(peer)
         peer.status = data[Config.STATUS_FIELD]
         return jsonify({"message": "Status updated successfully"}), 200
 
     # TODO: Funktioniert aktuell komplett unabhängig von SOL. In der Aufgabe steht aber, dass nur SOL das kann, also eventuell sol_service.message_service?
     @app.route(f"{Config.API_BASE_URL}/messages", methods=["POST"])
+    @only_on_port(Config.STAR_PORT)
     def create_message():
         data = request.get_json()
         star_uuid = data.get(Config.STAR_UUID_FIELD)
@@ -247,6 +295,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         return jsonify({"msg-id": msg_id}), 200
 
     @app.route(f"{Config.API_BASE_URL}/messages/<msg_id>", methods=["DELETE"])
+    @only_on_port(Config.STAR_PORT)
     def delete_message(msg_id):
         star_uuid = request.args.get(Config.STAR_UUID_FIELD)
         msg_id = int(msg_id)
@@ -265,7 +314,8 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         return "ok", 200
 
     # TODO: "Alle Komponenten, die in den Stern integriert sind – also auch SOL, können die Liste der Nachrichten abfragen." also doch nicht sol_service.message_service?
-    @app.route(f"{Config.API_BASE_URL}messages", methods=["GET"])
+    @app.route(f"{Config.API_BASE_URL}/messages", methods=["GET"])
+    @only_on_port(Config.STAR_PORT)
     def list_messages():
         star_uuid = request.args.get(Config.STAR_UUID_FIELD)
         allowed_scopes = {"active", "all"}
@@ -288,22 +338,44 @@ def initialize_sol_endpoints(app, sol_service, message_service):
             return error_response(
                 f"Invalid view value {view}", "Invalid view value.", 400
             )
+        # Pagination: ohne limit wird die komplette Liste geliefert
+        limit = request.args.get("limit", type=int)
+        cursor = request.args.get("cursor", type=int)
+        if "limit" in request.args and (
+            limit is None or not 1 <= limit <= Config.MESSAGES_MAX_PAGE_SIZE
+        ):
+            return error_response(
+                f"Invalid limit value {request.args.get('limit')}", "Invalid limit value.", 400
+            )
+        if "cursor" in request.args and (cursor is None or cursor < 0):
+            return error_response(
+                f"Invalid cursor value {request.args.get('cursor')}", "Invalid cursor value.", 400
+            )
 
-        messages = message_service.list_messages(scope=scope, view=view)
-        return (
-            jsonify(
-                {
-                    "star": star_uuid,
-                    "totalResults": len(messages),
-                    "scope": scope,
-                    "view": view,
-                    "messages": messages,
-                }
-            ),
-            200,
+        total = message_service.count_messages(scope)
+        envelope = {"star": star_uuid, "totalResults": total, "scope": scope, "view": view}
+        if min(total, limit or total) > Config.STREAM_THRESHOLD:
+            # nextCursor steht erst nach dem letzten Batch fest und kommt deshalb ans Ende
+            last_cursor = [None]
+
+            def batches():
+                for fragments, next_cursor in message_service.iter_message_json(
+                    scope, view, limit, cursor
+                ):
+                    last_cursor[0] = next_cursor
+                    yield fragments
+
+            return streamed_response(
+                envelope, "messages", batches(), lambda: {"nextCursor": last_cursor[0]}
+            )
+
+        fragments, next_cursor = message_service.list_message_json(
+            scope=scope, view=view, limit=limit, cursor=cursor
         )
+        return messages_response({**envelope, "nextCursor": next_cursor}, fragments)
 
     @app.route(f"{Config.API_BASE_URL}/messages/<msg_id>", methods=["GET"])
+    @only_on_port(Config.STAR_PORT)
     def get_message(msg_id):
         msg_id = int(msg_id)
 
@@ -340,22 +412,13 @@ def initialize_sol_endpoints(app, sol_service, message_service):
                 404,
             )
 
-        return (
-            jsonify(
-                {
-                    "star": star_uuid,
-                    "totalResults": 1,
-                    "messages": [
-                        message.to_dict(
-                            view="header" if message.status == "active" else "id"
-                        )
-                    ],
-                }
-            ),
-            200,
+        return messages_response(
+            {"star": star_uuid, "totalResults": 1},
+            [message.to_json(view="header" if message.status == "active" else "id")],
         )
 
-    @app.route(f"{Config.API_BASE_URL_STAR}", methods=["GET"])
+    @app.route(f"{Config.API_BASE_URL_STAR}/<star_uuid>", methods=["GET"])
+    @only_on_port(Config.GALAXY_PORT)
     def get_star_info(star_uuid):
         """
         Gibt Informationen zu einem spezifischen Stern aus.
@@ -372,7 +435,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
                     "sol": sol_service.peer.com_uuid,
                     "sol-ip": Config.IP,
                     "sol-tcp": sol_service.star_port,
-                    "no-com": sol_service.num_active_com,
+                    "no-com": len(sol_service.sol.registered_peers),
                     "status": "active",
                 }
             ),
@@ -380,15 +443,24 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         )
 
     @app.route(f"{Config.API_BASE_URL_STAR}", methods=["GET"])
+    @only_on_port(Config.GALAXY_PORT)
     def list_all_stars():
         """
         Gibt alle bekannten Sterne und deren SOL-Komponenten aus.
         """
-        stars = [star.to_dict() for star in sol_service.get_star_list()]
-
-        return jsonify({"totalResults": len(stars), "stars": stars}), 200
+        snapshot = sol_service.get_star_list()
+        if len(snapshot) > Config.STREAM_THRESHOLD:
+            # direkt aus dem unveränderlichen Snapshot streamen statt die Antwort aufzubauen
+            batch_size = Config.STREAM_BATCH_SIZE
+            batches = (
+                [json.dumps(star.to_dict()) for star in snapshot[i : i + batch_size]]
+                for i in range(0, len(snapshot), batch_size)
+            )
+            return streamed_response({"totalResults": len(snapshot)}, "stars", batches)
+        return jsonify(sol_service.get_star_list_response()), 200
 
     @app.route(f"{Config.API_BASE_URL_STAR}/<star_uuid>", methods=["DELETE"])
+    @only_on_port(Config.GALAXY_PORT)
     def unregister_star(star_uuid):
         """
         Endpunkt, um ein SOL bei einem Star abzumelden.
@@ -412,7 +484,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         global_logger.info(f"Received unregister request for Star {star_uuid}.")
 
         # Führe Abmelde-Logik aus (falls erforderlich, z. B. Peer-Status ändern oder SOL entfernen)
-        star.status = "unregistered"
+        sol_service.update_star_status(star_uuid, "unregistered")
 
         return (
             jsonify(
@@ -422,6 +494,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         )
 
     @app.route(f"{Config.API_BASE_URL_STAR}", methods=["POST"])
+    @only_on_port(Config.GALAXY_PORT)
     def handle_galaxy_star_entry():
         data = request.get_json()
 
@@ -446,6 +519,7 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         return jsonify(response), 200
 
     @app.route(f"{Config.API_BASE_URL_STAR}/<star_uuid>", methods=["PATCH"])
+    @only_on_port(Config.GALAXY_PORT)
     def handle_galaxy_star_update(star_uuid):
         data = request.get_json()
 
@@ -458,3 +532,10 @@ def initialize_sol_endpoints(app, sol_service, message_service):
         sol_service.add_star(star_uuid, sol, sol_ip, sol_tcp, no_com, status)
 
         return jsonify("Patch successful"), 200
+
+    @app.route(Config.API_METRICS_URL, methods=["GET"])
+    def get_metrics():
+        """
+        Gibt die Laufzeit-Zähler des SOL aus (z.B. HELLO?-Rate-Limiting, UDP-Queues).
+        """
+        return jsonify(sol_service.get_metrics()), 200
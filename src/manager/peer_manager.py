@@ -2,6 +2,7 @@ import os
 import threading
 from app.config import Config
 from controller import peer_controller
+from utils import http_server
 from utils.logger import global_logger
 
 
@@ -12,7 +13,7 @@ class PeerManager:
         self.is_sol = self.peerService.peer.is_sol
 
     def run_flask(self):
-        self.app.run(host=Config.IP, port=Config.STAR_PORT)
+        http_server.serve(self.app, Config.IP, Config.STAR_PORT)
 
     """
     Übernimmt die Verwaltung der Verbindungen des Peers.
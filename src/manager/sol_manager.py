@@ -1,10 +1,13 @@
 import threading
-import time
 from app.config import Config
 from controller import sol_controller
+from utils import http_server
 from utils.logger import global_logger
+from utils.scheduler import scheduler
+from service import discovery_codec
 from service.message_service import MessageService
-from service.udp_service import UdpService
+from service.message_store import MessageStore
+from service.udp_service import UdpService, UdpDiscoveryEngine
 
 
 class SolManager:
@@ -12,7 +15,11 @@ class SolManager:
 
         self.sol_service = sol_service
         self.app = app
-        self.message_service = MessageService()
+        self.message_service = MessageService(
+            MessageStore() if Config.MESSAGE_STORE_DIR else None
+        )
+        self.udp_engine = None
+        self.http_ready = threading.Event()  # gesetzt, sobald STAR_PORT und GALAXY_PORT lauschen
 
         # initialize sol endpoints and start flask server in a new thread
         sol_controller.initialize_sol_endpoints(
@@ -23,21 +30,23 @@ class SolManager:
 
 
     def run_flask(self):
+        # ein Server für STAR_PORT und GALAXY_PORT; die Routen sind per Port eingeschränkt
+        flask_thread = threading.Thread(target=self.run_flask_on_ports)
+        flask_thread.daemon = True  # Ensure thread ends when the main program ends
+        flask_thread.start()
+
+    def run_flask_on_ports(self):
+        """Run the Flask app on STAR_PORT and GALAXY_PORT."""
+        http_server.serve(
+            self.app, Config.IP, [Config.STAR_PORT, Config.GALAXY_PORT], ready=self.http_ready
+        )
 
-        flask_thread_1 = threading.Thread(target=self.run_flask_on_port, args=(Config.STAR_PORT,))
-        flask_thread_1.daemon = True  # Ensure thread ends when the main program ends
-        flask_thread_1.start()
-
-        flask_thread_2 = threading.Thread(target=self.run_flask_on_port, args=(Config.GALAXY_PORT,))
-        flask_thread_2.daemon = True  # Ensure thread ends when the main program ends
-        flask_thread_2.start()
-
-    def run_flask_on_port(self, port):
-        """Run the Flask app on a specific port."""
-        self.app.run(host=Config.IP, port=port)
-
-    def manage(self):
+    def wait_until_ready(self, timeout=None):
+        """Block until the REST API accepts connections; False if that did not happen within `timeout`."""
+        return self.http_ready.wait(timeout)
 
+    def start_listener_threads(self):
+        """Start one blocking listener thread per port (UDP_LISTENER_MODE = "thread")."""
         # setting up a thread to listen for Hello?-messages
         try:
             # Start a thread to listen for HELLO? messages
@@ -58,26 +67,58 @@ class SolManager:
         except Exception as e:
             global_logger.error(f"Failed to start galaxy listener thread: {e}")
 
-        try:
-            # Start a thread for health checks
-            health_check_thread = threading.Thread(
-                target=self.sol_service.check_peer_health
-            )
-            health_check_thread.start()
-        except Exception as e:
-            global_logger.error(f"Failed to start health-check thread: {e}")
+    def galaxy_hello_message(self, attempt):
+        """
+        Im binären Discovery-Format wird der erste Galaxy-Broadcast binär gesendet,
+        alle weiteren als Text, damit auch ältere SOLs den Stern kennenlernen.
+        """
+        star_uuid = self.sol_service.star_uuid
+        if Config.DISCOVERY_WIRE_FORMAT == "binary" and attempt == 0:
+            try:
+                return discovery_codec.encode_hello_i_am(star_uuid)
+            except ValueError:
+                pass
+        return f"HELLO? I AM {star_uuid}"
 
-        for attempt in range(Config.GALAXY_BROADCAST_RETRY_ATTEMPTS):
-            # Broadcast Galaxy HELLO?
-            global_logger.info("Sending galaxy-broadcast...")
+    def manage(self):
+
+        if Config.UDP_LISTENER_MODE == "asyncio":
+            # eine Event-Loop bedient STAR_PORT und GALAXY_PORT gemeinsam
             try:
-                UdpService.broadcast_message(
-                    Config.GALAXY_PORT, f"HELLO? I AM {self.sol_service.star_uuid}"
+                self.udp_engine = UdpDiscoveryEngine()
+                self.udp_engine.add_listener(
+                    Config.STAR_PORT, self.sol_service.handle_hello
                 )
-            except Exception as e:
-                global_logger.error(
-                    f"Failed to broadcast Galaxy HELLO?: {self.sol_service.star_uuid}"
+                self.udp_engine.add_listener(
+                    Config.GALAXY_PORT, self.sol_service.handle_hello
                 )
-                continue
+                self.udp_engine.start()
+                global_logger.info("SOL is listening for HELLO? messages...")
+            except Exception as e:
+                global_logger.error(f"Failed to start UDP discovery engine: {e}")
+        else:
+            self.start_listener_threads()
+
+        try:
+            self.sol_service.check_peer_health()
+        except Exception as e:
+            global_logger.error(f"Failed to schedule health checks: {e}")
+
+        for attempt in range(Config.GALAXY_BROADCAST_RETRY_ATTEMPTS):
+            scheduler.schedule(
+                attempt * Config.GALAXY_BROADCAST_INTERVAL,
+                self.broadcast_galaxy_hello,
+                attempt,
+            )
 
-            time.sleep(4)
+    def broadcast_galaxy_hello(self, attempt):
+        # Broadcast Galaxy HELLO?
+        global_logger.info("Sending galaxy-broadcast...")
+        try:
+            UdpService.broadcast_message(
+                Config.GALAXY_PORT, self.galaxy_hello_message(attempt)
+            )
+        except Exception as e:
+            global_logger.error(
+                f"Failed to broadcast Galaxy HELLO?: {self.sol_service.star_uuid}"
+            )
@@ -1,3 +1,4 @@
+import json
 import time
 
 
@@ -12,16 +13,19 @@ class Message:
         self.status = "active"
         self.created = int(time.time())  # UNIX-Zeitstempel
         self.changed = self.created
+        self._json = {}  # view -> vorkodiertes JSON-Fragment, wird bei jeder Änderung verworfen
 
     def update(self, subject, message):
         self.subject = subject.split('\n', 1)[0].replace('\r', '')
         self.message = message
         self.version += 1
         self.changed = int(time.time())
+        self._json = {}
 
-    def mark_deleted(self):
+    def mark_deleted(self, changed=None):
         self.status = "deleted"
-        self.changed = int(time.time())
+        self.changed = int(time.time()) if changed is None else changed  # beim Wiederherstellen aus dem Log
+        self._json = {}
 
     def to_dict(self, view="header"):
         if view == "header":
@@ -36,3 +40,46 @@ class Message:
             }
         elif view == "id":
             return {"msg-id": self.msg_id, "status": self.status}
+
+    def to_record(self):
+        """Vollständiger Zustand für das Nachrichten-Log (siehe MessageStore)."""
+        return {
+            "msg-id": self.msg_id,
+            "origin": self.origin,
+            "sender": self.sender,
+            "subject": self.subject,
+            "message": self.message,
+            "version": self.version,
+            "status": self.status,
+            "created": self.created,
+            "changed": self.changed,
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        message = cls(record["origin"], record["sender"], "", "", record["msg-id"])
+        message.apply_record(record)
+        return message
+
+    def apply_record(self, record):
+        """Übernimmt den Zustand aus einem Log-Datensatz (beim Wiederherstellen)."""
+        self.subject = record["subject"]
+        self.message = record["message"]
+        self.version = record["version"]
+        self.status = record["status"]
+        self.created = record["created"]
+        self.changed = record["changed"]
+        self._json = {}
+
+    def to_json(self, view="header"):
+        """
+        JSON-Fragment von to_dict(view), einmal kodiert und bis zur nächsten Änderung zwischengespeichert.
+        """
+        # Cache vor dem Lesen der Felder holen: eine parallele Änderung ersetzt ihn danach,
+        # ein veraltetes Fragment landet also höchstens im verworfenen Cache
+        cache = self._json
+        fragment = cache.get(view)
+        if fragment is None:
+            fragment = json.dumps(self.to_dict(view), separators=(",", ":"))
+            cache[view] = fragment
+        return fragment
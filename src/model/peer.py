@@ -1,8 +1,27 @@
 # Definiert die Peer-Klasse, die die Eigenschaften und Methoden eines Peers repräsentiert.
+import time
 from datetime import datetime
 
 
+def monotonic_to_iso(timestamp):
+    """Rechnet einen time.monotonic()-Zeitstempel in eine ISO-Uhrzeit um (nur für API/Logs)."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(time.time() - (time.monotonic() - timestamp)).isoformat()
+
+
 class Peer:
+    __slots__ = (
+        "ip",
+        "port",
+        "com_uuid",
+        "com_tcp",
+        "is_sol",
+        "status",
+        "sol_connection",
+        "last_interaction_timestamp",
+    )
+
     def __init__(self, ip, port, com_uuid=None, com_tcp=None, status=None):
         self.ip = ip
         self.port = port
@@ -11,9 +30,11 @@ class Peer:
         self.is_sol = False
         self.status = status or 200
         self.sol_connection = None
-        self.last_interaction_timestamp = None
+        self.last_interaction_timestamp = None  # time.monotonic() der letzten Interaktion
 
     class SolConnection:
+        __slots__ = ("ip", "port", "uuid", "star_uuid")
+
         def __init__(self, ip, port, uuid, star_uuid):
             self.ip = ip
             self.port = port
@@ -21,7 +42,16 @@ class Peer:
             self.star_uuid = star_uuid
 
     def set_last_interaction_timestamp(self):
-        self.last_interaction_timestamp = datetime.now().isoformat()
+        self.last_interaction_timestamp = time.monotonic()
+
+    def seconds_since_last_interaction(self, now=None):
+        """Sekunden seit der letzten Interaktion, None falls es noch keine gab."""
+        if self.last_interaction_timestamp is None:
+            return None
+        return (time.monotonic() if now is None else now) - self.last_interaction_timestamp
+
+    def last_interaction_iso(self):
+        return monotonic_to_iso(self.last_interaction_timestamp)
 
     def to_dict(self):
         return {
@@ -30,4 +60,4 @@ class Peer:
             "com_uuid": self.com_uuid,
             "com_tcp": self.com_tcp,
             "status": self.status
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,135 @@
+# Definiert eine indizierte Registry mit unveränderlichen Snapshots (copy-on-write).
+from threading import Lock
+from types import MappingProxyType
+
+# Ergebnis von IndexedRegistry.add
+ADDED = "added"
+DUPLICATE = "duplicate"
+FULL = "full"
+
+
+class RegistrySnapshot:
+    """
+    Unveränderlicher Stand der Registry. Leser arbeiten ohne Lock auf einem Snapshot;
+    Änderungen erzeugen einen neuen Snapshot und lassen bestehende unberührt.
+    """
+
+    __slots__ = ("by_key", "indexes", "items")
+
+    def __init__(self, by_key, indexes):
+        self.by_key = MappingProxyType(by_key)
+        self.indexes = {name: MappingProxyType(index) for name, index in indexes.items()}
+        self.items = tuple(by_key.values())
+
+    def get(self, key):
+        return self.by_key.get(key)
+
+    def find_by(self, index, value):
+        """All items whose `index` attribute equals `value` (empty tuple if none)."""
+        return self.indexes[index].get(value, ())
+
+    def __len__(self):
+        return len(self.by_key)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, position):
+        return self.items[position]
+
+    def __contains__(self, key):
+        return key in self.by_key
+
+
+class IndexedRegistry:
+    """
+    Registry mit Primärschlüssel und optionalen Sekundärindizes.
+
+    Schreiber serialisieren sich über einen Lock, kopieren den aktuellen Stand, ändern die Kopie
+    und veröffentlichen sie als neuen Snapshot (eine atomare Zuweisung). Lesen, Nachschlagen und
+    Größenabfragen greifen nur auf den aktuellen Snapshot zu und sind O(1) ohne Lock.
+    """
+
+    def __init__(self, key, indexes=None):
+        self._key = key  # callable(item) -> Primärschlüssel
+        self._index_keys = dict(indexes or {})  # name -> callable(item) -> Indexwert
+        self._write_lock = Lock()
+        self._snapshot = RegistrySnapshot({}, {name: {} for name in self._index_keys})
+
+    def snapshot(self):
+        return self._snapshot
+
+    def get(self, key):
+        return self._snapshot.get(key)
+
+    def find_by(self, index, value):
+        return self._snapshot.find_by(index, value)
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def __iter__(self):
+        return iter(self._snapshot)
+
+    def __contains__(self, key):
+        return key in self._snapshot
+
+    def add(self, item, capacity=None):
+        """Insert `item` unless `capacity` is reached or its key exists; returns ADDED, FULL or DUPLICATE."""
+        key = self._key(item)
+        with self._write_lock:
+            current = self._snapshot
+            if capacity is not None and len(current) >= capacity:
+                return FULL
+            if key in current.by_key:
+                return DUPLICATE
+            by_key = dict(current.by_key)
+            by_key[key] = item
+            indexes = {name: dict(index) for name, index in current.indexes.items()}
+            for name, index_key in self._index_keys.items():
+                value = index_key(item)
+                indexes[name][value] = indexes[name].get(value, ()) + (item,)
+            self._snapshot = RegistrySnapshot(by_key, indexes)
+            return ADDED
+
+    def put(self, item):
+        """Insert or replace the item with the key of `item`; returns the replaced item or None."""
+        key = self._key(item)
+        with self._write_lock:
+            previous = self._snapshot.get(key)
+            by_key, indexes = self._copy_without(key, previous)
+            by_key[key] = item
+            for name, index_key in self._index_keys.items():
+                value = index_key(item)
+                indexes[name][value] = indexes[name].get(value, ()) + (item,)
+            self._snapshot = RegistrySnapshot(by_key, indexes)
+            return previous
+
+    def remove(self, key):
+        """Remove the item with `key`; returns it, or None if it was not registered."""
+        with self._write_lock:
+            item = self._snapshot.get(key)
+            if item is None:
+                return None
+            by_key, indexes = self._copy_without(key, item)
+            self._snapshot = RegistrySnapshot(by_key, indexes)
+            return item
+
+    def clear(self):
+        with self._write_lock:
+            self._snapshot = RegistrySnapshot({}, {name: {} for name in self._index_keys})
+
+    def _copy_without(self, key, item):
+        current = self._snapshot
+        by_key = dict(current.by_key)
+        indexes = {name: dict(index) for name, index in current.indexes.items()}
+        if item is not None:
+            del by_key[key]
+            for name, index_key in self._index_keys.items():
+                value = index_key(item)
+                remaining = tuple(other for other in indexes[name].get(value, ()) if other is not item)
+                if remaining:
+                    indexes[name][value] = remaining
+                else:
+                    indexes[name].pop(value, None)
+        return by_key, indexes
@@ -1,5 +1,7 @@
 # Definiert die Star-Klasse, die den Stern und seine Eigenschaften beschreibt.
-from threading import Lock
+from operator import attrgetter
+
+from model.registry import IndexedRegistry
 
 
 class SOL:
@@ -12,26 +14,25 @@ class SOL:
         self.num_active_components = None
         self.max_active_components = None
         self.sol_initialized_at = None
-        self.registered_peers = []
-        self.peers_lock = Lock()
-        self.galaxy_stars = []
+        # registrierte Komponenten nach com_uuid, zusätzlich nach IP indiziert
+        self.peers = IndexedRegistry(
+            key=attrgetter("com_uuid"), indexes={"ip": attrgetter("ip")}
+        )
 
+    @property
+    def registered_peers(self):
+        """Unveränderlicher Snapshot aller registrierten Komponenten (ohne Lock lesbar)."""
+        return self.peers.snapshot()
 
-    def add_peer(self, peer):
-        with self.peers_lock:
-            self.registered_peers.append(peer)
+    def add_peer(self, peer, capacity=None):
+        """Registriert `peer`; gibt ADDED, DUPLICATE oder FULL (siehe model.registry) zurück."""
+        return self.peers.add(peer, capacity)
 
     def remove_peer(self, peer):
-        with self.peers_lock:
-            self.registered_peers.remove(peer)
+        return self.peers.remove(peer.com_uuid)
 
     def find_peer(self, com_uuid):
-        with self.peers_lock:
-            return next((p for p in self.registered_peers if p.com_uuid == com_uuid), None)
-
-    def add_star(self, star):
-        self.galaxy_stars.append(star)
-
-    def find_star(self, star_uuid):
-        return next((star for star in self.galaxy_stars if star.star_uuid == star_uuid), None)
+        return self.peers.get(com_uuid)
 
+    def find_peers_by_ip(self, ip):
+        return self.peers.find_by("ip", ip)
@@ -1,4 +1,6 @@
 class Star:
+    __slots__ = ("star_uuid", "sol_uuid", "sol_ip", "sol_tcp", "no_com", "status")
+
     def __init__(self, star_uuid, sol_uuid, sol_ip, sol_tcp, no_com, status):
         self.star_uuid = star_uuid
         self.sol_uuid = sol_uuid
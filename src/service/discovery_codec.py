@@ -0,0 +1,119 @@
+import socket
+import struct
+from collections import namedtuple
+
+'''
+Binäres Discovery-Format (Version 1) als Alternative zum Textprotokoll
+("HELLO?", "HELLO? I AM <uuid>" und JSON-Antworten).
+
+Header:        magic "VS" | version (1 Byte) | typ (1 Byte)
+HELLO:         Header
+HELLO_I_AM:    Header | star-uuid (16 Byte, MD5 binär)
+SOL_RESPONSE:  Header | star-uuid (16 Byte) | sol (uint16) | sol-ip (IPv4, 4 Byte) | sol-tcp (uint16)
+                      | component (uint16) | no-com (uint16)
+
+Alle Zahlen in Network Byte Order. Der Header besteht nur aus ASCII-Bytes, damit ältere Knoten
+eine binäre HELLO?-Anfrage als unbekannte Nachricht verwerfen statt abzustürzen.
+Ein SOL antwortet immer im Format der Anfrage; ein Peer fällt nach einem unbeantworteten
+binären Versuch auf das Textprotokoll zurück.
+'''
+
+MAGIC = b"VS"
+VERSION = 1
+
+HELLO = 1
+HELLO_I_AM = 2
+SOL_RESPONSE = 3
+
+_HEADER = struct.Struct("!2sBB")
+_STAR = struct.Struct("!16s")
+_RESPONSE_FIXED = struct.Struct("!16sH4sH")  # star, sol, sol-ip, sol-tcp
+_RESPONSE_VARIABLE = struct.Struct("!HH")  # component, no-com
+
+# kind: HELLO, HELLO_I_AM oder SOL_RESPONSE; response: dict mit den Feldern der JSON-Antwort
+DiscoveryPacket = namedtuple("DiscoveryPacket", ["kind", "star_uuid", "response"])
+
+
+def is_binary(data):
+    return data[:2] == MAGIC
+
+
+def encode_hello():
+    return _HEADER.pack(MAGIC, VERSION, HELLO)
+
+
+def encode_hello_i_am(star_uuid):
+    return _HEADER.pack(MAGIC, VERSION, HELLO_I_AM) + _STAR.pack(bytes.fromhex(star_uuid))
+
+
+def encode_response_prefix(star_uuid, sol_uuid, sol_ip, sol_tcp):
+    """
+    Encode the part of a SOL_RESPONSE that is fixed for a star.
+    Raises ValueError if a field does not fit the binary format.
+    """
+    try:
+        return _HEADER.pack(MAGIC, VERSION, SOL_RESPONSE) + _RESPONSE_FIXED.pack(
+            bytes.fromhex(star_uuid),
+            int(sol_uuid),
+            socket.inet_aton(sol_ip),
+            int(sol_tcp),
+        )
+    except (struct.error, OSError, TypeError) as e:
+        raise ValueError(f"Star cannot be encoded in binary discovery format: {e}")
+
+
+def encode_response_suffix(component, no_com):
+    try:
+        return _RESPONSE_VARIABLE.pack(int(component), int(no_com))
+    except struct.error as e:
+        raise ValueError(f"Response cannot be encoded in binary discovery format: {e}")
+
+
+def decode(data):
+    """
+    Decode a binary discovery datagram (bytes or memoryview) into a DiscoveryPacket.
+    Raises ValueError for malformed packets or unsupported versions.
+    """
+    try:
+        magic, version, kind = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported discovery packet version {version}")
+        offset = _HEADER.size
+
+        if kind == HELLO:
+            return DiscoveryPacket(HELLO, None, None)
+
+        if kind == HELLO_I_AM:
+            (star,) = _STAR.unpack_from(data, offset)
+            return DiscoveryPacket(HELLO_I_AM, star.hex(), None)
+
+        if kind == SOL_RESPONSE:
+            star, sol, sol_ip, sol_tcp = _RESPONSE_FIXED.unpack_from(data, offset)
+            component, no_com = _RESPONSE_VARIABLE.unpack_from(
+                data, offset + _RESPONSE_FIXED.size
+            )
+            response = {
+                "star": star.hex(),
+                "sol": sol,
+                "sol-ip": socket.inet_ntoa(sol_ip),
+                "sol-tcp": sol_tcp,
+                "component": component,
+                "no-com": no_com,
+            }
+            return DiscoveryPacket(SOL_RESPONSE, response["star"], response)
+    except struct.error as e:
+        raise ValueError(f"Malformed discovery packet: {e}")
+
+    raise ValueError(f"Unknown discovery packet type {kind}")
+
+
+def parse_text_hello(message):
+    """
+    Parse a text discovery message. Returns (HELLO, None), (HELLO_I_AM, star_uuid) or (None, None).
+    """
+    parts = message.strip().split()
+    if parts == ["HELLO?"]:
+        return HELLO, None
+    if len(parts) == 4 and parts[0] == "HELLO?" and parts[1] == "I" and parts[2] == "AM":
+        return HELLO_I_AM, parts[3]
+    return None, None
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from utils.logger import global_logger
+
+
+class GalaxyHandshakeQueue:
+    """
+    Führt Galaxy-Handshakes (POST/PATCH an andere SOLs) im Hintergrund aus.
+
+    Pro star_uuid läuft höchstens ein Handshake gleichzeitig; weitere Ankündigungen desselben
+    Sterns während dieser Zeit werden an den laufenden Handshake angehängt statt neu gesendet.
+    """
+
+    def __init__(self, handshake, max_workers):
+        self._handshake = handshake  # callable(star_uuid, ip)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="galaxy-handshake"
+        )
+        self._in_flight = {}  # star_uuid -> Future
+        self._lock = Lock()
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def submit(self, star_uuid, ip):
+        """Queue a handshake with the star at `ip` and return its Future."""
+        with self._lock:
+            future = self._in_flight.get(star_uuid)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._executor.submit(self._run, star_uuid, ip)
+            self._in_flight[star_uuid] = future
+            self.submitted += 1
+            return future
+
+    def _run(self, star_uuid, ip):
+        try:
+            return self._handshake(star_uuid, ip)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            global_logger.error(f"Galaxy handshake with star {star_uuid} at {ip} failed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.pop(star_uuid, None)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+                "in_flight": len(self._in_flight),
+            }
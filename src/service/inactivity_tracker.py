@@ -0,0 +1,70 @@
+from threading import Lock
+
+from utils.logger import global_logger
+from utils.scheduler import scheduler as shared_scheduler
+
+
+class InactivityTracker:
+    """
+    Überwacht die Inaktivität vieler Einträge über je einen Timer im Scheduler (Heap nach Fälligkeit).
+
+    touch() verschiebt die Frist eines Eintrags um `threshold` Sekunden (O(log n)); erst wenn eine
+    Frist tatsächlich abläuft, wird `on_expired(key, item)` aufgerufen. Es gibt keinen periodischen
+    Durchlauf über alle Einträge, die Kosten hängen also nicht von der Größe der Registry ab.
+    Nach Ablauf ist der Eintrag nicht mehr überwacht, bis er erneut mit touch() angemeldet wird.
+    """
+
+    def __init__(self, threshold, on_expired, scheduler=None):
+        self.threshold = threshold
+        self._on_expired = on_expired  # callable(key, item), läuft auf einem Scheduler-Worker
+        self._scheduler = scheduler or shared_scheduler
+        self._timers = {}  # key -> TimerHandle
+        self._lock = Lock()
+        self.expired = 0
+
+    def touch(self, key, item, delay=None):
+        """(Re)start the inactivity deadline of `key`; `delay` defaults to the threshold."""
+        delay = self.threshold if delay is None else delay
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is not None and timer.args[1] is item:
+                timer.reschedule(delay)
+                return
+            if timer is not None:
+                timer.cancel()
+            self._timers[key] = self._scheduler.schedule(delay, self._expire, key, item)
+
+    def forget(self, key):
+        with self._lock:
+            timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+    def clear(self):
+        with self._lock:
+            timers, self._timers = self._timers, {}
+        for timer in timers.values():
+            timer.cancel()
+
+    def _expire(self, key, item):
+        with self._lock:
+            timer = self._timers.get(key)
+            # inzwischen neu angemeldet oder verschoben: nichts zu tun
+            if timer is None or timer.args[1] is not item or timer.remaining() > 0:
+                return
+            del self._timers[key]
+            self.expired += 1
+        try:
+            self._on_expired(key, item)
+        except Exception as e:
+            global_logger.error(f"Handling inactivity of {key} failed: {e}")
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key):
+        return key in self._timers
+
+    def stats(self):
+        with self._lock:
+            return {"tracked": len(self._timers), "expired": self.expired}
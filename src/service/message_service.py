@@ -1,16 +1,42 @@
+from bisect import bisect_left, bisect_right
 from threading import Lock
 
 import requests
 
 from app.config import Config
+from model.message import Message
+from service.message_store import CREATE, DELETE, UPDATE
+from service.tcp_service import http_client
+from utils.json_stream import JsonArrayStream
 from utils.logger import global_logger
+from utils.scheduler import scheduler
 
 
 class MessageService:
-    def __init__(self):
-        self.messages = {}
+    """
+    Nachrichtenspeicher der SOL.
+
+    Jede Nachricht erhält beim Einfügen eine fortlaufende Sequenznummer. Neben allen Nachrichten
+    (in Einfügereihenfolge) wird eine sortierte Liste der Sequenznummern aktiver Nachrichten
+    gepflegt; gelöschte Nachrichten bleiben als Tombstone erhalten, fallen aber aus diesem Index.
+    Zählen ist damit O(1), eine Seite von list_messages kostet O(log n + limit).
+    """
+
+    def __init__(self, store=None):
+        self.messages = {}  # msg_id -> Message
         self.nonce = 1
         self.lock = Lock()
+        self._seq_by_id = {}  # msg_id -> Sequenznummer
+        self._by_seq = {}  # Sequenznummer -> Message
+        self._all_seqs = []  # alle Sequenznummern, aufsteigend (nur angehängt)
+        self._active_seqs = []  # Sequenznummern aktiver Nachrichten, aufsteigend
+        self._next_seq = 1
+        self.store = store  # MessageStore oder None (nur im Speicher)
+        if store is not None:
+            store.load(self._apply_event)
+            self._snapshot_timer = scheduler.schedule_periodic(
+                Config.MESSAGE_SNAPSHOT_INTERVAL, self.snapshot_if_needed
+            )
 
     def generate_msg_id(self, com_uuid):
         with self.lock:
@@ -19,26 +45,142 @@ class MessageService:
         return msg_id
 
     def add_message(self, message):
-        if message.msg_id in self.messages:
-            raise ValueError("Message ID already exists")
-        self.messages[message.msg_id] = message
+        with self.lock:
+            if message.msg_id in self.messages:
+                raise ValueError("Message ID already exists")
+            self._insert(message)
+            # unter dem Lock, damit die Reihenfolge im Log der im Speicher entspricht
+            if self.store is not None:
+                self.store.append(CREATE, message.to_record())
+
+    def update_message(self, msg_id, subject, text):
+        with self.lock:
+            message = self.messages.get(msg_id)
+            if message is None:
+                return False
+            message.update(subject, text)
+            if self.store is not None:
+                self.store.append(UPDATE, message.to_record())
+            return True
 
     def delete_message(self, msg_id):
-        if msg_id in self.messages:
-            self.messages[msg_id].mark_deleted()
+        with self.lock:
+            message = self.messages.get(msg_id)
+            if message is None:
+                return False
+            if message.status == "active":
+                self._set_active(self._seq_by_id[msg_id], False)
+                message.mark_deleted()
+                if self.store is not None:
+                    self.store.append(
+                        DELETE, {"msg-id": msg_id, "status": message.status, "changed": message.changed}
+                    )
             return True
-        return False
+
+    def _insert(self, message):
+        seq = self._next_seq
+        self._next_seq += 1
+        self.messages[message.msg_id] = message
+        self._seq_by_id[message.msg_id] = seq
+        self._by_seq[seq] = message
+        self._all_seqs.append(seq)
+        if message.status == "active":
+            self._active_seqs.append(seq)
+
+    def _set_active(self, seq, active):
+        seqs = self._active_seqs
+        position = bisect_left(seqs, seq)
+        present = position < len(seqs) and seqs[position] == seq
+        if active and not present:
+            seqs.insert(position, seq)
+        elif not active and present:
+            del seqs[position]
+
+    def _apply_event(self, event):
+        """Apply one event of the message log while restoring (create/update carry the full state)."""
+        msg_id = event["msg-id"]
+        message = self.messages.get(msg_id)
+        if event["op"] == DELETE:
+            if message is not None:
+                self._set_active(self._seq_by_id[msg_id], False)
+                message.mark_deleted(event["changed"])
+            return
+        if message is None:
+            self._insert(Message.from_record(event))
+        else:
+            message.apply_record(event)
+            self._set_active(self._seq_by_id[msg_id], message.status == "active")
+        # generierte IDs ("<nonce>@<uuid>") nach dem Neustart nicht erneut vergeben
+        nonce, _, _ = str(msg_id).partition("@")
+        if nonce.isdigit():
+            self.nonce = max(self.nonce, int(nonce) + 1)
+
+    def snapshot_if_needed(self):
+        if self.store is not None and self.store.needs_compaction():
+            self.snapshot()
+
+    def snapshot(self):
+        """
+        Write all messages as a snapshot and shorten the log. Only the list of messages and the log
+        offset are taken under the lock; changes made while the snapshot is written stay in the log.
+        """
+        with self.lock:
+            messages = [self._by_seq[seq] for seq in self._all_seqs]
+            log_offset = self.store.log_size()
+        self.store.compact(messages, log_offset)
+        global_logger.info(f"Wrote message snapshot with {len(messages)} messages")
+
+    def close(self):
+        if self.store is not None:
+            self._snapshot_timer.cancel()
+            self.store.close()
 
     def get_message(self, msg_id):
         return self.messages.get(msg_id)
 
-    def list_messages(self, scope="active", view="id"):
-        messages = [
-            message.to_dict(view)
-            for message in self.messages.values()
-            if scope == "all" or message.status == "active"
-        ]
-        return messages
+    def count_messages(self, scope="active"):
+        return len(self._all_seqs if scope == "all" else self._active_seqs)
+
+    def list_messages(self, scope="active", view="id", limit=None, cursor=None):
+        """
+        Return `(messages, next_cursor)` for one page of `scope` in insertion order.
+
+        `cursor` is the value returned for the previous page (None for the first page); at most
+        `limit` messages are returned (None: all remaining). `next_cursor` is None on the last page.
+        """
+        page, next_cursor = self._page(scope, limit, cursor)
+        return [message.to_dict(view) for message in page], next_cursor
+
+    def list_message_json(self, scope="active", view="id", limit=None, cursor=None):
+        """Like list_messages, but with the cached JSON fragment of each message instead of a dict."""
+        page, next_cursor = self._page(scope, limit, cursor)
+        return [message.to_json(view) for message in page], next_cursor
+
+    def iter_message_json(self, scope="active", view="id", limit=None, cursor=None, batch_size=None):
+        """
+        Walk `scope` like list_message_json, but in batches of `batch_size` fragments; yields
+        `(fragments, next_cursor)` per batch. The lock is only held while a batch is collected,
+        so messages added or deleted meanwhile are picked up or skipped by later batches.
+        """
+        batch_size = batch_size or Config.STREAM_BATCH_SIZE
+        remaining = limit
+        while True:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            fragments, cursor = self.list_message_json(scope, view, size, cursor)
+            yield fragments, cursor
+            if remaining is not None:
+                remaining -= len(fragments)
+            if cursor is None or remaining == 0:
+                return
+
+    def _page(self, scope, limit, cursor):
+        with self.lock:
+            seqs = self._all_seqs if scope == "all" else self._active_seqs
+            start = 0 if cursor is None else bisect_right(seqs, cursor)
+            end = len(seqs) if limit is None else min(len(seqs), start + limit)
+            page = [self._by_seq[seq] for seq in seqs[start:end]]
+            next_cursor = seqs[end - 1] if end < len(seqs) and end > start else None
+        return page, next_cursor
 
 
 def send_create_message_request(sol_ip, port, star_uuid, origin, sender, subject, message, msg_id=None):
@@ -57,7 +199,7 @@ def send_create_message_request(sol_ip, port, star_uuid, origin, sender, subject
         data["msg-id"] = msg_id
 
     try:
-        response = requests.post(url, json=data, timeout=5)
+        response = http_client.post(url, json=data)
         if response.status_code == 200:
             msg_id = response.json().get("msg-id")
             global_logger.info(f"Message created successfully with ID: {msg_id}")
@@ -82,7 +224,7 @@ def send_delete_message_request(sol_ip, port, star_uuid, msg_id, ):
     url = f"http://{sol_ip}:{port}/vs/v1/system/messages/{msg_id}?star={star_uuid}"
 
     try:
-        response = requests.delete(url, timeout=5)
+        response = http_client.delete(url)
         if response.status_code == 200:
             global_logger.info(f"Message with ID {msg_id} deleted successfully.")
             return True
@@ -97,25 +239,42 @@ def send_delete_message_request(sol_ip, port, star_uuid, msg_id, ):
     return False
 
 
-def send_list_messages_request(sol_ip, port, star_uuid, scope="active", view="id"):
+def send_list_messages_request(sol_ip, port, star_uuid, scope="active", view="id", limit=None, cursor=None):
     """
-    Ruft die Liste aller Nachrichten ab.
+    Ruft die Liste aller Nachrichten ab (mit `limit` nur eine Seite ab `cursor`).
     """
-    url = f"http://{sol_ip}:{port}/vs/v1/system/messages?star={star_uuid}&scope={scope}&view={view}"
+    messages, _ = send_list_messages_page_request(sol_ip, port, star_uuid, scope, view, limit, cursor)
+    return messages
+
+
+def send_list_messages_page_request(sol_ip, port, star_uuid, scope="active", view="id", limit=None, cursor=None):
+    """
+    Ruft eine Seite der Nachrichtenliste ab und gibt (Nachrichten, nextCursor) zurück.
+    Die Antwort wird gestreamt und verarbeitet, während sie noch übertragen wird.
+    """
+    url = f"http://{sol_ip}:{port}/vs/v1/system/messages"
+    params = {"star": star_uuid, "scope": scope, "view": view}
+    if limit is not None:
+        params["limit"] = limit
+    if cursor is not None:
+        params["cursor"] = cursor
 
     try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            messages = response.json().get("messages", [])
-            global_logger.info(f"Retrieved {len(messages)} messages.")
-            return messages
-        elif response.status_code == 401:
-            global_logger.warning("Unauthorized: Invalid STAR UUID.")
-        else:
-            global_logger.warning(f"Unexpected response: {response.status_code} {response.text}")
+        with http_client.get(url, params=params, stream=True) as response:
+            if response.status_code == 200:
+                body = JsonArrayStream(response.iter_content(Config.STREAM_READ_SIZE), "messages")
+                messages = list(body)
+                global_logger.info(f"Retrieved {len(messages)} of {body.fields.get('totalResults')} messages.")
+                return messages, body.fields.get("nextCursor")
+            elif response.status_code == 401:
+                global_logger.warning("Unauthorized: Invalid STAR UUID.")
+            else:
+                global_logger.warning(f"Unexpected response: {response.status_code} {response.text}")
     except requests.RequestException as e:
         global_logger.error(f"Error listing messages: {e}")
-    return []
+    except ValueError as e:
+        global_logger.error(f"Invalid message list received: {e}")
+    return [], None
 
 
 def send_get_message_request(sol_ip, port, msg_id, star_uuid):
@@ -125,7 +284,7 @@ def send_get_message_request(sol_ip, port, msg_id, star_uuid):
     url = f"http://{sol_ip}:{port}/vs/v1/system/messages/{msg_id}?star={star_uuid}"
 
     try:
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url)
         if response.status_code == 200:
             message = response.json().get("messages", [])[0]
             global_logger.info(f"Message retrieved successfully: {message}")
@@ -0,0 +1,91 @@
+import fcntl
+import json
+import os
+
+from app.config import Config
+from utils.logger import global_logger
+from utils.record_log import RecordLog, read_records, write_records
+
+# Ereignisse im Nachrichten-Log
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+
+class MessageStore:
+    """
+    Persistenz für MessageService: Snapshot (`messages.snapshot`) plus Append-only-Log der Ereignisse
+    seit dem Snapshot (`messages.log`), beide im Datensatzformat von RecordLog mit JSON als Nutzdaten.
+
+    Jedes create/update-Ereignis enthält den vollständigen Zustand der Nachricht, delete den neuen
+    Status. Das Anwenden ist damit idempotent: stürzt die SOL zwischen Snapshot und Kürzen des Logs
+    ab, werden beim Start einfach einige Ereignisse ein zweites Mal angewendet.
+    """
+
+    def __init__(self, directory=None, sync_interval=None, compact_bytes=None):
+        # eigenes Verzeichnis pro STAR_PORT, damit mehrere SOLs aus demselben Arbeitsverzeichnis getrennt bleiben
+        self.directory = directory or os.path.join(Config.MESSAGE_STORE_DIR, str(Config.STAR_PORT))
+        self.compact_bytes = compact_bytes or Config.MESSAGE_LOG_COMPACT_BYTES
+        os.makedirs(self.directory, exist_ok=True)
+        self.snapshot_path = os.path.join(self.directory, "messages.snapshot")
+        self.log = RecordLog(os.path.join(self.directory, "messages.log"), sync_interval)
+        self._lock_fd = None
+        self.snapshots = 0
+
+    def load(self, apply):
+        """
+        Lock the store for this process, replay the snapshot and then the log into `apply(event)`
+        and open the log for appending. Raises RuntimeError if another process holds the store.
+        """
+        self._lock()
+        decode = lambda payload: apply(json.loads(payload))
+        _, from_snapshot = read_records(self.snapshot_path, decode)
+        from_log = self.log.open(decode)
+        global_logger.info(
+            f"Restored messages from {self.directory}: {from_snapshot} snapshot records, {from_log} log records"
+        )
+
+    def _lock(self):
+        # eigene Lock-Datei: Log und Snapshot werden beim Kompaktieren per rename ersetzt,
+        # ein flock auf ihnen würde nur die alte Datei schützen
+        fd = os.open(os.path.join(self.directory, "messages.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise RuntimeError(f"Message store {self.directory} is already in use by another process")
+        self._lock_fd = fd
+
+    def append(self, op, record):
+        """Log one event; it reaches the OS immediately and the disk with the next group commit."""
+        self.log.append(json.dumps({"op": op, **record}, separators=(",", ":")).encode())
+
+    def log_size(self):
+        return self.log.size()
+
+    def needs_compaction(self):
+        return self.log.file_size() >= self.compact_bytes
+
+    def compact(self, messages, log_offset):
+        """
+        Write `messages` (whose state covers the log up to `log_offset`) as the new snapshot and
+        drop that part of the log.
+        """
+        write_records(
+            self.snapshot_path,
+            (
+                json.dumps({"op": CREATE, **message.to_record()}, separators=(",", ":")).encode()
+                for message in messages
+            ),
+        )
+        self.log.rewrite(log_offset)
+        self.snapshots += 1
+
+    def close(self):
+        self.log.close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # gibt den flock frei
+            self._lock_fd = None
+
+    def stats(self):
+        return {**self.log.stats(), "snapshots": self.snapshots}
@@ -11,12 +11,14 @@ import requests
 #from flask import jsonify
 
 from app.config import Config
+from service import discovery_codec
 from service.udp_service import UdpService
 from manager.sol_manager import SolManager
-from service.tcp_service import send_tcp_request
+from service.tcp_service import http_client, send_tcp_request
 from model.peer import Peer
 from model.sol import SOL
 from utils.logger import global_logger
+from utils.scheduler import scheduler
 from utils.uuid_generator import UuidGenerator
 
 
@@ -31,10 +33,15 @@ class PeerService:
         """
         global_logger.info("Broadcasting HELLO? to discover SOL...")
 
+        if Config.DISCOVERY_EARLY_EXIT:
+            return self._discover_sol_early_exit()
+
         for attempt in range(Config.BROADCAST_RETRY_ATTEMPTS):
             # Broadcast HELLO?
             try:
-                UdpService.broadcast_message(Config.STAR_PORT, "HELLO?")
+                UdpService.broadcast_message(
+                    Config.STAR_PORT, self._hello_message(attempt)
+                )
             except Exception as e:
                 global_logger.error(f"Failed to broadcast HELLO?: {e}")
                 continue
@@ -51,23 +58,7 @@ class PeerService:
                 global_logger.error(f"Error while listening for responses: {e}")
                 continue
 
-            # Validate and collect responses #TODO: Diesen Step eventuell auslagern?
-            valid_responses = []
-            for response, addr in responses:
-                if (
-                    "star" in response
-                    and "sol" in response
-                    and "sol-ip" in response
-                    and "sol-tcp" in response
-                ):
-                    valid_responses.append((response, addr))
-                    global_logger.info(
-                        f"Discovered SOL: {response} from {addr[0]}:{addr[1]}"
-                    )
-                else:
-                    global_logger.warning(
-                        f"Invalid SOL response from {addr[0]}:{addr[1]}: {response}"
-                    )
+            valid_responses = self._validate_responses(responses)
 
             if valid_responses:
                 global_logger.info(
@@ -89,6 +80,91 @@ class PeerService:
         # self.initialize_as_sol()
         return None
 
+    def _discover_sol_early_exit(self):
+        """
+        Discovery mit vorzeitigem Abbruch: Jeder Versuch endet DISCOVERY_GRACE_WINDOW Sekunden nach
+        der ersten gültigen Antwort, spätestens nach einem festen Timeout (siehe _discovery_timeout).
+        """
+        for attempt in range(Config.BROADCAST_RETRY_ATTEMPTS):
+            timeout = self._discovery_timeout(attempt)
+            global_logger.info(
+                f"Waiting up to {timeout:.2f}s for responses from SOL components..."
+            )
+            try:
+                responses, rtt = UdpService.discover(
+                    Config.STAR_PORT,
+                    self._hello_message(attempt),
+                    timeout=timeout,
+                    grace=Config.DISCOVERY_GRACE_WINDOW,
+                    accept=self._is_valid_sol_response,
+                )
+            except Exception as e:
+                global_logger.error(f"Failed to discover SOL: {e}")
+                continue
+
+            valid_responses = self._validate_responses(responses)
+            if valid_responses:
+                global_logger.info(
+                    f"Discovered {len(valid_responses)} valid SOL component(s) after {rtt * 1000:.1f}ms."
+                )
+                return valid_responses
+
+            global_logger.warning(
+                f"No responses received. Retrying... ({attempt + 1}/{Config.BROADCAST_RETRY_ATTEMPTS})"
+            )
+
+        global_logger.warning(
+            "No SOL components found after retries. Initializing as new SOL..."
+        )
+        return None
+
+    @staticmethod
+    def _discovery_timeout(attempt):
+        """
+        Fester Zeitplan: DISCOVERY_INITIAL_TIMEOUT, verdoppelt pro Versuch, höchstens
+        TIMEOUT_LISTENING_FOR_UPD_RESPONSE. (Die Discovery läuft einmal pro Prozess, gemessene
+        Antwortzeiten könnten also kein späteres Timeout mehr beeinflussen.)
+        """
+        return min(
+            Config.TIMEOUT_LISTENING_FOR_UPD_RESPONSE,
+            Config.DISCOVERY_INITIAL_TIMEOUT * (2 ** attempt),
+        )
+
+    @staticmethod
+    def _hello_message(attempt):
+        """
+        Im binären Discovery-Format wird zuerst binär angefragt; bleibt der Versuch unbeantwortet
+        (z.B. ältere SOLs), wird mit dem Textprotokoll wiederholt.
+        """
+        if Config.DISCOVERY_WIRE_FORMAT == "binary" and attempt == 0:
+            return discovery_codec.encode_hello()
+        return "HELLO?"
+
+    @staticmethod
+    def _is_valid_sol_response(response):
+        return (
+            isinstance(response, dict)
+            and "star" in response
+            and "sol" in response
+            and "sol-ip" in response
+            and "sol-tcp" in response
+        )
+
+    def _validate_responses(self, responses):
+        """Filtert gültige SOL-Antworten aus den empfangenen Antworten."""
+        valid_responses = []
+        for response, addr in responses:
+            if self._is_valid_sol_response(response):
+                valid_responses.append((response, addr))
+                global_logger.info(
+                    f"Discovered SOL: {response} from {addr[0]}:{addr[1]}"
+                )
+            else:
+                global_logger.warning(
+                    f"Invalid SOL response from {addr[0]}:{addr[1]}: {response}"
+                )
+        return valid_responses
+
     def choose_sol(self, valid_responses):
         """
         Wähle den SOL mit der größten UUID aus einer Liste von validen Antworten.
@@ -137,8 +213,12 @@ class PeerService:
         self.peer.com_uuid = com_uuid
         self.sol_service.sol = SOL(self.peer.com_uuid, star_uuid)
         sol_manager = SolManager(self.sol_service, app)
-        time.sleep(2)
-        sol_thread = threading.Thread(target=sol_manager.manage())
+        # erst auf HELLO? antworten, wenn sich Komponenten per REST registrieren können
+        if not sol_manager.wait_until_ready(Config.SOL_STARTUP_TIMEOUT):
+            global_logger.error(
+                f"REST API not listening after {Config.SOL_STARTUP_TIMEOUT}s, starting SOL anyway"
+            )
+        sol_thread = threading.Thread(target=sol_manager.manage)
         sol_thread.start()
         sys.exit()
 
@@ -185,7 +265,7 @@ class PeerService:
         global_logger.info(f"Preparing to send status update to {url} with payload: {payload}")
 
         try:
-            response = requests.patch(url, json=payload, timeout=5)
+            response = http_client.patch(url, json=payload)
             if response.status_code == 200:
                 global_logger.info(f"Status update to SOL successful: {response.text}")
                 return True
@@ -212,33 +292,33 @@ class PeerService:
 
     def send_status_update_periodically(self):
         """
-        Sendet regelmäßig eine Statusmeldung an SOL und handhabt Wiederholungen bei Fehlern.
+        Plant regelmäßige Statusmeldungen an SOL ein und handhabt Wiederholungen bei Fehlern.
+        Die erste Meldung wird sofort gesendet; gibt den Timer zurück.
         """
-        attempt = 0
-
-        while True:
-            success = self.send_status_update()
-            if success:
-               # global_logger.info("Periodic status update successful.")
-                attempt = 0  # Rücksetzen der Versuche bei Erfolg
-                time.sleep(
-                    Config.STATUS_UPDATE_INTERVAL
-                )  # Wartezeit bis zum nächsten Update
-            else:
-                attempt += 1
-                retry_interval = Config.STATUS_UPDATE_RETRY_INTERVALS[
-                    min(attempt - 1, len(Config.STATUS_UPDATE_RETRY_INTERVALS) - 1)
-                ]
-                #global_logger.warning(
-                #    f"Retrying status update... Attempt {attempt}/{Config.STATUS_UPDATE_MAX_ATTEMPTS}"
-                #)
-                time.sleep(retry_interval)
-
-                if attempt >= Config.STATUS_UPDATE_MAX_ATTEMPTS:
-                    global_logger.error(
-                        "Failed to send status update after maximum attempts. Exiting..."
-                    )
-                    self._shutdown_peer()
+        self._status_update_failures = 0
+        self.status_update_timer = scheduler.schedule(0, self._status_update_tick)
+        return self.status_update_timer
+
+    def _status_update_tick(self):
+        success = self.send_status_update()
+        if success:
+            self._status_update_failures = 0  # Rücksetzen der Versuche bei Erfolg
+            delay = Config.STATUS_UPDATE_INTERVAL  # Wartezeit bis zum nächsten Update
+        else:
+            self._status_update_failures += 1
+            if self._status_update_failures >= Config.STATUS_UPDATE_MAX_ATTEMPTS:
+                global_logger.error(
+                    "Failed to send status update after maximum attempts. Exiting..."
+                )
+                self._shutdown_peer()
+                return
+            delay = Config.STATUS_UPDATE_RETRY_INTERVALS[
+                min(
+                    self._status_update_failures - 1,
+                    len(Config.STATUS_UPDATE_RETRY_INTERVALS) - 1,
+                )
+            ]
+        self.status_update_timer.reschedule(delay)
 
     def _shutdown_peer(self):
         """
@@ -254,37 +334,44 @@ class PeerService:
         if self.peer.sol_connection is None:
             global_logger.info(f"Component shut down via terminal.")
             os._exit(Config.EXIT_CODE_SUCCESS)
+        self._send_exit_attempt(0)
+
+    def _send_exit_attempt(self, attempt):
+        """Ein EXIT-Versuch; bei Fehlschlag wird der nächste Versuch über den Scheduler eingeplant."""
         url = f"http://{self.peer.sol_connection.ip}:{self.peer.sol_connection.port}/vs/v1/system/{self.peer.com_uuid}?star={self.peer.sol_connection.star_uuid}"
-        for attempt in range(Config.EXIT_REQUEST_RETRIES):
-            try:
-                global_logger.info(f"Sending EXIT request to SOL at {url}")
-                response = requests.delete(url)
-                if response.status_code == 200:
-                    global_logger.info(
-                        "Component successfully unregistered from SOL. Exiting"
-                    )
-                    os._exit(Config.EXIT_CODE_SUCCESS)
-                elif response.status_code == 401:
-                    global_logger.warning(
-                        "Unauthorized to unregister from SOL. Exiting with error."
-                    )
-                    os._exit(Config.EXIT_CODE_ERROR)
-                elif response.status_code == 404:
-                    global_logger.warning(
-                        "Component not found in SOL. Exiting with error."
-                    )
-                    os._exit(Config.EXIT_CODE_ERROR)
-                else:
-                    global_logger.warning(
-                        f"Unexpected response: {response.status_code} {response.text}"
-                    )
-            except requests.RequestException as e:
-                global_logger.error(f"Error sending EXIT request: {e}")
+        try:
+            global_logger.info(f"Sending EXIT request to SOL at {url}")
+            response = http_client.delete(url)
+            if response.status_code == 200:
+                global_logger.info(
+                    "Component successfully unregistered from SOL. Exiting"
+                )
+                os._exit(Config.EXIT_CODE_SUCCESS)
+            elif response.status_code == 401:
+                global_logger.warning(
+                    "Unauthorized to unregister from SOL. Exiting with error."
+                )
+                os._exit(Config.EXIT_CODE_ERROR)
+            elif response.status_code == 404:
+                global_logger.warning(
+                    "Component not found in SOL. Exiting with error."
+                )
+                os._exit(Config.EXIT_CODE_ERROR)
+            else:
+                global_logger.warning(
+                    f"Unexpected response: {response.status_code} {response.text}"
+                )
+        except requests.RequestException as e:
+            global_logger.error(f"Error sending EXIT request: {e}")
 
+        if attempt + 1 < Config.EXIT_REQUEST_RETRIES:
             global_logger.warning(
                 f"Retrying EXIT request... ({attempt + 1}/{Config.EXIT_REQUEST_RETRIES})"
             )
-            time.sleep(Config.EXIT_REQUEST_WAIT[attempt])
+            scheduler.schedule(
+                Config.EXIT_REQUEST_WAIT[attempt], self._send_exit_attempt, attempt + 1
+            )
+            return
 
         global_logger.error("Failed to unregister after retries. Exiting forcefully.")
         os._exit(Config.EXIT_CODE_ERROR)
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+from app.config import Config
+from service.tcp_service import http_client
+from utils.circuit_breaker import CircuitOpenError, RetryPolicy
+from utils.logger import global_logger
+
+# name: Bezeichnung fürs Log, url: DELETE-Ziel, final_statuses: Statuscodes, bei denen nicht wiederholt wird
+ShutdownTarget = namedtuple("ShutdownTarget", ["name", "url", "final_statuses"])
+
+# Ergebnis pro Ziel
+SUCCESS = "unregistered"
+REJECTED = "rejected"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+
+
+class ShutdownOrchestrator:
+    """
+    Sendet die DELETE-Requests beim Beenden einer SOL parallel an alle Ziele.
+
+    Alle Versuche inklusive Wiederholungen teilen sich eine gemeinsame Deadline; ein Ziel,
+    das bis dahin nicht geantwortet hat, wird als TIMED_OUT gemeldet. Die Dauer des
+    Shutdowns hängt damit nicht mehr von der Anzahl der Komponenten und Sterne ab.
+    """
+
+    def __init__(
+        self,
+        deadline=None,
+        max_workers=None,
+        attempts=None,
+        retry_delay=None,
+        client=None,
+    ):
+        self.deadline = deadline or Config.SHUTDOWN_DEADLINE
+        self.max_workers = max_workers or Config.SHUTDOWN_WORKERS
+        self.retry = RetryPolicy(
+            attempts=attempts or Config.UNREGISTER_RETRY_COUNT,
+            base_delay=Config.SHUTDOWN_RETRY_DELAY if retry_delay is None else retry_delay,
+            max_delay=self.deadline,
+        )
+        self.client = client or http_client
+
+    def run(self, targets):
+        """Unregister at all `targets`; returns {name: (outcome, detail)} once all are done or the deadline passed."""
+        targets = list(targets)
+        if not targets:
+            return {}
+        expires_at = time.monotonic() + self.deadline
+        cancelled = threading.Event()
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(targets)),
+            thread_name_prefix="shutdown",
+        )
+        futures = {
+            executor.submit(self._unregister, target, expires_at, cancelled): target
+            for target in targets
+        }
+        done, _ = wait(futures, timeout=max(0, expires_at - time.monotonic()))
+        cancelled.set()
+        # nicht fertige Requests laufen bis zum os._exit weiter, es wird nicht auf sie gewartet
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        report = {}
+        for future, target in futures.items():
+            if future in done:
+                report[target.name] = future.result()
+            else:
+                report[target.name] = (TIMED_OUT, f"no answer within {self.deadline}s")
+        return report
+
+    def _unregister(self, target, expires_at, cancelled):
+        detail = None
+        for attempt in range(self.retry.attempts):
+            remaining = expires_at - time.monotonic()
+            if cancelled.is_set() or remaining <= 0:
+                return TIMED_OUT, detail
+            try:
+                global_logger.info(f"Sending DELETE request to {target.name} at {target.url}")
+                response = self.client.delete(
+                    target.url, timeout=min(remaining, Config.HTTP_READ_TIMEOUT)
+                )
+                if response.status_code == 200:
+                    return SUCCESS, 200
+                if response.status_code in target.final_statuses:
+                    return REJECTED, response.status_code
+                detail = response.status_code
+                global_logger.warning(
+                    f"Unexpected response from {target.name}: {response.status_code}"
+                )
+            except CircuitOpenError as e:
+                # Ziel ist bekanntermaßen nicht erreichbar, kein weiterer Versuch
+                return FAILED, str(e)
+            except requests.RequestException as e:
+                detail = str(e)
+                global_logger.error(f"Failed to contact {target.name}: {e}")
+
+            if attempt + 1 < self.retry.attempts:
+                global_logger.warning(
+                    f"Retrying DELETE request to {target.name}... ({attempt + 1}/{self.retry.attempts})"
+                )
+                # Wartezeit nie über die Deadline hinaus
+                delay = self.retry.delay(attempt)
+                if cancelled.wait(min(delay, max(0, expires_at - time.monotonic()))):
+                    return TIMED_OUT, detail
+        return FAILED, detail
+
+
+def log_report(report):
+    """Write one line per target and a summary to the log."""
+    for name, (outcome, detail) in report.items():
+        if outcome == SUCCESS:
+            global_logger.info(f"{name}: {outcome}")
+        else:
+            global_logger.warning(f"{name}: {outcome} ({detail})")
+    counts = {}
+    for outcome, _ in report.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    global_logger.info(f"Shutdown finished: {counts}")
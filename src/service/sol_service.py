@@ -1,20 +1,36 @@
+import json
 import os
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
-from datetime import datetime
-from threading import Lock
+from operator import attrgetter
 from flask import request
 import requests
 from app.config import Config
-from service.udp_service import UdpService
+from service import discovery_codec
+from service.galaxy_handshake_queue import GalaxyHandshakeQueue
+from service.inactivity_tracker import InactivityTracker
+from service.shutdown_orchestrator import (
+    FAILED,
+    SUCCESS,
+    ShutdownOrchestrator,
+    ShutdownTarget,
+    log_report,
+)
+from service.udp_service import UdpService, BatchedUdpReceiver
 from service.tcp_service import (
+    http_client,
     send_tcp_request,
     send_tcp_request_and_get_response_body,
 )
+from utils import http_server
+from utils.circuit_breaker import RetryPolicy
 from utils.logger import global_logger
+from utils.rate_limiter import DedupCache, TokenBucketLimiter
 from utils.uuid_generator import UuidGenerator
 
+from model.registry import ADDED, IndexedRegistry
 from model.star import Star
 
 
@@ -26,61 +42,176 @@ class SolService:
         self.star_port = star_port or Config.STAR_PORT
         self.num_active_components = 1
         self.sol = None
-        self.star_list = []
-        self.galaxy_lock = Lock()
+        # bekannte Sterne der Galaxy nach star_uuid, zusätzlich nach SOL-IP indiziert
+        self.galaxy = IndexedRegistry(
+            key=attrgetter("star_uuid"), indexes={"sol_ip": attrgetter("sol_ip")}
+        )
+        self._star_list_response = None  # (Snapshot, Antwort für list_all_stars)
+        self.udp_receivers = {}  # port -> BatchedUdpReceiver (nur UDP_LISTENER_MODE = "batched")
+        self.hello_limiter = TokenBucketLimiter(
+            rate=Config.HELLO_RATE_LIMIT,
+            burst=Config.HELLO_RATE_BURST,
+            max_keys=Config.HELLO_TRACKED_SOURCES,
+        )
+        self.hello_dedup = DedupCache(
+            window=Config.HELLO_DEDUP_WINDOW, max_entries=Config.HELLO_TRACKED_SOURCES
+        )
+        self.galaxy_handshakes = GalaxyHandshakeQueue(
+            self.galaxy_handshake, max_workers=Config.GALAXY_HANDSHAKE_WORKERS
+        )
+        self.galaxy_retry = RetryPolicy(attempts=Config.GALAXY_REQUEST_ATTEMPTS)
+        self.health_probes = ThreadPoolExecutor(
+            max_workers=Config.HEALTH_CHECK_WORKERS, thread_name_prefix="health-probe"
+        )
+        # eine Frist pro Peer; geprüft wird nur, wessen Frist abläuft
+        self.inactivity = InactivityTracker(
+            Config.PEER_INACTIVITY_THRESHOLD, self._on_peer_inactive
+        )
+
+    # Änderungen an star_uuid, sol_uuid oder star_port verwerfen die vorkodierte HELLO?-Antwort
+    @property
+    def star_uuid(self):
+        return self._star_uuid
+
+    @star_uuid.setter
+    def star_uuid(self, value):
+        self._star_uuid = value
+        self._hello_response_template = None
+        self._binary_hello_response_template = None
+
+    @property
+    def sol_uuid(self):
+        return self._sol_uuid
+
+    @sol_uuid.setter
+    def sol_uuid(self, value):
+        self._sol_uuid = value
+        self._hello_response_template = None
+        self._binary_hello_response_template = None
+
+    @property
+    def star_port(self):
+        return self._star_port
+
+    @star_port.setter
+    def star_port(self, value):
+        self._star_port = value
+        self._hello_response_template = None
+        self._binary_hello_response_template = None
+
+    def build_hello_response(self, com_uuid):
+        """
+        Gibt die kodierte HELLO?-Antwort für eine COM-UUID zurück.
+        Alles außer der COM-UUID wird nur einmal serialisiert und danach wiederverwendet.
+        """
+        template = self._hello_response_template
+        if template is None:
+            fields = json.dumps(
+                {
+                    "star": self.star_uuid,
+                    "sol": self.sol_uuid,
+                    "sol-ip": Config.IP,
+                    "sol-tcp": self.star_port,
+                }
+            )
+            template = fields[:-1].encode("utf-8") + b', "component": '
+            self._hello_response_template = template
+        return template + json.dumps(com_uuid).encode("utf-8") + b"}"
+
+    def build_binary_hello_response(self, com_uuid):
+        """
+        Gibt die HELLO?-Antwort im binären Discovery-Format zurück (siehe discovery_codec).
+        Raises ValueError if the star cannot be encoded in the binary format.
+        """
+        template = self._binary_hello_response_template
+        if template is None:
+            template = discovery_codec.encode_response_prefix(
+                self.star_uuid, self.sol_uuid, Config.IP, self.star_port
+            )
+            self._binary_hello_response_template = template
+        no_com = len(self.sol.registered_peers) if self.sol is not None else 0
+        return template + discovery_codec.encode_response_suffix(com_uuid, no_com)
 
     def listen_for_hello(self, port):
         """Listens for HELLO? messages and responds with the required JSON blob."""
         global_logger.info("SOL is listening for HELLO? messages...")
 
         try:
-
-            def handle_message(message, addr):
-                parts = message.strip().split()
-                if message.strip() == "HELLO?":
-                    global_logger.info(f"Received HELLO? from {addr[0]}:{addr[1]}")
-                    self.send_response(addr[0], Config.STAR_PORT)
-
-                elif (
-                    len(parts) == 4
-                    and parts[0] == "HELLO?"
-                    and parts[1] == "I"
-                    and parts[2] == "AM"
-                ):
-                    star_uuid = parts[3]
-                    global_logger.info(f"Received HELLO? from {addr[0]}:{addr[1]}")
-                    # ist star uid bekannt?
-                    with self.galaxy_lock:
-                        saved_star = self.get_star(star_uuid)
-                    if saved_star is None:
-                        # post schicken
-                        global_logger.info(f"Sending star-POST to {addr[0]}")
-                        res_body = self.send_galaxy_post(addr[0])
-                        if res_body is None:
-                            return
-                        star = res_body.get("star")
-                        sol = res_body.get("sol")
-                        sol_ip = res_body.get("sol-ip")
-                        sol_tcp = res_body.get("sol-tcp")
-                        no_com = res_body.get("no-com")
-                        status = res_body.get("status")
-                        self.add_star(star, sol, sol_ip, sol_tcp, no_com, status)
-                    else:
-                        if (
-                            saved_star.sol_ip == addr[0]
-                        ):  # star schon bekannt und ip stimmt
-                            # patch schicken
-                            self.send_galaxy_patch(addr[0])
-                else:
-                    global_logger.warning(
-                        f"Unexpected message from {addr[0]}:{addr[1]}: {message}"
-                    )
-
-            UdpService.listen(port, callback=handle_message)
+            if Config.UDP_LISTENER_MODE == "batched":
+                receiver = BatchedUdpReceiver(port, self.handle_hello)
+                self.udp_receivers[port] = receiver
+                UdpService.listen_batched(port, self.handle_hello, receiver=receiver)
+            else:
+                UdpService.listen(port, callback=self.handle_hello)
 
         except Exception as e:
             global_logger.error(f"Error while listening for HELLO? messages: {e}")
 
+    def handle_hello(self, message, addr):
+        """
+        Verarbeitet eine empfangene HELLO?-Nachricht (Stern oder Galaxie).
+        Wird sowohl vom blockierenden Listener als auch von der UdpDiscoveryEngine aufgerufen.
+        """
+        if not self.hello_limiter.allow(addr[0]):
+            return
+
+        # binäre Anfragen werden binär beantwortet, Textanfragen mit JSON
+        binary = isinstance(message, discovery_codec.DiscoveryPacket)
+        if binary:
+            kind, star_uuid = message.kind, message.star_uuid
+        else:
+            kind, star_uuid = discovery_codec.parse_text_hello(message)
+
+        if kind == discovery_codec.HELLO:
+            global_logger.info(f"Received HELLO? from {addr[0]}:{addr[1]}")
+            # Wiederholung innerhalb des Dedup-Fensters: gleiche COM-UUID erneut senden.
+            # Schlüssel ist (IP, Port): mehrere Komponenten hinter einer IP (ein Host, NAT) sind verschiedene Quellen
+            dedup_key = ("HELLO?", addr[0], addr[1])
+            cached_com_uuid = self.hello_dedup.get(dedup_key)
+            com_uuid = self.send_response(
+                addr[0], Config.STAR_PORT, com_uuid=cached_com_uuid, binary=binary
+            )
+            if cached_com_uuid is None and com_uuid is not None:
+                self.hello_dedup.put(dedup_key, com_uuid)
+
+        elif kind == discovery_codec.HELLO_I_AM:
+            global_logger.info(f"Received HELLO? from {addr[0]}:{addr[1]}")
+            # Wiederholung innerhalb des Dedup-Fensters: kein erneuter Galaxy-Request
+            if self.hello_dedup.get(("GALAXY", addr[0], star_uuid)) is not None:
+                return
+            self.hello_dedup.put(("GALAXY", addr[0], star_uuid), True)
+            # Handshake läuft im Hintergrund, der UDP-Listener wird nicht blockiert
+            self.galaxy_handshakes.submit(star_uuid, addr[0])
+        else:
+            global_logger.warning(
+                f"Unexpected message from {addr[0]}:{addr[1]}: {message}"
+            )
+
+    def galaxy_handshake(self, star_uuid, ip):
+        """
+        Meldet sich bei einem angekündigten Stern an (POST) oder aktualisiert die Anmeldung (PATCH).
+        Läuft auf einem Worker der GalaxyHandshakeQueue.
+        """
+        # ist star uid bekannt?
+        saved_star = self.get_star(star_uuid)
+        if saved_star is None:
+            # post schicken
+            global_logger.info(f"Sending star-POST to {ip}")
+            res_body = self.send_galaxy_post(ip)
+            if res_body is None:
+                return
+            star = res_body.get("star")
+            sol = res_body.get("sol")
+            sol_ip = res_body.get("sol-ip")
+            sol_tcp = res_body.get("sol-tcp")
+            no_com = res_body.get("no-com")
+            status = res_body.get("status")
+            self.add_star(star, sol, sol_ip, sol_tcp, no_com, status)
+        else:
+            if saved_star.sol_ip == ip:  # star schon bekannt und ip stimmt
+                # patch schicken
+                self.send_galaxy_patch(ip)
+
     def send_galaxy_post(self, addr):
         saved_star_url = f"http://{addr}:{Config.GALAXY_PORT}/vs/v1/star"
 
@@ -94,7 +225,7 @@ class SolService:
         }
         headers = {"Content-Type": "application/json"}
         return send_tcp_request_and_get_response_body(
-            "POST", saved_star_url, body=response, headers=headers
+            "POST", saved_star_url, body=response, headers=headers, retry=self.galaxy_retry
         )
 
     def send_galaxy_patch(self, addr):
@@ -109,195 +240,241 @@ class SolService:
             "status": 200,
         }
         headers = {"Content-Type": "application/json"}
-        return send_tcp_request("PATCH", saved_star_url, body=response, headers=headers)
+        return send_tcp_request(
+            "PATCH", saved_star_url, body=response, headers=headers, retry=self.galaxy_retry
+        )
 
-    def send_response(self, target_ip, target_port):
-        """Send the JSON blob response to the sender of the HELLO? message."""
-        response = {
-            "star": self.star_uuid,
-            "sol": self.sol_uuid,
-            "sol-ip": Config.IP,
-            "sol-tcp": self.star_port,
-            "component": UuidGenerator.generate_com_uuid(),
-        }
-        global_logger.info(f"Sending response to {target_ip}:{target_port}: {response}")
+    def send_response(self, target_ip, target_port, com_uuid=None, binary=False):
+        """
+        Send the JSON blob (or binary) response to the sender of the HELLO? message.
+        Returns the COM-UUID sent, or None if sending failed.
+        """
+        if com_uuid is None:
+            com_uuid = UuidGenerator.generate_com_uuid()
+        global_logger.info(
+            f"Sending response to {target_ip}:{target_port} (component {com_uuid})"
+        )
         try:
-            UdpService.send_response(response, target_ip, target_port)
+            payload = None
+            if binary:
+                try:
+                    payload = self.build_binary_hello_response(com_uuid)
+                except ValueError as e:
+                    global_logger.warning(f"Falling back to JSON response: {e}")
+            if payload is None:
+                payload = self.build_hello_response(com_uuid)
+            UdpService.send_bytes(payload, target_ip, target_port)
         except Exception as e:
             global_logger.error(
                 f"Failed to send response to {target_ip}:{target_port}: {e}"
             )
+            return None
+        return com_uuid
 
-    def check_component_status(self, peer):
+    def get_hello_stats(self):
+        """Zähler der HELLO?-Verarbeitung (Rate-Limiting und Deduplizierung)."""
+        return {
+            "accepted": self.hello_limiter.allowed,
+            "rate_limited": self.hello_limiter.limited,
+            "deduplicated": self.hello_dedup.hits,
+            "dedup_evictions": self.hello_dedup.evictions,
+            "tracked_sources": len(self.hello_limiter),
+        }
+
+    def get_metrics(self):
+        """Sammelt die Laufzeit-Zähler des SOL für den Metrics-Endpunkt."""
+        return {
+            "hello": self.get_hello_stats(),
+            "galaxy_handshakes": self.galaxy_handshakes.stats(),
+            "http_circuits": http_client.breaker.stats(),
+            "http_servers": http_server.server_stats(),
+            "inactivity": self.inactivity.stats(),
+            "udp_receivers": [
+                receiver.stats() for receiver in self.udp_receivers.values()
+            ],
+        }
+
+    def probe_component(self, peer):
         """
-        Überprüft den Status einer Komponente über eine GET-Anfrage.
+        Fragt den Status einer Komponente per GET ab, ohne den Peer zu verändern.
+        Gibt (status_code, fehler) zurück; genau einer der beiden Werte ist None.
         """
-        url = f"http://{peer.com_ip}:{peer.com_tcp}/vs/v1/system/{peer.com_uuid}?star={self.star_uuid}"
+        url = f"http://{peer.ip}:{peer.com_tcp}/vs/v1/system/{peer.com_uuid}?star={self.star_uuid}"
         try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                global_logger.info(f"Component {peer.com_uuid} is active.")
-                peer.set_last_interaction_timestamp()
-            else:
-                global_logger.warning(
-                    f"Component {peer.com_uuid} returned status {response.status_code}."
-                )
+            return http_client.get(url).status_code, None
         except requests.RequestException as e:
-            global_logger.error(f"Failed to contact component {peer.com_uuid}: {e}")
+            return None, e
+
+    def _apply_probe_result(self, peer, status_code, error):
+        """Überträgt das Ergebnis einer Status-Abfrage auf den Peer."""
+        if status_code == 200:
+            global_logger.info(f"Component {peer.com_uuid} is active.")
+            self.touch_peer(peer)
+        elif error is None:
+            global_logger.warning(
+                f"Component {peer.com_uuid} returned status {status_code}."
+            )
+        else:
+            global_logger.error(f"Failed to contact component {peer.com_uuid}: {error}")
             peer.status = "disconnected"
 
+    def touch_peer(self, peer):
+        """Vermerkt eine Interaktion mit `peer` und verschiebt dessen Inaktivitätsfrist."""
+        peer.set_last_interaction_timestamp()
+        self.inactivity.touch(peer.com_uuid, peer)
+
+    def forget_peer(self, peer):
+        self.inactivity.forget(peer.com_uuid)
+
+    def _on_peer_inactive(self, com_uuid, peer):
+        """Frist abgelaufen: die Komponente sofort (im Worker-Pool) prüfen."""
+        if self.sol is None or self.sol.find_peer(com_uuid) is not peer:
+            return
+        global_logger.warning(
+            f"Component {com_uuid} is inactive since {peer.last_interaction_iso()}. Checking status."
+        )
+        self.health_probes.submit(self._probe_inactive_peer, peer)
+
+    def _probe_inactive_peer(self, peer):
+        status_code, error = self.probe_component(peer)
+        if self.sol.find_peer(peer.com_uuid) is not peer:
+            return
+        self._apply_probe_result(peer, status_code, error)
+        if status_code != 200:
+            # weiter überwachen, nächste Prüfung nach Ablauf der nächsten Frist
+            self.inactivity.touch(peer.com_uuid, peer)
+
     def check_peer_health(self):
-        """Checks the health of registered peers and updates their status."""
-        while True:
-            try:
-                current_time = datetime.now()
-                with self.sol.peers_lock:
-                    for peer in self.sol.registered_peers:
-
-                        if peer.com_uuid == self.peer.com_uuid:
-                            continue
-
-                        last_interaction = datetime.fromisoformat(
-                            peer.last_interaction_timestamp
-                        )
-                        if (
-                            current_time - last_interaction
-                        ).total_seconds() > Config.PEER_INACTIVITY_THRESHOLD:
-                            global_logger.warning(
-                                f"Component {peer.com_uuid} is inactive. Checking status."
-                            )
-                            self.check_component_status(peer)
-                time_after_check = datetime.now()
-                time_elapsed = int((time_after_check - current_time).total_seconds())
-                time.sleep(Config.PEER_INACTIVITY_THRESHOLD - time_elapsed)
-            except Exception as e:
-                global_logger.error(f"Error in check_peer_health thread: {e}")
-
-    def unregister_all_peers_and_exit(self):
-        """Unregister all peers from the star and exit SOL."""
-        global_logger.info("Unregistering all peers before exiting...")
-        with self.sol.peers_lock:
-            for peer in self.sol.registered_peers:
-                self._unregister_peer(peer)
-            self.sol.registered_peers.clear()
-
-        # see all running threads
-        # Print all active threads before exiting
-        # global_logger.info("Active threads before exit:")
-        # active_threads = threading.enumerate()
-        # for thread in active_threads:
-        #     global_logger.info(f"Thread ID: {thread.ident}, Name: {thread.name}, Daemon: {thread.daemon}")
-        global_logger.info("All peers processed. Exiting SOL...")
-        os._exit(Config.EXIT_CODE_SUCCESS)
+        """
+        Startet die Inaktivitätsüberwachung für die bereits registrierten Peers (neue Peers werden
+        bei der Registrierung angemeldet). Bereits überfällige Peers werden sofort geprüft.
+        """
+        now = time.monotonic()
+        for peer in self.sol.registered_peers:
+            if peer.com_uuid == self.peer.com_uuid or peer.com_uuid in self.inactivity:
+                continue
+            idle = peer.seconds_since_last_interaction(now)
+            remaining = 0 if idle is None else max(0, self.inactivity.threshold - idle)
+            self.inactivity.touch(peer.com_uuid, peer, delay=remaining)
+        return self.inactivity
 
-    def _unregister_peer(self, peer):
-        """Helper method to unregister a single peer."""
-        url = f"http://{peer.ip}:{peer.com_tcp}/vs/v1/system/{peer.com_uuid}?star={self.star_uuid}"
-        for attempt in range(Config.UNREGISTER_RETRY_COUNT):
-            try:
-                global_logger.info(
-                    f"Sending DELETE request to peer {peer.com_uuid} at {url}"
-                )
-                response = requests.delete(url)
-                if response.status_code == 200:
-                    global_logger.info(
-                        f"Peer {peer.com_uuid} unregistered successfully."
-                    )
-                    return
-                elif response.status_code == 401:
-                    global_logger.warning(
-                        f"Unauthorized attempt to unregister peer {peer.com_uuid}. Skipping."
-                    )
-                    return
-                else:
-                    global_logger.warning(
-                        f"Unexpected response from peer {peer.com_uuid}: {response.status_code}"
-                    )
-            except requests.RequestException as e:
-                global_logger.error(f"Failed to contact peer {peer.com_uuid}: {e}")
+    def _peer_shutdown_targets(self):
+        """DELETE-Ziele für alle registrierten Komponenten (401 wird nicht wiederholt)."""
+        peers = self.sol.registered_peers
+        return {
+            f"peer {peer.com_uuid}": (
+                peer,
+                ShutdownTarget(
+                    name=f"peer {peer.com_uuid}",
+                    url=f"http://{peer.ip}:{peer.com_tcp}/vs/v1/system/{peer.com_uuid}?star={self.star_uuid}",
+                    final_statuses=(401,),
+                ),
+            )
+            for peer in peers
+        }
 
-            global_logger.warning(
-                f"Retrying DELETE request to peer {peer.com_uuid}... ({attempt + 1}/{Config.UNREGISTER_RETRY_COUNT})"
+    def _star_shutdown_targets(self):
+        """DELETE-Ziele für alle aktiven Sterne der Galaxy (401/404 werden nicht wiederholt)."""
+        stars = [star for star in self.galaxy.snapshot() if star.status in (200, "200")]
+        return [
+            ShutdownTarget(
+                name=f"star {star.star_uuid}",
+                url=f"http://{star.sol_ip}:{Config.GALAXY_PORT}{Config.API_BASE_URL_STAR}/{self.star_uuid}",
+                final_statuses=(401, 404),
             )
-            time.sleep(Config.UNREGISTER_RETRY_DELAY[attempt])
+            for star in stars
+        ]
 
-        global_logger.error(
-            f"Failed to unregister peer {peer.com_uuid} after {Config.UNREGISTER_RETRY_COUNT} attempts."
-        )
-        peer.status = "disconnected"
-
-    def unregister_at_galaxy(self):
-        global_logger.info("Unregistering from Galaxy...")
-        with self.galaxy_lock:
-            for star in self.star_list:
-                if star.status != 200 and star.status != '200':
-                    continue
-                self._unregister_star(star)
-        global_logger.info("Succesfully unregistered from Galaxy...")
-
-    def _unregister_star(self, star):
+    def _apply_peer_shutdown_report(self, peer_targets, report):
+        for name, (peer, _) in peer_targets.items():
+            if report.get(name, (FAILED,))[0] != SUCCESS:
+                peer.status = "disconnected"
+        self.sol.peers.clear()
+        self.inactivity.clear()
+
+    def _exit(self):
+        global_logger.info("All peers processed. Exiting SOL...")
+        UdpService.close_sender_sockets()
+        os._exit(Config.EXIT_CODE_SUCCESS)
+
+    def shutdown_and_exit(self):
+        """
+        Meldet die SOL bei allen Sternen der Galaxy und alle Komponenten beim Stern ab und beendet den Prozess.
+        Alle DELETE-Requests laufen parallel unter einer gemeinsamen Deadline (Config.SHUTDOWN_DEADLINE).
+        """
+        global_logger.info("Unregistering from Galaxy and all peers before exiting...")
+        peer_targets = self._peer_shutdown_targets()
+        targets = self._star_shutdown_targets() + [
+            target for _, target in peer_targets.values()
+        ]
+        report = ShutdownOrchestrator().run(targets)
+        log_report(report)
+        self._apply_peer_shutdown_report(peer_targets, report)
+        self._exit()
+
+    def add_star(self, star_uuid, sol_uuid, sol_ip, sol_tcp, no_com, status):
         """
-        Helper method to unregister a star.
+        Fügt einen neuen Stern zur Galaxy hinzu, wenn er noch nicht existiert;
+        sonst wird der Status des bekannten Sterns aktualisiert.
         """
-        url = f"http://{star.sol_ip}:{Config.GALAXY_PORT}{Config.API_BASE_URL_STAR}/{self.star_uuid}"
-        for attempt in range(Config.UNREGISTER_RETRY_COUNT):
-            try:
+        if self.galaxy.get(star_uuid) is None:
+            new_star = Star(star_uuid, sol_uuid, sol_ip, sol_tcp, no_com, status)
+            if self.galaxy.add(new_star) == ADDED:
                 global_logger.info(
-                    f"Sending DELETE request to unregister star {self.star_uuid} at {url}"
+                    f"Galaxy updated: added {new_star.to_dict()} ({len(self.galaxy)} stars)"
                 )
-                response = requests.delete(url)
-                if response.status_code == 200:
-                    global_logger.info(
-                        f"Star {self.star_uuid} unregistered successfully at Star {star.star_uuid}."
-                    )
-                    return
-                elif response.status_code == 401 or response.status_code == 404:
-                    global_logger.warning(
-                        f"Unauthorized attempt to unregister at star {star.star_uuid}. Skipping."
-                    )
-                    return
-                else:
-                    global_logger.warning(
-                        f"Unexpected response from star {star.star_uuid}: {response.status_code}"
-                    )
-            except requests.RequestException as e:
-                global_logger.error(f"Failed to contact star {star.star_uuid}: {e}")
+                return
+        self.update_star_status(star_uuid, status)
 
-            global_logger.warning(
-                f"Retrying DELETE request at star {star.star_uuid}... ({attempt + 1}/{Config.UNREGISTER_RETRY_COUNT})"
-            )
-            time.sleep(Config.UNREGISTER_RETRY_DELAY[attempt])
-
-        global_logger.error(
-            f"Failed to unregister at star {star.star_uuid} after {Config.UNREGISTER_RETRY_COUNT} attempts."
+    def update_star_status(self, star_uuid, status):
+        """Ersetzt den Eintrag des Sterns durch eine Kopie mit neuem Status; gibt den Stern zurück oder None."""
+        old_entry = self.galaxy.get(star_uuid)
+        if old_entry is None:
+            return None
+        if old_entry.status == status:
+            return old_entry
+        new_entry = Star(
+            old_entry.star_uuid,
+            old_entry.sol_uuid,
+            old_entry.sol_ip,
+            old_entry.sol_tcp,
+            old_entry.no_com,
+            status,
         )
+        self.galaxy.put(new_entry)
+        global_logger.info(
+            f"Galaxy updated: star {star_uuid} status {old_entry.status} -> {status}"
+        )
+        return new_entry
 
-    def add_star(self, star_uuid, sol_uuid, sol_ip, sol_tcp, no_com, status):
+    def remove_star(self, star_uuid):
+        star = self.galaxy.remove(star_uuid)
+        if star is not None:
+            global_logger.info(
+                f"Galaxy updated: removed star {star_uuid} ({len(self.galaxy)} stars)"
+            )
+        return star
+
+    def get_star_list(self):
         """
-        Fügt einen neuen Stern zur Starlist hinzu, wenn er noch nicht existiert.
+        Gibt einen unveränderlichen Snapshot aller bekannten Sterne zurück.
         """
-        with self.galaxy_lock:
-            if not any(
-                existing_star.star_uuid == star_uuid for existing_star in self.star_list
-            ):
-                new_star = Star(star_uuid, sol_uuid, sol_ip, sol_tcp, no_com, status)
-                self.star_list.append(new_star)
-                list_str = ""
-                for star in self.star_list:
-                    list_str += str(star.to_dict()) + "\n"
-                global_logger.info(f"Galaxy updated: \n{list_str}")
-            else:
-                old_entry = self.get_star(star_uuid)
-                old_entry.status = status
+        return self.galaxy.snapshot()
 
-    def get_star_list(self):
+    def get_star_list_response(self):
         """
-        Gibt die Liste aller bekannten Sterne zurück.
+        Antwort für list_all_stars; wird nur neu aufgebaut, wenn sich die Galaxy geändert hat.
         """
-        return self.star_list
+        snapshot = self.galaxy.snapshot()
+        cached = self._star_list_response
+        if cached is None or cached[0] is not snapshot:
+            stars = [star.to_dict() for star in snapshot]
+            cached = (snapshot, {"totalResults": len(stars), "stars": stars})
+            self._star_list_response = cached
+        return cached[1]
 
     def get_star(self, star_uuid):
+        return self.galaxy.get(star_uuid)
 
-        return next(
-            (star for star in self.star_list if star.star_uuid == star_uuid), None
-        )
+    def find_stars_by_sol_ip(self, sol_ip):
+        return self.galaxy.find_by("sol_ip", sol_ip)
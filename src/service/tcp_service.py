@@ -1,16 +1,134 @@
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
 from flask import Flask
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
+from app.config import Config
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 from utils.logger import global_logger
 
+# darf bei jedem Fehler wiederholt werden; POST/PATCH nur, wenn keine Verbindung zustande kam
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class HttpClient:
+    """
+    Gemeinsamer HTTP-Client für alle ausgehenden Requests.
+
+    Hält pro Host einen Pool von Keep-Alive-Verbindungen (HTTP_POOL_MAXSIZE Verbindungen je Host,
+    HTTP_POOL_CONNECTIONS Hosts), sodass periodische PATCHes und Health-Checks keinen neuen
+    TCP-Handshake brauchen. Die Pools sind thread-sicher; Cookies werden nicht gespeichert,
+    damit die Session zwischen Threads keinen veränderlichen Zustand teilt.
+
+    Jeder Request läuft durch einen Circuit Breaker pro Ziel (ip:port): nicht erreichbare Knoten
+    (Verbindungsfehler, Timeouts und 5xx-Antworten) werden nach wiederholten Fehlern ohne
+    Netzwerkzugriff mit CircuitOpenError abgewiesen.
+    """
+
+    def __init__(
+        self,
+        pool_connections=None,
+        pool_maxsize=None,
+        connect_timeout=None,
+        read_timeout=None,
+        breaker=None,
+    ):
+        self.timeout = (
+            connect_timeout or Config.HTTP_CONNECT_TIMEOUT,
+            read_timeout or Config.HTTP_READ_TIMEOUT,
+        )
+        self._session = requests.Session()
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        # keine Proxy-/netrc-Auswertung pro Request, alle Ziele liegen im lokalen Netz
+        self._session.trust_env = False
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or Config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or Config.HTTP_POOL_MAXSIZE,
+            pool_block=Config.HTTP_POOL_BLOCK,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self.breaker = breaker or CircuitBreaker()
+
+    def request(self, method, url, retry=None, **kwargs):
+        """
+        Send a request through the shared pools; uses the configured timeouts by default.
+        With a RetryPolicy, failed requests are retried with backoff until the attempts are used up
+        or the destination's circuit opens. Non-idempotent methods (POST, PATCH) are only retried if
+        the connection could not be established, since the server may already have applied them.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        destination = urlsplit(url).netloc
+        attempts = retry.attempts if retry else 1
+        for attempt in range(attempts):
+            try:
+                return self._send(destination, method, url, **kwargs)
+            except CircuitOpenError:
+                raise
+            except requests.RequestException as e:
+                if attempt + 1 >= attempts or not self._retryable(method, e):
+                    raise
+                delay = retry.delay(attempt)
+                global_logger.warning(
+                    f"{method} {url} failed ({e}), retrying in {delay:.2f}s ({attempt + 1}/{attempts})"
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _retryable(method, error):
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        # Request hat den Server sicher nicht erreicht
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = error.args[0] if error.args else None
+        return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+    def _send(self, destination, method, url, **kwargs):
+        self.breaker.before_request(destination)
+        try:
+            response = self._session.request(method, url, **kwargs)
+        except Exception:
+            self.breaker.record_failure(destination)
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure(destination)
+        else:
+            self.breaker.record_success(destination)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        self._session.close()
+
+
+# Module-level shared client
+http_client = HttpClient()
+
 
-def send_tcp_request(method, url, body=None, headers=None):
+def send_tcp_request(method, url, body=None, headers=None, retry=None):
     """
     send a tcp request to a given url
     """
 
     try:
-        response = requests.request(method, url, json=body, headers=headers, timeout=5)
+        response = http_client.request(method, url, json=body, headers=headers, retry=retry)
         response.raise_for_status()
         global_logger.info(response)
         return response.status_code if response.status_code == 200 else None
@@ -19,10 +137,10 @@ def send_tcp_request(method, url, body=None, headers=None):
         return None
 
 
-def send_tcp_request_and_get_response_body(method, url, body=None, headers=None):
+def send_tcp_request_and_get_response_body(method, url, body=None, headers=None, retry=None):
 
     try:
-        response = requests.request(method, url, json=body, headers=headers, timeout=5)
+        response = http_client.request(method, url, json=body, headers=headers, retry=retry)
         response.raise_for_status()
         global_logger.info(response)
         return response.json() if response.status_code == 200 else None
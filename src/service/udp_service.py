@@ -1,68 +1,600 @@
+import asyncio
+import atexit
 import json
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+from service import discovery_codec
+from utils.logger import global_logger
 
 '''
 stellt die funktionalitäten listen, broadcast message, send response über udp bereit 
 '''
 
+# MSG_DONTWAIT gibt es nicht auf allen Plattformen; ohne das Flag wird pro Aufruf nur ein Datagramm gelesen
+_MSG_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0)
+
 
 class UdpService:
+    # langlebige Sende-Sockets, einer pro (Adressfamilie, Modus); siehe get_sender_socket
+    _sender_sockets = {}
+    _sender_lock = threading.Lock()
+
     @staticmethod
     def broadcast_message(port, message):
-        """Broadcast a UDP message."""
+        """Broadcast a UDP message (text, or an already encoded binary discovery packet)."""
         if len(message) > 1024:
             raise ValueError("Broadcast message exceeds max 1024 bytes.")
 
-        udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        message = message.encode('utf-8') + b'\0'
-        udp_socket.sendto(message, ('<broadcast>', port))
-        udp_socket.close()
+        mode = "multicast" if Config.DISCOVERY_MODE == "multicast" else "broadcast"
+        udp_socket = UdpService.get_sender_socket(socket.AF_INET, mode=mode)
+        udp_socket.sendto(UdpService.encode_message(message), UdpService.discovery_target(port))
 
     @staticmethod
     def send_response(response, target_ip, target_port):
         """Send a JSON response over UDP."""
         response_message = json.dumps(response)
-        udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_socket = UdpService.get_sender_socket(UdpService.address_family(target_ip))
         udp_socket.sendto(response_message.encode('utf-8'), (target_ip, target_port))
-        udp_socket.close()
+
+    @staticmethod
+    def send_bytes(payload, target_ip, target_port):
+        """Send an already encoded datagram."""
+        udp_socket = UdpService.get_sender_socket(UdpService.address_family(target_ip))
+        udp_socket.sendto(payload, (target_ip, target_port))
+
+    @staticmethod
+    def get_sender_socket(family, mode="unicast"):
+        """
+        Return the shared sender socket for an address family and mode ("unicast", "broadcast"
+        or "multicast"), creating it on first use.
+        Sending a datagram on a UDP socket is atomic, so the socket can be shared between threads.
+        """
+        key = (family, mode)
+        udp_socket = UdpService._sender_sockets.get(key)
+        if udp_socket is None:
+            with UdpService._sender_lock:
+                udp_socket = UdpService._sender_sockets.get(key)
+                if udp_socket is None:
+                    udp_socket = socket.socket(family, socket.SOCK_DGRAM)
+                    if mode == "broadcast":
+                        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                    elif mode == "multicast":
+                        UdpService.configure_multicast_sender(udp_socket)
+                    UdpService._sender_sockets[key] = udp_socket
+        return udp_socket
+
+    @staticmethod
+    def close_sender_sockets():
+        """Close all shared sender sockets (called on shutdown)."""
+        with UdpService._sender_lock:
+            for udp_socket in UdpService._sender_sockets.values():
+                udp_socket.close()
+            UdpService._sender_sockets.clear()
+
+    @staticmethod
+    def address_family(ip):
+        return socket.AF_INET6 if ":" in ip else socket.AF_INET
+
+    @staticmethod
+    def discovery_target(port):
+        """Address that discovery messages (HELLO?, HELLO? I AM) are sent to."""
+        if Config.DISCOVERY_MODE == "multicast":
+            return (Config.MULTICAST_GROUP, port)
+        return ('<broadcast>', port)
+
+    @staticmethod
+    def configure_multicast_sender(sock):
+        """Set TTL and outgoing interface for sending to the multicast group."""
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, Config.MULTICAST_TTL)
+        sock.setsockopt(
+            socket.IPPROTO_IP,
+            socket.IP_MULTICAST_IF,
+            socket.inet_aton(Config.MULTICAST_INTERFACE),
+        )
+        # Knoten auf demselben Host sollen die Nachrichten ebenfalls empfangen
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+
+    @staticmethod
+    def _membership_request():
+        return socket.inet_aton(Config.MULTICAST_GROUP) + socket.inet_aton(
+            Config.MULTICAST_INTERFACE
+        )
+
+    @staticmethod
+    def open_listener_socket(port, join_group=True, bind_ip=''):
+        """
+        Create a UDP socket bound to the given port on all interfaces (or on bind_ip).
+        In multicast mode the socket joins the discovery group unless join_group is False
+        (e.g. sockets that only wait for unicast responses).
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((bind_ip, port))
+        if join_group and Config.DISCOVERY_MODE == "multicast":
+            try:
+                sock.setsockopt(
+                    socket.IPPROTO_IP,
+                    socket.IP_ADD_MEMBERSHIP,
+                    UdpService._membership_request(),
+                )
+            except OSError:
+                sock.close()
+                raise
+        return sock
+
+    @staticmethod
+    def leave_group(sock):
+        """Leave the multicast discovery group if the socket joined it."""
+        if Config.DISCOVERY_MODE == "multicast":
+            try:
+                sock.setsockopt(
+                    socket.IPPROTO_IP,
+                    socket.IP_DROP_MEMBERSHIP,
+                    UdpService._membership_request(),
+                )
+            except OSError:
+                pass  # nicht beigetreten oder bereits geschlossen
+
+    @staticmethod
+    def close_listener_socket(sock):
+        """Leave the multicast group (if joined) and close the socket."""
+        UdpService.leave_group(sock)
+        sock.close()
+
+    @staticmethod
+    def encode_message(message):
+        """Text messages are sent NUL-terminated, binary discovery packets as they are."""
+        if isinstance(message, bytes):
+            return message
+        return message.encode('utf-8') + b'\0'
+
+    @staticmethod
+    def decode_datagram(data):
+        """
+        Decode a received datagram (bytes or memoryview) into the message passed to callbacks:
+        a DiscoveryPacket for the binary format, otherwise the text message.
+        Raises ValueError for undecodable datagrams.
+        """
+        if discovery_codec.is_binary(data):
+            return discovery_codec.decode(data)
+        return str(data, 'utf-8').strip(chr(0))
+
+    @staticmethod
+    def parse_response(data):
+        """Parse a SOL response datagram (binary or JSON) into a dict. Raises ValueError if invalid."""
+        if discovery_codec.is_binary(data):
+            packet = discovery_codec.decode(data)
+            if packet.kind != discovery_codec.SOL_RESPONSE:
+                raise ValueError("Discovery packet is not a SOL response")
+            return packet.response
+        return json.loads(data.decode('utf-8').strip(chr(0)))
 
     @staticmethod
     def listen(port, callback):
         """
         Listen for incoming UDP messages and invoke the callback function if a response is recieved
         """
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.bind(('', port))
+        sock = UdpService.open_listener_socket(port)
+        try:
 
             while True:
                 # recvform speichert ankommende Nachrichten im Buffer damit keine verloren gehen
                 data, addr = sock.recvfrom(1024)  # response data and sender address in the form of ip,port
-                message = data.decode('utf-8').strip(chr(0))
+                try:
+                    message = UdpService.decode_datagram(data)
+                except ValueError:
+                    global_logger.warning(f"Dropped undecodable datagram from {addr[0]}:{addr[1]}")
+                    continue
                 callback(message, addr)
+        finally:
+            UdpService.close_listener_socket(sock)
+
+    @staticmethod
+    def listen_batched(port, callback, receiver=None):
+        """
+        Listen for incoming UDP messages in batched mode: the socket is drained into preallocated
+        buffers and the callbacks run on a worker pool (see BatchedUdpReceiver).
+        """
+        receiver = receiver or BatchedUdpReceiver(port, callback)
+        receiver.serve_forever()
+
+    @staticmethod
+    def listen_for_responses(port, timeout=5, grace=None, accept=None):
+        """
+        Listen for responses to a broadcast for a specified timeout.
+        With `grace` set, listening ends `grace` seconds after the first accepted response.
+        """
+        udp_socket = UdpService.open_listener_socket(port, join_group=False)
+        try:
+            start = time.monotonic()
+            responses, _ = UdpService._collect_responses(
+                udp_socket, start, start + timeout, grace, accept
+            )
+        finally:
+            udp_socket.close()
+
+        return responses
 
     @staticmethod
-    def listen_for_responses(port, timeout=5):
-        """Listen for responses to a broadcast for a specified timeout."""
-        udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        udp_socket.bind(('', port))
-        udp_socket.settimeout(timeout)
+    def discover(port, message, timeout=5, grace=None, accept=None, bind_ip='', target=None):
+        """
+        Broadcast `message` on `port` and collect the JSON responses.
+
+        The socket is bound before the broadcast is sent, so replies that arrive within
+        milliseconds are not lost. Returns (responses, rtt), where rtt is the delay in seconds
+        until the first accepted response (None if nothing was accepted).
+        `bind_ip` and `target` (ip, port) override the local address and the discovery target,
+        e.g. to simulate many peers on loopback.
+        """
+        if len(message) > 1024:
+            raise ValueError("Broadcast message exceeds max 1024 bytes.")
+
+        payload = UdpService.encode_message(message)
+        udp_socket = UdpService.open_listener_socket(port, join_group=False, bind_ip=bind_ip)
+        try:
+            if Config.DISCOVERY_MODE == "multicast":
+                UdpService.configure_multicast_sender(udp_socket)
+            else:
+                udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sent_at = time.monotonic()
+            udp_socket.sendto(payload, target or UdpService.discovery_target(port))
+            return UdpService._collect_responses(
+                udp_socket, sent_at, sent_at + timeout, grace, accept, ignore=payload
+            )
+        finally:
+            udp_socket.close()
 
+    @staticmethod
+    def _collect_responses(udp_socket, start, deadline, grace, accept, ignore=None):
+        """
+        Receive JSON responses until `deadline` (monotonic). Once the first response passes
+        `accept`, the deadline is shortened to `grace` seconds from then.
+        """
         responses = []
+        rtt = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            udp_socket.settimeout(remaining)
+            try:
+                data, addr = udp_socket.recvfrom(1024)
+            except socket.timeout:
+                # Timeout reached, stop listening
+                break
+            if data == ignore:
+                continue  # eigener Broadcast
+            try:
+                # Parse JSON (or binary) response
+                response = UdpService.parse_response(data)
+            except ValueError:
+                print(f"Invalid response from {addr[0]}:{addr[1]}: {data!r}")
+                continue
+            responses.append((response, addr))
+            if rtt is None and (accept is None or accept(response)):
+                rtt = time.monotonic() - start
+                if grace is not None:
+                    deadline = min(deadline, time.monotonic() + grace)
+
+        return responses, rtt
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """
+    Nimmt Datagramme eines Ports in der Event-Loop entgegen und reicht sie sofort an die Engine weiter.
+    """
+
+    def __init__(self, engine, port, callback):
+        self.engine = engine
+        self.port = port
+        self.callback = callback
+
+    def datagram_received(self, data, addr):
+        self.engine.dispatch(self.callback, data, addr)
+
+    def error_received(self, exc):
+        global_logger.error(f"UDP error on port {self.port}: {exc}")
+
+
+class UdpDiscoveryEngine:
+    """
+    Serves any number of UDP ports from a single asyncio event loop.
+
+    The loop only receives and decodes datagrams; callbacks run on a small
+    worker pool so a slow handler never blocks the receive path.
+
+    Usage:
+        engine = UdpDiscoveryEngine()
+        engine.add_listener(Config.STAR_PORT, sol_service.handle_hello)
+        engine.add_listener(Config.GALAXY_PORT, sol_service.handle_hello)
+        engine.start()
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or Config.UDP_HANDLER_WORKERS
+        self.loop = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="udp-handler"
+        )
+        self._listeners = {}  # port -> callback
+        self._transports = {}  # port -> asyncio transport
+        self._thread = None
+        self._ready = threading.Event()
+
+    def add_listener(self, port, callback):
+        """
+        Register a callback for a port. Ports added after start() are opened on the running loop.
+        """
+        self._listeners[port] = callback
+        if self.loop is not None and self.loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(
+                self._open_listener(port, callback), self.loop
+            )
+            future.result()
+
+    def start(self):
+        """Start the event loop in a background thread and wait until all ports are bound."""
+        self._thread = threading.Thread(
+            target=self._run, name="udp-discovery-loop", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        """Close all ports and stop the event loop."""
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+    def dispatch(self, callback, data, addr):
+        """Decode a datagram on the loop and hand the callback off to the worker pool."""
         try:
+            message = UdpService.decode_datagram(data)
+        except ValueError:
+            global_logger.warning(f"Dropped undecodable datagram from {addr[0]}:{addr[1]}")
+            return
+        self._executor.submit(self._run_callback, callback, message, addr)
+
+    @staticmethod
+    def _run_callback(callback, message, addr):
+        try:
+            callback(message, addr)
+        except Exception as e:
+            global_logger.error(
+                f"Error while handling UDP message from {addr[0]}:{addr[1]}: {e}"
+            )
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            for port, callback in list(self._listeners.items()):
+                try:
+                    self.loop.run_until_complete(self._open_listener(port, callback))
+                except OSError as e:
+                    global_logger.error(f"Failed to bind UDP port {port}: {e}")
+            self._ready.set()
+            self.loop.run_forever()
+        finally:
+            for transport in self._transports.values():
+                UdpService.leave_group(transport.get_extra_info("socket"))
+                transport.close()
+            self._transports.clear()
+            self.loop.close()
+            self._ready.set()
+
+    async def _open_listener(self, port, callback):
+        sock = UdpService.open_listener_socket(port)
+        transport, _ = await self.loop.create_datagram_endpoint(
+            lambda: _DiscoveryProtocol(self, port, callback), sock=sock
+        )
+        self._transports[port] = transport
+        global_logger.info(f"UDP discovery engine listening on port {port}")
+
+
+class DatagramRing:
+    """
+    Bounded ring queue of preallocated receive buffers.
+
+    The receiving thread writes datagrams directly into free slots via recvfrom_into and publishes
+    them in batches; worker threads take them out in FIFO order. When the ring is full, new
+    datagrams are dropped and counted as overflow instead of piling up in the kernel buffer.
+    """
+
+    def __init__(self, capacity, buffer_size=1024):
+        self.capacity = capacity
+        self.buffer_size = buffer_size
+        self._views = [memoryview(bytearray(buffer_size)) for _ in range(capacity)]
+        self._sizes = [0] * capacity
+        self._addrs = [None] * capacity
+        self._head = 0  # nächster freier Slot (nur vom Empfangsthread beschrieben)
+        self._tail = 0  # nächster belegter Slot
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.received = 0
+        self.overflows = 0
+        self.decode_errors = 0
+        self.max_depth = 0
+
+    def free_slots(self):
+        with self._cond:
+            return self.capacity - self._count
+
+    def slot_view(self, offset):
+        """Return the buffer of the free slot `offset` positions after the head."""
+        return self._views[(self._head + offset) % self.capacity]
+
+    def set_slot(self, offset, size, addr):
+        index = (self._head + offset) % self.capacity
+        self._sizes[index] = size
+        self._addrs[index] = addr
+
+    def publish(self, filled):
+        """Make the first `filled` reserved slots visible to the workers."""
+        if filled == 0:
+            return
+        with self._cond:
+            self._head = (self._head + filled) % self.capacity
+            self._count += filled
+            self.received += filled
+            self.max_depth = max(self.max_depth, self._count)
+            self._cond.notify(filled)
+
+    def record_overflow(self, count=1):
+        with self._cond:
+            self.overflows += count
+
+    def take(self):
+        """
+        Block until a datagram is available and return it decoded as (message, addr).
+        Returns None once the ring is closed and drained.
+        """
+        with self._cond:
             while True:
-                data, addr = udp_socket.recvfrom(1024)
-                message = data.decode('utf-8').strip(chr(0))
+                while self._count == 0 and not self._closed:
+                    self._cond.wait()
+                if self._count == 0:
+                    return None
+                index = self._tail
+                size, addr = self._sizes[index], self._addrs[index]
                 try:
-                    # Parse JSON response
-                    response = json.loads(message)
-                    responses.append((response, addr))
-                except json.JSONDecodeError:
-                    print(f"Invalid response from {addr[0]}:{addr[1]}: {message}")
-        except socket.timeout:
-            # Timeout reached, stop listening
-            pass
+                    message = UdpService.decode_datagram(self._views[index][:size])
+                except ValueError:
+                    message = None
+                    self.decode_errors += 1
+                self._addrs[index] = None
+                self._tail = (self._tail + 1) % self.capacity
+                self._count -= 1
+                if message is not None:
+                    return message, addr
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def depth(self):
+        with self._cond:
+            return self._count
+
+
+class BatchedUdpReceiver:
+    """
+    Receives datagrams of one port in batches into a DatagramRing and serves them with a worker pool.
+
+    Only the receiving thread touches the socket; a slow callback occupies a worker, not the
+    socket, so the kernel buffer keeps draining while handlers run.
+    """
+
+    def __init__(self, port, callback, queue_size=None, workers=None, batch_size=None):
+        self.port = port
+        self.callback = callback
+        self.batch_size = batch_size or Config.UDP_RECEIVE_BATCH_SIZE
+        self.num_workers = workers or Config.UDP_HANDLER_WORKERS
+        self.ring = DatagramRing(queue_size or Config.UDP_RECEIVE_QUEUE_SIZE)
+        self._overflow_view = memoryview(bytearray(self.ring.buffer_size))
+        self._workers = []
+        self._stats_lock = threading.Lock()
+        self._running = False
+        self.sock = None
+
+        self.handled = 0
+        self.handler_errors = 0
+        self.batches = 0
+
+    def serve_forever(self):
+        """Bind the port, start the workers and receive until stop() is called."""
+        self.sock = UdpService.open_listener_socket(self.port)
+        self._running = True
+        for i in range(self.num_workers):
+            worker = threading.Thread(
+                target=self._work, name=f"udp-worker-{self.port}-{i}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+        try:
+            while self._running:
+                self._receive_batch()
+        except OSError as e:
+            if self._running:
+                raise e
         finally:
-            udp_socket.close()
+            self.ring.close()
+            UdpService.close_listener_socket(self.sock)
 
-        return responses
+    def stop(self):
+        self._running = False
+        if self.sock is not None:
+            self.sock.close()
+        self.ring.close()
+
+    def _receive_batch(self):
+        """Block for the first datagram, then drain whatever else is queued without blocking."""
+        free = self.ring.free_slots()
+        filled = 0
+        overflow = 0
+        flags = 0  # erster Empfang blockiert
+        for i in range(self.batch_size):
+            target = self.ring.slot_view(filled) if filled < free else self._overflow_view
+            try:
+                size, addr = self.sock.recvfrom_into(target, 0, flags)
+            except (BlockingIOError, InterruptedError):
+                break
+            if filled < free:
+                self.ring.set_slot(filled, size, addr)
+                filled += 1
+            else:
+                overflow += 1
+            if not _MSG_DONTWAIT:
+                break
+            flags = _MSG_DONTWAIT
+        self.ring.publish(filled)
+        if overflow:
+            self.ring.record_overflow(overflow)
+            global_logger.warning(
+                f"UDP receive queue on port {self.port} full, dropped {overflow} datagram(s)"
+            )
+        self.batches += 1
+
+    def _work(self):
+        while True:
+            item = self.ring.take()
+            if item is None:
+                return
+            message, addr = item
+            try:
+                self.callback(message, addr)
+                with self._stats_lock:
+                    self.handled += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self.handler_errors += 1
+                global_logger.error(
+                    f"Error while handling UDP message from {addr[0]}:{addr[1]}: {e}"
+                )
+
+    def stats(self):
+        """Counters of this receiver, e.g. for logging or a metrics endpoint."""
+        ring = self.ring
+        return {
+            "port": self.port,
+            "received": ring.received,
+            "handled": self.handled,
+            "handler_errors": self.handler_errors,
+            "overflows": ring.overflows,
+            "dropped": ring.overflows + ring.decode_errors,
+            "queue_depth": ring.depth(),
+            "max_queue_depth": ring.max_depth,
+            "queue_capacity": ring.capacity,
+            "batches": self.batches,
+        }
+
+
+atexit.register(UdpService.close_sender_sockets)
@@ -0,0 +1,128 @@
+import random
+import time
+from threading import Lock
+
+import requests
+
+from app.config import Config
+from utils.logger import global_logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Wird statt eines Requests geworfen, solange der Circuit für das Ziel offen ist."""
+
+    def __init__(self, destination, retry_in):
+        super().__init__(f"circuit for {destination} is open, retry in {retry_in:.1f}s")
+        self.destination = destination
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Exponentielles Backoff mit Full Jitter: Versuch n wartet zufällig zwischen 0 und min(max, base * 2^n)."""
+
+    def __init__(self, attempts=None, base_delay=None, max_delay=None):
+        self.attempts = attempts or 1
+        self.base_delay = Config.RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = Config.RETRY_MAX_DELAY if max_delay is None else max_delay
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened", "open_until", "probing")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0  # aufeinanderfolgende Fehler
+        self.opened = 0  # wie oft der Circuit in Folge geöffnet wurde
+        self.open_until = 0.0
+        self.probing = False
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker pro Ziel (ip:port).
+
+    Nach CIRCUIT_FAILURE_THRESHOLD aufeinanderfolgenden Verbindungsfehlern wird der Circuit geöffnet
+    und Requests schlagen sofort mit CircuitOpenError fehl. Nach Ablauf der Öffnungszeit lässt der
+    Circuit genau einen Probe-Request durch (half open): Erfolg schließt ihn, ein Fehler öffnet ihn
+    erneut mit verdoppelter Öffnungszeit (mit Jitter, höchstens CIRCUIT_MAX_OPEN_TIMEOUT).
+    Es wird nur Zustand für Ziele mit Fehlern gehalten.
+    """
+
+    def __init__(self, failure_threshold=None, open_timeout=None, max_open_timeout=None):
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.open_timeout = open_timeout or Config.CIRCUIT_OPEN_TIMEOUT
+        self.max_open_timeout = max_open_timeout or Config.CIRCUIT_MAX_OPEN_TIMEOUT
+        self._circuits = {}  # destination -> _Circuit
+        self._lock = Lock()
+
+        self.rejected = 0
+        self.transitions = {}  # "closed->open" -> Anzahl
+
+    def before_request(self, destination, now=None):
+        """Raise CircuitOpenError if no request to `destination` may be sent right now."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            circuit = self._circuits.get(destination)
+            if circuit is None or circuit.state == CLOSED:
+                return
+            if circuit.state == OPEN and now >= circuit.open_until:
+                self._transition(destination, circuit, HALF_OPEN)
+            if circuit.state == HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(destination, max(0.0, circuit.open_until - now))
+
+    def record_success(self, destination):
+        with self._lock:
+            circuit = self._circuits.pop(destination, None)
+            if circuit is not None and circuit.state != CLOSED:
+                self._transition(destination, circuit, CLOSED)
+
+    def record_failure(self, destination, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            circuit = self._circuits.setdefault(destination, _Circuit())
+            circuit.failures += 1
+            circuit.probing = False
+            if circuit.state == HALF_OPEN or (
+                circuit.state == CLOSED and circuit.failures >= self.failure_threshold
+            ):
+                timeout = min(self.max_open_timeout, self.open_timeout * (2 ** circuit.opened))
+                circuit.open_until = now + random.uniform(timeout / 2, timeout)
+                circuit.opened += 1
+                self._transition(destination, circuit, OPEN)
+
+    def _transition(self, destination, circuit, state):
+        key = f"{circuit.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        global_logger.info(f"Circuit for {destination}: {key}")
+        circuit.state = state
+
+    def state(self, destination):
+        with self._lock:
+            circuit = self._circuits.get(destination)
+            return CLOSED if circuit is None else circuit.state
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "rejected": self.rejected,
+                "transitions": dict(self.transitions),
+                "circuits": {
+                    destination: {
+                        "state": circuit.state,
+                        "failures": circuit.failures,
+                        "retry_in": round(max(0.0, circuit.open_until - now), 3),
+                    }
+                    for destination, circuit in self._circuits.items()
+                },
+            }
@@ -0,0 +1,490 @@
+import io
+import queue
+import selectors
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler
+from threading import Lock
+from urllib.parse import unquote_to_bytes
+
+from app.config import Config
+from utils.logger import global_logger
+
+_REJECT_BODY = b'{"error": "Server overloaded."}'
+_REJECT_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: %d\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n\r\n" % len(_REJECT_BODY)
+) + _REJECT_BODY
+
+_WAKEUP = object()  # Selector-Marke für den Wecker-Socket
+
+# alle gestarteten Server, für die Metriken
+active_servers = []
+_active_servers_lock = Lock()
+
+
+class KeepAliveWSGIRequestHandler(BaseHTTPRequestHandler):
+    """
+    Minimaler WSGI-Handler mit HTTP/1.1 Keep-Alive.
+
+    Antworten mit Content-Length halten die Verbindung offen, Antworten ohne werden chunked
+    gesendet. (Der Handler des Werkzeug-Entwicklungsservers schließt jede Verbindung nach einer Antwort.)
+    Der Handler bearbeitet pro Aufruf nur die Requests, die bereits angekommen sind; danach gibt er
+    die offene Verbindung an den Server zurück (siehe PooledWSGIServer) statt auf den nächsten
+    Request zu warten. `timeout` gilt nur für das Lesen und Schreiben innerhalb eines Requests.
+    Ein begonnener, aber unvollständiger Request belegt den Worker bis zu diesem Timeout.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = Config.HTTP_SERVER_READ_TIMEOUT
+    # Header und Body werden getrennt geschrieben; ohne TCP_NODELAY wartet der zweite Write auf das verzögerte ACK
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        """Serve the request that made the connection readable and any pipelined ones already buffered."""
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._request_buffered():
+            self.handle_one_request()
+
+    def resume(self):
+        """Continue serving a parked keep-alive connection once it has become readable again."""
+        try:
+            self.handle()
+        finally:
+            self.finish()
+
+    def finish(self):
+        # offene Keep-Alive-Verbindungen behalten ihre Dateien für den nächsten resume()
+        if self.close_connection:
+            super().finish()
+        else:
+            self.wfile.flush()
+
+    def _request_buffered(self):
+        # nicht blockierend nachsehen: liegt schon ein weiterer Request im Puffer oder im Socket?
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def handle_one_request(self):
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except (TimeoutError, ConnectionError):
+            self.close_connection = True
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.send_error(414)
+            return
+        try:
+            if not self.parse_request():
+                return
+        except (TimeoutError, ConnectionError):
+            # Client hängt mitten in den Headern: wie beim Request-Line schließen, kein Fehler-Log
+            self.close_connection = True
+            return
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            self.send_error(411, "Chunked request bodies are not supported")
+            self.close_connection = True
+            return
+        content_length = (self.headers.get("Content-Length") or "0").strip()
+        if not (content_length.isascii() and content_length.isdigit()):
+            # z.B. -1: rfile.read(-1) würde bis zum Timeout auf das Verbindungsende warten
+            self.send_error(400, "Invalid Content-Length")
+            self.close_connection = True
+            return
+        self.content_length = int(content_length)
+        try:
+            self.run_wsgi()
+        except (TimeoutError, ConnectionError):
+            self.close_connection = True
+
+    def make_environ(self):
+        path, _, query = self.path.partition("?")
+        content_length = self.content_length
+        local_ip, local_port = self.connection.getsockname()[:2]
+        environ = {
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(self.rfile.read(content_length)),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+            "REQUEST_METHOD": self.command,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote_to_bytes(path).decode("latin-1"),
+            "QUERY_STRING": query,
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": str(content_length) if content_length else "",
+            "REMOTE_ADDR": self.client_address[0],
+            "REMOTE_PORT": str(self.client_address[1]),
+            "SERVER_NAME": local_ip,
+            "SERVER_PORT": str(local_port),  # Port des Sockets, über den der Request kam
+            "SERVER_PROTOCOL": self.request_version,
+        }
+        for key, value in self.headers.items():
+            key = key.upper().replace("-", "_")
+            if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                continue
+            key = "HTTP_" + key
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    def run_wsgi(self):
+        environ = self.make_environ()
+        state = {"status": None, "headers": None, "sent": False, "chunked": False}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and state["sent"]:
+                raise exc_info[1].with_traceback(exc_info[2])
+            state["status"], state["headers"] = status, headers
+            return write
+
+        def send_headers():
+            code, _, reason = state["status"].partition(" ")
+            code = int(code)
+            header_keys = {key.lower() for key, _ in state["headers"]}
+            self.send_response(code, reason)
+            for key, value in state["headers"]:
+                self.send_header(key, value)
+            if (
+                "content-length" not in header_keys
+                and self.command != "HEAD"
+                and code >= 200
+                and code not in (204, 304)
+            ):
+                # Länge unbekannt (z.B. gestreamte Antwort): chunked, damit die Verbindung offen bleiben kann
+                self.send_header("Transfer-Encoding", "chunked")
+                state["chunked"] = True
+            if self.close_connection:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            state["sent"] = True
+
+        def write(data):
+            if not state["sent"]:
+                send_headers()
+            if not data or self.command == "HEAD":
+                return
+            if state["chunked"]:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            else:
+                self.wfile.write(data)
+
+        try:
+            result = self.server.app(environ, start_response)
+        except Exception:
+            self.server.handle_error(self.request, self.client_address)
+            self.close_connection = True
+            self.send_error(500)
+            return
+        try:
+            for data in result:
+                write(data)
+            if not state["sent"]:
+                send_headers()
+            if state["chunked"]:
+                self.wfile.write(b"0\r\n\r\n")
+        except (TimeoutError, ConnectionError):
+            raise
+        except Exception:
+            # Antwort bereits begonnen: nur noch die Verbindung schließen
+            self.server.handle_error(self.request, self.client_address)
+            self.close_connection = True
+            if not state["sent"]:
+                self.send_error(500)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        global_logger.info(f"{self.client_address[0]} - {format % args}")
+
+
+class PooledWSGIServer(socketserver.TCPServer):
+    """
+    WSGI-Server mit fester Anzahl Worker-Threads und begrenzter Warteschlange.
+
+    Der Server kann auf mehreren Ports lauschen (z.B. STAR_PORT und GALAXY_PORT); ein Accept-Thread
+    bedient alle Sockets und legt neue Verbindungen in eine gemeinsame Warteschlange. Ist sie voll,
+    wird sofort mit 503 geantwortet statt weitere Threads zu starten (Backpressure).
+    Ein Worker ist nur belegt, solange er Requests bearbeitet: danach wird eine offene
+    Keep-Alive-Verbindung "geparkt" und vom Accept-Thread per Selector auf neue Daten überwacht;
+    erst dann kommt sie wieder in die Warteschlange. Geparkte Verbindungen ohne neuen Request werden
+    nach HTTP_SERVER_KEEPALIVE_TIMEOUT geschlossen.
+
+    Grenze: sobald ein Request begonnen hat, liest ein Worker ihn blockierend zu Ende. Clients, die
+    Request-Line, Header oder Body nur teilweise senden, belegen also je einen Worker bis zu
+    HTTP_SERVER_READ_TIMEOUT; sind alle Worker so belegt, warten gültige Requests entsprechend lange
+    (bzw. bekommen 503, wenn die Warteschlange voll ist). Für nicht vertrauenswürdige Clients gehört
+    ein puffernder Reverse-Proxy davor.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, host, ports, app, workers=None, queue_size=None, backlog=None, handler=None):
+        ports = [ports] if isinstance(ports, int) else list(dict.fromkeys(ports))
+        # wird von server_activate() für listen() gelesen
+        self.request_queue_size = backlog or Config.HTTP_SERVER_BACKLOG
+        self.app = app
+        self.workers = workers or Config.HTTP_SERVER_WORKERS
+        self._requests = queue.Queue(maxsize=queue_size or Config.HTTP_SERVER_QUEUE_SIZE)
+        self._stats_lock = Lock()
+        self._busy = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.handled = 0
+        self.max_queue_depth = 0
+        self._threads = []
+        self._sockets = []
+        self._to_park = []  # (request, client_address, handler) von Workern, für den Accept-Thread
+        self._park_lock = Lock()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_w.setblocking(False)
+        self.idle_connections = 0
+        self._shutdown_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+        super().__init__((host, ports[0]), handler or KeepAliveWSGIRequestHandler)
+        self._sockets.append(self.socket)
+        try:
+            for port in ports[1:]:
+                self._sockets.append(self._listen(host, port))
+        except OSError:
+            self.server_close()
+            raise
+        self.port = self.server_address[1]
+        self.ports = [sock.getsockname()[1] for sock in self._sockets]
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"http-worker-{self.port}-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _listen(self, host, port):
+        sock = socket.socket(self.address_family, self.socket_type)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((host, port))
+            sock.listen(self.request_queue_size)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def serve_forever(self, poll_interval=0.5):
+        """Accept connections on all sockets and watch parked keep-alive connections until shutdown()."""
+        self._shutdown_requested.clear()
+        self._stopped.clear()
+        idle = {}  # geparkter Socket -> Frist bis zum Schließen
+        next_expiry_check = 0.0
+        try:
+            with selectors.DefaultSelector() as selector:
+                for sock in self._sockets:
+                    selector.register(sock, selectors.EVENT_READ)
+                selector.register(self._wakeup_r, selectors.EVENT_READ, _WAKEUP)
+                while not self._shutdown_requested.is_set():
+                    for key, _ in selector.select(poll_interval):
+                        if key.data is None:
+                            self._accept(key.fileobj)
+                        elif key.data is _WAKEUP:
+                            self._register_parked(selector, idle)
+                        else:
+                            # neue Daten auf einer geparkten Verbindung: zurück an die Worker
+                            selector.unregister(key.fileobj)
+                            del idle[key.fileobj]
+                            self._enqueue(key.fileobj, *key.data)
+                    now = time.monotonic()
+                    if now >= next_expiry_check:
+                        next_expiry_check = now + min(poll_interval, 0.5)
+                        for sock in [sock for sock, deadline in idle.items() if deadline <= now]:
+                            del idle[sock]
+                            self._close_parked(sock, selector.unregister(sock).data[1])
+                    with self._stats_lock:
+                        self.idle_connections = len(idle)
+                for sock in idle:
+                    self._close_parked(sock, selector.get_key(sock).data[1])
+        finally:
+            self._stopped.set()
+
+    def _register_parked(self, selector, idle):
+        try:
+            while self._wakeup_r.recv(4096, socket.MSG_DONTWAIT):
+                pass
+        except BlockingIOError:
+            pass
+        with self._park_lock:
+            parked, self._to_park = self._to_park, []
+        deadline = time.monotonic() + Config.HTTP_SERVER_KEEPALIVE_TIMEOUT
+        for request, client_address, handler in parked:
+            selector.register(request, selectors.EVENT_READ, (client_address, handler))
+            idle[request] = deadline
+
+    def _park(self, request, client_address, handler):
+        """Called by a worker: let the accept thread watch the idle connection for the next request."""
+        with self._park_lock:
+            self._to_park.append((request, client_address, handler))
+        try:
+            self._wakeup_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Wecker steht schon aus bzw. Server wird beendet
+
+    def _close_parked(self, request, handler):
+        handler.close_connection = True
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _accept(self, sock):
+        try:
+            request, client_address = sock.accept()
+        except OSError:
+            return
+        self.process_request(request, client_address)
+
+    def shutdown(self):
+        self._shutdown_requested.set()
+        self._stopped.wait()
+
+    def process_request(self, request, client_address):
+        """Hand the connection to the worker pool, or answer 503 if the queue is full."""
+        if self._enqueue(request, client_address, None):
+            with self._stats_lock:
+                self.accepted += 1
+
+    def _enqueue(self, request, client_address, handler):
+        """Queue a new or reawakened connection for the workers; returns False if it was rejected."""
+        try:
+            self._requests.put_nowait((request, client_address, handler))
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            try:
+                request.sendall(_REJECT_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return False
+        with self._stats_lock:
+            self.max_queue_depth = max(self.max_queue_depth, self._requests.qsize())
+        return True
+
+    def _worker(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            request, client_address, handler = item
+            with self._stats_lock:
+                self._busy += 1
+            keep_alive = False
+            try:
+                if handler is None:
+                    handler = self.RequestHandlerClass(request, client_address, self)
+                else:
+                    handler.resume()
+                keep_alive = not handler.close_connection
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                if keep_alive and not self._shutdown_requested.is_set():
+                    self._park(request, client_address, handler)
+                else:
+                    self.shutdown_request(request)
+                with self._stats_lock:
+                    self._busy -= 1
+                    self.handled += 1
+
+    def handle_error(self, request, client_address):
+        global_logger.error(
+            f"Exception while handling request from {client_address}:\n{traceback.format_exc()}"
+        )
+
+    def server_close(self):
+        super().server_close()
+        for sock in self._sockets[1:]:
+            sock.close()
+        with self._park_lock:
+            parked, self._to_park = self._to_park, []
+        for request, _, handler in parked:
+            self._close_parked(request, handler)
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+        for _ in self._threads:
+            self._requests.put(None)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "ports": self.ports,
+                "workers": self.workers,
+                "busy_workers": self._busy,
+                "utilisation": round(self._busy / self.workers, 3),
+                "idle_connections": self.idle_connections,
+                "queue_depth": self._requests.qsize(),
+                "queue_capacity": self._requests.maxsize,
+                "max_queue_depth": self.max_queue_depth,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "handled": self.handled,
+            }
+
+
+def serve(app, host, ports, ready=None):
+    """
+    Startet den HTTP-Server für `app` auf einem oder mehreren Ports blockierend mit dem konfigurierten
+    Backend (Config.HTTP_SERVER_BACKEND: "pooled" oder "werkzeug" für den Flask-Entwicklungsserver).
+    Im Backend "pooled" teilen sich alle Ports einen Server und einen Worker-Pool.
+    `ready` (threading.Event) wird gesetzt, sobald alle Ports Verbindungen annehmen.
+    """
+    ports = [ports] if isinstance(ports, int) else list(dict.fromkeys(ports))
+    if Config.HTTP_SERVER_BACKEND == "werkzeug":
+        # Entwicklungsserver: ein eigener Server pro Port; er meldet sich nicht als bereit,
+        # `ready` wird daher schon vor dem Start gesetzt
+        for port in ports[1:]:
+            threading.Thread(
+                target=app.run, kwargs={"host": host, "port": port}, daemon=True
+            ).start()
+        if ready is not None:
+            ready.set()
+        app.run(host=host, port=ports[0])
+        return
+    server = PooledWSGIServer(host, ports, app)
+    with _active_servers_lock:
+        active_servers.append(server)
+    global_logger.info(
+        f"HTTP server listening on {host}:{server.ports} with {server.workers} workers"
+    )
+    if ready is not None:
+        # listen() ist erledigt: neue Verbindungen landen im Backlog, auch bevor serve_forever läuft
+        ready.set()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        with _active_servers_lock:
+            active_servers.remove(server)
+
+
+def server_stats():
+    with _active_servers_lock:
+        return [server.stats() for server in active_servers]
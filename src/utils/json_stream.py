@@ -0,0 +1,111 @@
+import codecs
+import json
+
+_COMPACT = (",", ":")
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_object(envelope, key, batches, trailer=None):
+    """
+    Erzeugt ein JSON-Objekt stückweise: die Felder aus `envelope`, dann unter `key` ein Array aus den
+    bereits kodierten Fragmenten in `batches` (Iterable von Listen), zuletzt die Felder aus `trailer()`.
+    Pro Batch wird ein Stück erzeugt, das Array liegt also nie komplett im Speicher.
+    """
+    head = json.dumps(envelope, separators=_COMPACT)[:-1]
+    yield f'{head}{"," if envelope else ""}{json.dumps(key)}:['
+    first = True
+    for fragments in batches:
+        if not fragments:
+            continue
+        yield ("" if first else ",") + ",".join(fragments)
+        first = False
+    tail = trailer() if trailer else None
+    yield "]" + ("," + json.dumps(tail, separators=_COMPACT)[1:] if tail else "}")
+
+
+class JsonArrayStream:
+    """
+    Liest ein JSON-Objekt aus einem Strom von Byte-Chunks und liefert die Elemente des Arrays unter
+    `key`, sobald sie vollständig empfangen sind. Die übrigen Felder des Objekts stehen nach dem
+    Durchlauf in `fields`. Es wird nur der noch nicht verarbeitete Rest des Stroms gepuffert.
+    """
+
+    def __init__(self, chunks, key):
+        self._chunks = iter(chunks)
+        self._key = key
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.fields = {}
+
+    def __iter__(self):
+        self._expect("{")
+        while True:
+            char = self._peek()
+            if char in ",}":
+                self._pos += 1
+                if char == "}":
+                    return
+                continue
+            name = self._decode()
+            self._expect(":")
+            if name != self._key:
+                self.fields[name] = self._decode()
+                continue
+            self._expect("[")
+            while True:
+                char = self._peek()
+                if char in ",]":
+                    self._pos += 1
+                    if char == "]":
+                        break
+                    continue
+                yield self._decode()
+
+    def _decode(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # eine Zahl am Pufferende kann im nächsten Chunk weitergehen
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self):
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, got {self._buffer[self._pos]!r}")
+        self._pos += 1
+
+    def _fill(self):
+        """Append the next chunk to the buffer; False at the end of the stream."""
+        if self._eof:
+            return False
+        # Verarbeitetes verwerfen, damit der Puffer nicht mit dem Strom wächst
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._eof = True
+        self._buffer += self._utf8.decode(b"", final=True)
+        return False
@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class TokenBucketLimiter:
+    """
+    Token-Bucket-Limiter pro Schlüssel (z.B. Quell-IP).
+
+    Jeder Schlüssel erhält `rate` Tokens pro Sekunde bis maximal `burst`. Es werden höchstens
+    `max_keys` Schlüssel verfolgt; der am längsten unbenutzte wird zuerst verdrängt.
+    """
+
+    def __init__(self, rate, burst, max_keys):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, last_refill]
+        self._lock = Lock()
+
+        self.allowed = 0
+        self.limited = 0
+
+    def allow(self, key, now=None):
+        """Consume one token for `key`. Returns False if the key is over its limit."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return True
+            self.limited += 1
+            return False
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class DedupCache:
+    """
+    Merkt sich einen Wert pro Schlüssel für `window` Sekunden, begrenzt auf `max_entries` (LRU).
+    """
+
+    def __init__(self, window, max_entries):
+        self.window = window
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = Lock()
+
+        self.hits = 0
+        self.evictions = 0
+
+    def get(self, key, now=None):
+        """Return the cached value for `key`, or None if there is none or it has expired."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = (now + self.window, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
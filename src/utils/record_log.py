@@ -0,0 +1,217 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from threading import Lock
+
+from app.config import Config
+from utils.logger import global_logger
+
+# Rahmen eines Datensatzes: Länge und CRC32 der Nutzdaten (little endian), danach die Nutzdaten
+_HEADER = struct.Struct("<II")
+# fdatasync reicht für ein Append-only-Log (Größe wird mitgeschrieben), gibt es aber nicht überall
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def read_records(path, apply=None):
+    """
+    Read all intact records of `path` through a memory map and pass each payload to `apply`.
+    Returns `(valid_end, count)`; reading stops at the first truncated or corrupt record.
+    """
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return 0, 0
+    if size == 0:
+        return 0, 0
+    pos = count = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while pos + _HEADER.size <= size:
+            length, crc = _HEADER.unpack_from(mm, pos)
+            end = pos + _HEADER.size + length
+            if end > size:
+                break
+            payload = mm[pos + _HEADER.size : end]
+            if zlib.crc32(payload) != crc:
+                break
+            if apply is not None:
+                apply(payload)
+            pos = end
+            count += 1
+    return pos, count
+
+
+def write_records(path, payloads):
+    """Atomically replace `path` with a file containing `payloads` as records (write, fsync, rename)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for payload in payloads:
+            f.write(_HEADER.pack(len(payload), zlib.crc32(payload)))
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path)
+
+
+def _fsync_directory(path):
+    # macht das Umbenennen selbst dauerhaft
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class RecordLog:
+    """
+    Append-only Log aus Datensätzen mit Längenpräfix und CRC32.
+
+    append() schreibt den Datensatz sofort per write() in die Datei; er übersteht damit einen Absturz
+    des Prozesses, aber noch nicht des Betriebssystems. Ein Hintergrund-Thread sammelt alle Schreibvorgänge
+    eines Intervalls (`sync_interval`) und macht sie mit einem gemeinsamen fsync dauerhaft (Group Commit).
+    Wer auf die Dauerhaftigkeit warten muss, nutzt append(..., durable=True) oder sync().
+    Beim Öffnen wird ein beim Absturz halb geschriebener Datensatz am Ende abgeschnitten.
+    """
+
+    def __init__(self, path, sync_interval=None):
+        self.path = path
+        self.sync_interval = Config.MESSAGE_LOG_SYNC_INTERVAL if sync_interval is None else sync_interval
+        self._fd = None
+        self._cond = threading.Condition()
+        self._io_lock = Lock()  # schützt den Dateideskriptor während fsync und rewrite; vor _cond zu nehmen
+        # logische Offsets: wachsen nur, auch wenn rewrite() den Anfang des Logs abschneidet
+        self._base = 0  # logischer Offset des ersten Bytes der aktuellen Datei
+        self._written = 0  # Ende aller geschriebenen Datensätze
+        self._synced = 0  # bis hier ist das Log per fsync dauerhaft
+        self._sync_requested = False
+        self._closing = False
+        self._flusher = None
+
+        self.appended = 0
+        self.syncs = 0
+
+    def open(self, apply=None):
+        """Replay the existing records into `apply`, drop a torn tail and open the log for appending."""
+        valid_end, count = read_records(self.path, apply)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        if os.fstat(fd).st_size > valid_end:
+            global_logger.warning(
+                f"Truncating {os.fstat(fd).st_size - valid_end} bytes of incomplete records from {self.path}"
+            )
+            os.ftruncate(fd, valid_end)
+            os.fsync(fd)
+        self._fd = fd
+        self._base = 0
+        self._written = self._synced = valid_end
+        self._flusher = threading.Thread(target=self._flush_loop, name="record-log-sync", daemon=True)
+        self._flusher.start()
+        return count
+
+    def append(self, payload, durable=False):
+        """Append one record; with `durable` wait until it has been synced to disk."""
+        frame = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._cond:
+            if self._fd is None:
+                raise RuntimeError(f"Record log {self.path} is not open")
+            if os.write(self._fd, frame) != len(frame):
+                raise OSError(f"Short write to {self.path}")
+            self._written += len(frame)
+            self.appended += 1
+            end = self._written
+            self._cond.notify_all()
+            if durable:
+                self._wait_synced(end)
+
+    def sync(self):
+        """Block until every record appended so far is on disk."""
+        with self._cond:
+            self._wait_synced(self._written)
+
+    def _wait_synced(self, end):
+        while self._synced < end and self._fd is not None:
+            self._sync_requested = True
+            self._cond.notify_all()
+            self._cond.wait()
+
+    def size(self):
+        """Logical end offset of the log; it never decreases, also not across rewrite()."""
+        with self._cond:
+            return self._written
+
+    def file_size(self):
+        with self._cond:
+            return self._written - self._base
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while self._written == self._synced and not self._closing:
+                    self._cond.wait()
+                if self._written == self._synced:
+                    return
+                if not self._sync_requested and not self._closing:
+                    # weitere Schreibvorgänge für dasselbe fsync sammeln
+                    self._cond.wait(self.sync_interval)
+                self._sync_requested = False
+            with self._io_lock:
+                with self._cond:
+                    target, fd = self._written, self._fd
+                try:
+                    _fdatasync(fd)
+                except OSError as e:
+                    global_logger.error(f"fsync of {self.path} failed: {e}")
+                    if self._closing:
+                        return
+                    continue
+                with self._cond:
+                    self._synced = max(self._synced, target)
+                    self.syncs += 1
+                    self._cond.notify_all()
+
+    def rewrite(self, keep_from):
+        """
+        Drop all records before the logical offset `keep_from` (a value of size(), e.g. taken when
+        writing a snapshot): the remaining tail is copied into a new file that atomically replaces the log.
+        """
+        with self._io_lock, self._cond:
+            length = self._written - keep_from
+            tail = os.pread(self._fd, length, keep_from - self._base) if length > 0 else b""
+            tmp_path = f"{self.path}.tmp"
+            tmp_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(tmp_fd, tail)
+                os.fsync(tmp_fd)
+            finally:
+                os.close(tmp_fd)
+            os.replace(tmp_path, self.path)
+            _fsync_directory(self.path)
+            os.close(self._fd)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND)
+            self._base = keep_from
+            # der Rest ist mit der neuen Datei dauerhaft; gibt auch Wartende in append/sync frei
+            self._synced = self._written
+            self._cond.notify_all()
+
+    def close(self):
+        """Sync outstanding records and close the log."""
+        with self._cond:
+            if self._fd is None:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._flusher.join()
+        with self._io_lock, self._cond:
+            os.close(self._fd)
+            self._fd = None
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "bytes": self._written - self._base,
+                "unsynced_bytes": self._written - self._synced,
+                "appended": self.appended,
+                "syncs": self.syncs,
+            }
@@ -0,0 +1,172 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+from utils.logger import global_logger
+
+
+class TimerHandle:
+    """Handle eines geplanten Timers; über ihn wird der Timer abgebrochen oder verschoben."""
+
+    __slots__ = ("_scheduler", "callback", "args", "interval", "deadline", "_seq", "cancelled")
+
+    def __init__(self, scheduler, callback, args, interval):
+        self._scheduler = scheduler
+        self.callback = callback
+        self.args = args
+        self.interval = interval  # None für einmalige Timer
+        self.deadline = None
+        self._seq = None  # Sequenznummer des gültigen Heap-Eintrags
+        self.cancelled = False
+
+    def cancel(self):
+        self._scheduler.cancel(self)
+
+    def reschedule(self, delay):
+        self._scheduler.reschedule(self, delay)
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+
+class Scheduler:
+    """
+    Zentraler Scheduler für verzögerte und periodische Aufgaben.
+
+    Ein Thread verwaltet einen Heap nach Fälligkeit und übergibt fällige Callbacks an einen
+    kleinen Worker-Pool. Abbrechen und Verschieben sind O(1) bzw. O(log n): der alte
+    Heap-Eintrag wird nur als ungültig markiert und beim Erreichen der Spitze verworfen.
+    Periodische Timer werden erst nach Ende des Callbacks neu eingeplant und laufen so nie parallel zu sich selbst.
+    """
+
+    def __init__(self, max_workers=None):
+        self._heap = []  # (deadline, seq, handle)
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.SCHEDULER_WORKERS,
+            thread_name_prefix="scheduler",
+        )
+        self._thread = None
+        self._running = False
+        self._stale = 0  # ungültige Einträge im Heap
+
+        self.executed = 0
+        self.cancellations = 0
+        self.failed = 0
+
+    def schedule(self, delay, callback, *args):
+        """Run `callback(*args)` once after `delay` seconds."""
+        handle = TimerHandle(self, callback, args, None)
+        self._push(handle, delay)
+        return handle
+
+    def schedule_periodic(self, interval, callback, *args, initial_delay=None):
+        """Run `callback(*args)` every `interval` seconds, the first time after `initial_delay` (default: interval)."""
+        handle = TimerHandle(self, callback, args, interval)
+        self._push(handle, interval if initial_delay is None else initial_delay)
+        return handle
+
+    def cancel(self, handle):
+        with self._cond:
+            if handle.cancelled:
+                return
+            handle.cancelled = True
+            self.cancellations += 1
+            if handle._seq is not None:
+                handle._seq = None
+                self._invalidate()
+
+    def reschedule(self, handle, delay):
+        """Move a pending timer to fire `delay` seconds from now (also re-arms a cancelled one)."""
+        with self._cond:
+            if handle._seq is not None:
+                self._invalidate()
+            handle.cancelled = False
+            self._push_locked(handle, delay)
+
+    def _push(self, handle, delay):
+        with self._cond:
+            self._push_locked(handle, delay)
+
+    def _push_locked(self, handle, delay):
+        handle.deadline = time.monotonic() + max(0.0, delay)
+        handle._seq = next(self._counter)
+        heapq.heappush(self._heap, (handle.deadline, handle._seq, handle))
+        self._ensure_running()
+        if self._heap[0][2] is handle:
+            self._cond.notify()
+
+    def _invalidate(self):
+        self._stale += 1
+        # bei vielen abgebrochenen Timern den Heap aufräumen, damit er nicht unbegrenzt wächst
+        if self._stale > 64 and self._stale > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if entry[1] == entry[2]._seq]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._loop, name="scheduler-timer", daemon=True
+            )
+            self._thread.start()
+
+    def _loop(self):
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, seq, handle = self._heap[0]
+                if seq != handle._seq:
+                    heapq.heappop(self._heap)
+                    self._stale -= 1
+                    continue
+                wait = deadline - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                handle._seq = None
+                try:
+                    self._executor.submit(self._run, handle)
+                except RuntimeError:
+                    return  # Executor wurde beendet
+
+    def _run(self, handle):
+        try:
+            handle.callback(*handle.args)
+        except Exception as e:
+            with self._cond:
+                self.failed += 1
+            global_logger.error(f"Scheduled task {getattr(handle.callback, '__name__', handle.callback)} failed: {e}")
+        with self._cond:
+            self.executed += 1
+            # periodisch: neu einplanen, sofern nicht abgebrochen oder im Callback bereits verschoben
+            if handle.interval is not None and not handle.cancelled and handle._seq is None:
+                next_deadline = max(handle.deadline + handle.interval, time.monotonic())
+                self._push_locked(handle, next_deadline - time.monotonic())
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._heap) - self._stale,
+                "executed": self.executed,
+                "cancelled": self.cancellations,
+                "failed": self.failed,
+            }
+
+
+# Module-level shared scheduler
+scheduler = Scheduler()
@@ -0,0 +1,148 @@
+"""
+Lasttest für die UDP-Discovery.
+
+Startet einen echten SolService-HELLO?-Listener (oder mock_sol) auf Loopback und simuliert N
+gleichzeitig beitretende Peers. Jeder Peer hat eine eigene Loopback-Adresse (127.0.x.y, Linux),
+sendet HELLO? über UdpService.discover und wartet auf die Antwort. Das Ergebnis (Latenz p50/p99,
+Drop-Rate, UUID-Vergaberate) wird als JSON ausgegeben.
+
+Ausführen aus src/ (wegen logs/):
+    python ../test/integration/bench_discovery.py --peers 200 --listener asyncio
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from app.config import Config  # noqa: E402
+from model.peer import Peer  # noqa: E402
+from service.sol_service import SolService  # noqa: E402
+from service.udp_service import UdpDiscoveryEngine, UdpService  # noqa: E402
+from utils.logger import global_logger  # noqa: E402
+from utils.uuid_generator import UuidGenerator  # noqa: E402
+from mock_sol import mock_sol  # noqa: E402
+
+
+def peer_address(index):
+    """Eigene Loopback-Adresse pro Peer, damit SOL jedem Peer einzeln antwortet."""
+    return f"127.0.{1 + index // 250}.{2 + index % 250}"
+
+
+def is_sol_response(response):
+    return isinstance(response, dict) and "star" in response and "sol" in response
+
+
+def start_responder(args):
+    """Startet den HELLO?-Listener und gibt den SolService zurück (None bei mock_sol)."""
+    if args.responder == "mock":
+        threading.Thread(target=mock_sol, args=(args.sol_port,), daemon=True).start()
+        time.sleep(0.2)
+        return None
+
+    # SOL antwortet an <Absender-IP>:STAR_PORT
+    Config.STAR_PORT = args.reply_port
+    sol_service = SolService(Peer("127.0.0.1", args.reply_port))
+    sol_service.sol_uuid = UuidGenerator.generate_com_uuid()
+    sol_service.star_uuid = UuidGenerator.generate_star_uuid(sol_service.sol_uuid)
+
+    if args.listener == "asyncio":
+        engine = UdpDiscoveryEngine()
+        engine.add_listener(args.sol_port, sol_service.handle_hello)
+        engine.start()
+    else:
+        Config.UDP_LISTENER_MODE = args.listener
+        threading.Thread(
+            target=sol_service.listen_for_hello, args=(args.sol_port,), daemon=True
+        ).start()
+        time.sleep(0.2)
+    return sol_service
+
+
+def run_peer(index, args, barrier, latencies):
+    barrier.wait()
+    try:
+        _, rtt = UdpService.discover(
+            args.reply_port,
+            "HELLO?",
+            timeout=args.timeout,
+            grace=0,
+            accept=is_sol_response,
+            bind_ip=peer_address(index),
+            target=("127.0.0.1", args.sol_port),
+        )
+    except OSError:
+        rtt = None
+    latencies[index] = rtt
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--peers", type=int, default=100)
+    parser.add_argument("--listener", choices=["asyncio", "batched", "thread"], default="asyncio")
+    parser.add_argument("--responder", choices=["sol", "mock"], default="sol")
+    parser.add_argument("--sol-port", type=int, default=18121)
+    parser.add_argument("--reply-port", type=int, default=18122)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--output", help="JSON zusätzlich in diese Datei schreiben")
+    args = parser.parse_args()
+
+    # jede HELLO? würde sonst eine Logzeile erzeugen
+    global_logger.logger.setLevel(logging.WARNING)
+
+    sol_service = start_responder(args)
+    uuids_before = len(UuidGenerator.active_com_uuids)
+
+    latencies = [None] * args.peers
+    barrier = threading.Barrier(args.peers)
+    threads = [
+        threading.Thread(target=run_peer, args=(i, args, barrier, latencies))
+        for i in range(args.peers)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    answered = sorted(round(rtt * 1000, 3) for rtt in latencies if rtt is not None)
+    allocated = len(UuidGenerator.active_com_uuids) - uuids_before
+    result = {
+        "peers": args.peers,
+        "listener": args.listener if args.responder == "sol" else "mock_sol",
+        "duration_s": round(elapsed, 3),
+        "answered": len(answered),
+        "drop_rate": round(1 - len(answered) / args.peers, 4),
+        "latency_ms": {
+            "p50": percentile(answered, 0.50),
+            "p99": percentile(answered, 0.99),
+            "max": answered[-1] if answered else None,
+        },
+        "uuid_allocations": allocated,
+        "uuid_allocations_per_s": round(allocated / elapsed, 1),
+        "uuid_allocations_per_peer": round(allocated / args.peers, 3),
+    }
+    if sol_service is not None:
+        result["sol_metrics"] = sol_service.get_metrics()
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: Speicherbedarf der Registry und Kosten eines Inaktivitäts-Durchlaufs für das
+bisherige Peer-Modell (Instanz-__dict__, ISO-Zeitstempel) gegenüber dem Modell mit __slots__
+und monotonen Zeitstempeln.
+
+Ausführen aus src/ (wegen logs/):  python ../test/integration/bench_peer_model.py [anzahl]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from app.config import Config  # noqa: E402
+from model.peer import Peer  # noqa: E402
+
+
+class LegacyPeer:
+    """Peer-Modell vor der Umstellung."""
+
+    def __init__(self, ip, port, com_uuid=None, com_tcp=None, status=None):
+        self.ip = ip
+        self.port = port
+        self.com_uuid = com_uuid
+        self.com_tcp = com_tcp
+        self.is_sol = False
+        self.status = status or 200
+        self.sol_connection = None
+        self.last_interaction_timestamp = None
+
+    def set_last_interaction_timestamp(self):
+        self.last_interaction_timestamp = datetime.now().isoformat()
+
+
+def legacy_sweep(peers):
+    current_time = datetime.now()
+    return sum(
+        1
+        for peer in peers
+        if (current_time - datetime.fromisoformat(peer.last_interaction_timestamp)).total_seconds()
+        > Config.PEER_INACTIVITY_THRESHOLD
+    )
+
+
+def sweep(peers):
+    current_time = time.monotonic()
+    return sum(
+        1
+        for peer in peers
+        if peer.seconds_since_last_interaction(current_time) > Config.PEER_INACTIVITY_THRESHOLD
+    )
+
+
+def measure(peer_class, sweep_function, count):
+    tracemalloc.start()
+    peers = []
+    for i in range(count):
+        peer = peer_class(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", 8000, com_uuid=i, com_tcp=8000)
+        peer.set_last_interaction_timestamp()
+        peers.append(peer)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rounds = 20
+    start = time.perf_counter()
+    for _ in range(rounds):
+        sweep_function(peers)
+    elapsed = (time.perf_counter() - start) / rounds
+    return {
+        "bytes_per_peer": round(current / count),
+        "sweep_ms": round(elapsed * 1000, 2),
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(
+        json.dumps(
+            {
+                "count": count,
+                "dict_iso_timestamps": measure(LegacyPeer, legacy_sweep, count),
+                "slots_monotonic": measure(Peer, sweep, count),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: HELLO?-Antworten über UdpService.send_response mit neuem Socket pro Aufruf
+gegenüber den langlebigen Sende-Sockets.
+
+Ausführen aus src/ (wegen logs/):  python ../test/integration/bench_udp_send.py [anzahl]
+"""
+import json
+import os
+import socket
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from service.udp_service import UdpService  # noqa: E402
+
+RESPONSE = {
+    "star": "0123456789abcdef0123456789abcdef",
+    "sol": 1234,
+    "sol-ip": "127.0.0.1",
+    "sol-tcp": 8121,
+    "component": 4321,
+}
+
+
+class CountingSocket(socket.socket):
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingSocket.created += 1
+        super().__init__(*args, **kwargs)
+
+
+def send_with_new_socket(response, target_ip, target_port):
+    """Verhalten vor den langlebigen Sende-Sockets."""
+    udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp_socket.sendto(json.dumps(response).encode("utf-8"), (target_ip, target_port))
+    udp_socket.close()
+
+
+def run(send, count, port):
+    CountingSocket.created = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        send(RESPONSE, "127.0.0.1", port)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "sends_per_second": round(count / elapsed),
+        "sockets_created": CountingSocket.created,
+        # socket() und close() je neuem Socket zusätzlich zu sendto()
+        "syscalls_per_send": round(1 + CountingSocket.created * 2 / count, 3),
+        "peak_traced_bytes": peak,
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    port = sink.getsockname()[1]
+
+    socket.socket = CountingSocket
+    try:
+        results = {
+            "count": count,
+            "socket_per_call": run(send_with_new_socket, count, port),
+            "persistent_socket": run(UdpService.send_response, count, port),
+        }
+    finally:
+        socket.socket = CountingSocket.__bases__[0]
+        UdpService.close_sender_sockets()
+        sink.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import socket
+from unittest.mock import MagicMock
+
+import pytest
+
+from service.sol_service import SolService
+
+
+def _free_port(kind):
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]  # nach dem Schließen ist der Port wieder frei
+
+
+@pytest.fixture
+def free_udp_port():
+    """Liefert eine Funktion, die bei jedem Aufruf einen freien UDP-Port auf Loopback ermittelt."""
+    return lambda: _free_port(socket.SOCK_DGRAM)
+
+
+@pytest.fixture
+def free_tcp_port():
+    """Liefert eine Funktion, die bei jedem Aufruf einen freien TCP-Port auf Loopback ermittelt."""
+    return lambda: _free_port(socket.SOCK_STREAM)
+
+
+@pytest.fixture
+def sol_service():
+    """SolService ohne gestartete Listener, mit festen STAR-UUID, SOL-UUID und STAR_PORT."""
+    sol_service = SolService(MagicMock(), star_port=8121)
+    sol_service.star_uuid = "test-star-uuid"
+    sol_service.sol_uuid = 1234
+    return sol_service
@@ -0,0 +1,59 @@
+import socket
+import threading
+import time
+
+from service.udp_service import BatchedUdpReceiver, DatagramRing
+
+
+def test_ring_is_fifo_and_counts_overflow():
+    """
+    Test: Der Ringpuffer liefert Datagramme in Reihenfolge und zählt Überläufe.
+    """
+    ring = DatagramRing(capacity=2, buffer_size=16)
+    for offset, payload in enumerate([b"HELLO?\0", b"second"]):
+        ring.slot_view(offset)[: len(payload)] = payload
+        ring.set_slot(offset, len(payload), ("127.0.0.1", 1000 + offset))
+    ring.publish(2)
+
+    assert ring.free_slots() == 0
+    ring.record_overflow()
+
+    assert ring.take() == ("HELLO?", ("127.0.0.1", 1000))
+    assert ring.take() == ("second", ("127.0.0.1", 1001))
+    assert ring.received == 2
+    assert ring.overflows == 1
+
+    ring.close()
+    assert ring.take() is None
+
+
+def test_slow_handler_overflows_queue_instead_of_blocking_socket(free_udp_port):
+    """
+    Test: Ein blockierender Handler füllt nur die Queue; weitere Datagramme werden als Überlauf gezählt.
+    """
+    port = free_udp_port()
+    release = threading.Event()
+    handled = []
+
+    def slow_callback(message, addr):
+        release.wait(2)
+        handled.append(message)
+
+    receiver = BatchedUdpReceiver(port, slow_callback, queue_size=2, workers=1, batch_size=8)
+    thread = threading.Thread(target=receiver.serve_forever, daemon=True)
+    thread.start()
+    time.sleep(0.1)
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+        for i in range(10):
+            sender.sendto(f"HELLO? {i}\0".encode(), ("127.0.0.1", port))
+    time.sleep(0.3)
+
+    stats = receiver.stats()
+    assert stats["overflows"] > 0
+    assert stats["received"] + stats["overflows"] == 10
+
+    release.set()
+    time.sleep(0.2)
+    receiver.stop()
+    assert len(handled) == stats["received"]
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from service.tcp_service import HttpClient
+from utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+)
+
+
+def test_circuit_opens_after_threshold_and_recovers_via_half_open_probe():
+    """
+    Test: Nach N Fehlern wird sofort abgewiesen; nach der Öffnungszeit geht genau ein Probe-Request durch.
+    """
+    breaker = CircuitBreaker(failure_threshold=2, open_timeout=10, max_open_timeout=60)
+    dest = "10.0.0.1:8000"
+
+    breaker.record_failure(dest, now=0)
+    assert breaker.state(dest) == CLOSED
+    breaker.record_failure(dest, now=0)
+    assert breaker.state(dest) == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(dest, now=1)
+
+    breaker.before_request(dest, now=11)  # Probe
+    assert breaker.state(dest) == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(dest, now=11)  # nur ein Probe gleichzeitig
+
+    breaker.record_success(dest)
+    assert breaker.state(dest) == CLOSED
+    assert breaker.stats()["transitions"] == {
+        "closed->open": 1,
+        "open->half_open": 1,
+        "half_open->closed": 1,
+    }
+    assert breaker.stats()["circuits"] == {}
+
+
+def test_failed_probe_reopens_with_longer_timeout():
+    """
+    Test: Scheitert der Probe-Request, wird der Circuit mit verdoppelter Öffnungszeit erneut geöffnet.
+    """
+    breaker = CircuitBreaker(failure_threshold=1, open_timeout=10, max_open_timeout=60)
+    dest = "10.0.0.2:8000"
+
+    breaker.record_failure(dest, now=0)  # offen bis 5..10
+    breaker.before_request(dest, now=10)
+    breaker.record_failure(dest, now=10)  # offen bis 20..30
+
+    assert breaker.state(dest) == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(dest, now=19.9)
+
+
+def test_retry_policy_backoff_is_bounded():
+    """
+    Test: Die Wartezeit liegt zwischen 0 und min(max_delay, base * 2^n).
+    """
+    policy = RetryPolicy(attempts=5, base_delay=1, max_delay=4)
+    for attempt in range(5):
+        assert 0 <= policy.delay(attempt) <= min(4, 2 ** attempt)
+
+
+def test_http_client_fails_fast_for_unreachable_destination(free_tcp_port):
+    """
+    Test: Ein nicht erreichbares Ziel wird nach dem Öffnen des Circuits ohne Verbindungsversuch abgewiesen.
+    """
+    port = free_tcp_port()  # dort lauscht niemand
+    client = HttpClient(
+        connect_timeout=1,
+        read_timeout=1,
+        breaker=CircuitBreaker(failure_threshold=2, open_timeout=30),
+    )
+    url = f"http://127.0.0.1:{port}/vs/v1/system/1"
+
+    for _ in range(2):
+        with pytest.raises(Exception) as exc:
+            client.get(url)
+        assert not isinstance(exc.value, CircuitOpenError)
+
+    start = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        client.get(url, retry=RetryPolicy(attempts=3, base_delay=1))
+    assert time.monotonic() - start < 0.1
+    assert client.breaker.stats()["rejected"] == 1
+    client.close()
@@ -0,0 +1,73 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from service import discovery_codec
+from service.sol_service import SolService
+from service.udp_service import UdpService
+
+STAR_UUID = "0123456789abcdef0123456789abcdef"
+
+
+def test_hello_i_am_roundtrip():
+    """
+    Test: Eine binäre Galaxy-Ankündigung wird ohne String-Verarbeitung zur STAR-UUID dekodiert.
+    """
+    packet = UdpService.decode_datagram(discovery_codec.encode_hello_i_am(STAR_UUID))
+
+    assert packet == discovery_codec.DiscoveryPacket(discovery_codec.HELLO_I_AM, STAR_UUID, None)
+
+
+def test_binary_response_is_parsed_like_json_response():
+    """
+    Test: Eine binäre SOL-Antwort ergibt dieselben Felder wie die JSON-Antwort.
+    """
+    data = discovery_codec.encode_response_prefix(
+        STAR_UUID, 1234, "192.168.1.5", 8121
+    ) + discovery_codec.encode_response_suffix(4321, 3)
+
+    assert UdpService.parse_response(data) == {
+        "star": STAR_UUID,
+        "sol": 1234,
+        "sol-ip": "192.168.1.5",
+        "sol-tcp": 8121,
+        "component": 4321,
+        "no-com": 3,
+    }
+    assert len(data) < len(json.dumps(UdpService.parse_response(data)))
+
+
+def test_unknown_version_and_truncated_packets_are_rejected():
+    """
+    Test: Unbekannte Versionen und abgeschnittene Pakete führen zu ValueError.
+    """
+    hello_v2 = b"VS\x02\x01"
+    truncated = discovery_codec.encode_hello_i_am(STAR_UUID)[:10]
+
+    with pytest.raises(ValueError):
+        UdpService.decode_datagram(hello_v2)
+    with pytest.raises(ValueError):
+        UdpService.decode_datagram(truncated)
+    assert UdpService.decode_datagram(b"HELLO?\0") == "HELLO?"
+
+
+def test_sol_answers_binary_hello_in_binary_and_text_hello_in_json():
+    """
+    Test: SOL antwortet im Format der Anfrage.
+    """
+    sol_service = SolService(MagicMock())
+    sol_service.star_uuid = STAR_UUID
+    sol_service.sol_uuid = 1234
+
+    with patch("service.sol_service.UdpService.send_bytes") as send_bytes, patch(
+        "service.sol_service.Config.IP", "10.0.0.1"
+    ):
+        binary_hello = UdpService.decode_datagram(discovery_codec.encode_hello())
+        sol_service.handle_hello(binary_hello, ("10.0.0.2", 5000))
+        sol_service.handle_hello("HELLO?", ("10.0.0.3", 5000))
+
+    binary_reply = send_bytes.call_args_list[0][0][0]
+    text_reply = send_bytes.call_args_list[1][0][0]
+    assert UdpService.parse_response(binary_reply)["star"] == STAR_UUID
+    assert json.loads(text_reply)["star"] == STAR_UUID
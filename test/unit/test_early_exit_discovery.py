@@ -0,0 +1,42 @@
+import json
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+from app.config import Config
+from service.peer_service import PeerService
+from service.udp_service import UdpService
+
+
+def test_listen_for_responses_returns_after_grace_window(free_udp_port):
+    """
+    Test: Nach der ersten gültigen Antwort wird nur noch das Grace-Window abgewartet, nicht das volle Timeout.
+    """
+    port = free_udp_port()
+    response = {"star": "s", "sol": 1001, "sol-ip": "127.0.0.1", "sol-tcp": 8121}
+
+    def answer():
+        time.sleep(0.05)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            sender.sendto(json.dumps(response).encode(), ("127.0.0.1", port))
+
+    threading.Thread(target=answer).start()
+    start = time.monotonic()
+    responses = UdpService.listen_for_responses(port, timeout=3, grace=0.1)
+    elapsed = time.monotonic() - start
+
+    assert [r for r, _ in responses] == [response]
+    assert elapsed < 1
+
+
+def test_discovery_timeout_doubles_per_attempt_up_to_the_limit():
+    """
+    Test: Das Discovery-Timeout folgt einem festen Zeitplan: Startwert, pro Versuch verdoppelt, nach oben begrenzt.
+    """
+    with patch.object(Config, "DISCOVERY_INITIAL_TIMEOUT", 1.0), patch.object(
+        Config, "TIMEOUT_LISTENING_FOR_UPD_RESPONSE", 5
+    ):
+        timeouts = [PeerService._discovery_timeout(attempt) for attempt in range(4)]
+
+    assert timeouts == [1.0, 2.0, 4.0, 5]
@@ -0,0 +1,33 @@
+import threading
+
+from service.galaxy_handshake_queue import GalaxyHandshakeQueue
+
+
+def test_concurrent_announcements_of_one_star_are_coalesced():
+    """
+    Test: Solange ein Handshake für einen Stern läuft, erzeugen weitere Ankündigungen keinen neuen Request.
+    """
+    release = threading.Event()
+    calls = []
+
+    def handshake(star_uuid, ip):
+        calls.append(star_uuid)
+        release.wait(2)
+        return star_uuid
+
+    queue = GalaxyHandshakeQueue(handshake, max_workers=4)
+    first = queue.submit("star-a", "10.0.0.1")
+    second = queue.submit("star-a", "10.0.0.1")
+    other = queue.submit("star-b", "10.0.0.2")
+    release.set()
+
+    assert first is second
+    assert first.result(2) == "star-a"
+    assert other.result(2) == "star-b"
+    assert sorted(calls) == ["star-a", "star-b"]
+    assert queue.stats()["coalesced"] == 1
+
+    # nach Abschluss wird ein neuer Handshake gestartet
+    assert queue.submit("star-a", "10.0.0.1").result(2) == "star-a"
+    assert queue.stats()["in_flight"] == 0
+    queue.shutdown()
@@ -0,0 +1,32 @@
+def test_stars_are_indexed_by_uuid_and_sol_ip(sol_service):
+    """
+    Test: Sterne werden über star_uuid und SOL-IP gefunden; ein bekannter Stern wird nur aktualisiert.
+    """
+    sol_service.add_star("star-a", 1, "10.0.0.1", 8000, 2, 200)
+    sol_service.add_star("star-b", 2, "10.0.0.2", 8000, 1, 200)
+    sol_service.add_star("star-a", 1, "10.0.0.1", 8000, 2, "unregistered")
+
+    assert len(sol_service.get_star_list()) == 2
+    assert sol_service.get_star("star-a").status == "unregistered"
+    assert [s.star_uuid for s in sol_service.find_stars_by_sol_ip("10.0.0.2")] == ["star-b"]
+
+    sol_service.remove_star("star-b")
+    assert sol_service.get_star("star-b") is None
+    assert sol_service.find_stars_by_sol_ip("10.0.0.2") == ()
+
+
+def test_star_list_response_is_rebuilt_only_after_changes(sol_service):
+    """
+    Test: Die Antwort für list_all_stars wird zwischengespeichert und nach einer Änderung neu aufgebaut.
+    """
+    sol_service.add_star("star-a", 1, "10.0.0.1", 8000, 2, 200)
+
+    first = sol_service.get_star_list_response()
+    assert sol_service.get_star_list_response() is first
+    assert first["totalResults"] == 1
+
+    sol_service.update_star_status("star-a", "unregistered")
+    second = sol_service.get_star_list_response()
+    assert second is not first
+    assert second["stars"][0]["status"] == "unregistered"
+    assert first["stars"][0]["status"] == 200
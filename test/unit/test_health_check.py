@@ -0,0 +1,77 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from app.config import Config
+from model.peer import Peer
+from model.registry import ADDED
+from model.sol import SOL
+from service.sol_service import SolService
+
+
+def _sol_service_with_peers(count):
+    sol_service = SolService(MagicMock(com_uuid=1000), star_port=8121)
+    sol_service.star_uuid = "test-star-uuid"
+    sol_service.sol = SOL(1000, "test-star-uuid")
+    stale = time.monotonic() - Config.PEER_INACTIVITY_THRESHOLD - 5
+    for i in range(count):
+        peer = Peer("127.0.0.1", 9000 + i, com_uuid=2000 + i, com_tcp=9000 + i)
+        peer.last_interaction_timestamp = stale
+        sol_service.sol.add_peer(peer)
+    return sol_service
+
+
+def test_expired_peers_are_probed_concurrently_without_holding_the_registry_lock():
+    """
+    Test: Abgelaufene Peers werden parallel im Worker-Pool geprüft, ohne Registrierungen zu blockieren.
+    """
+    sol_service = _sol_service_with_peers(4)
+    registered_during_probe = []
+
+    def slow_probe(peer):
+        newcomer = Peer("127.0.0.2", 9100 + peer.com_uuid, com_uuid=3000 + peer.com_uuid)
+        registered_during_probe.append(sol_service.sol.add_peer(newcomer) == ADDED)
+        time.sleep(0.3)
+        if peer.com_uuid == 2003:
+            return None, ConnectionError("unreachable")
+        return 200, None
+
+    with patch.object(sol_service, "probe_component", side_effect=slow_probe):
+        start = time.monotonic()
+        for peer in sol_service.sol.registered_peers:
+            sol_service._on_peer_inactive(peer.com_uuid, peer)
+        sol_service.health_probes.shutdown(wait=True)
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 1.0  # langsamste Abfrage, nicht die Summe (1.2 s)
+    assert registered_during_probe == [True] * 4
+    peers = {p.com_uuid: p for p in sol_service.sol.registered_peers}
+    assert peers[2003].status == "disconnected"
+    assert peers[2000].status == 200
+    assert peers[2000].seconds_since_last_interaction(time.monotonic()) < 1
+    # beide werden weiter überwacht, unabhängig vom Ergebnis
+    assert 2000 in sol_service.inactivity and 2003 in sol_service.inactivity
+    sol_service.inactivity.clear()
+
+
+def test_only_overdue_peers_are_probed_when_monitoring_starts():
+    """
+    Test: check_peer_health prüft bereits überfällige Peers sofort; kürzlich aktive warten auf ihre Frist.
+    """
+    sol_service = _sol_service_with_peers(2)
+    fresh, stale = sol_service.sol.registered_peers
+    fresh.set_last_interaction_timestamp()
+    probed = threading.Event()
+
+    def probe(peer):
+        probed.set()
+        return 200, None
+
+    with patch.object(sol_service, "probe_component", side_effect=probe) as probe_component:
+        sol_service.check_peer_health()
+        assert probed.wait(1)
+        sol_service.health_probes.shutdown(wait=True)
+
+    probe_component.assert_called_once_with(stale)
+    assert fresh.com_uuid in sol_service.inactivity
+    sol_service.inactivity.clear()
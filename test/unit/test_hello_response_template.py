@@ -0,0 +1,29 @@
+import json
+
+from app.config import Config
+
+
+def test_hello_response_matches_previous_json_blob(sol_service):
+    """
+    Test: Die vorkodierte Antwort ist bytegleich mit dem bisher per json.dumps erzeugten Blob.
+    """
+
+    expected = {
+        "star": "test-star-uuid",
+        "sol": 1234,
+        "sol-ip": Config.IP,
+        "sol-tcp": 8121,
+        "component": 4321,
+    }
+    assert sol_service.build_hello_response(4321) == json.dumps(expected).encode("utf-8")
+
+
+def test_hello_response_template_is_rebuilt_on_change(sol_service):
+    """
+    Test: Eine Änderung der STAR-UUID verwirft die vorkodierte Antwort.
+    """
+    sol_service.build_hello_response(4321)
+
+    sol_service.star_uuid = "other-star-uuid"
+
+    assert json.loads(sol_service.build_hello_response(4321))["star"] == "other-star-uuid"
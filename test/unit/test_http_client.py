@@ -0,0 +1,113 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from service.tcp_service import HttpClient
+from utils.circuit_breaker import OPEN, CircuitBreaker, RetryPolicy
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports = set()
+
+    def do_GET(self):
+        _KeepAliveHandler.client_ports.add(self.client_address[1])
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_requests_to_one_host_reuse_a_pooled_connection():
+    """
+    Test: Aufeinanderfolgende Requests an denselben Host nutzen dieselbe Keep-Alive-Verbindung.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = HttpClient(pool_connections=2, pool_maxsize=2, connect_timeout=1, read_timeout=1)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/vs/v1/system/1"
+        responses = [client.get(url) for _ in range(5)]
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert len(_KeepAliveHandler.client_ports) == 1
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = []
+
+    def _answer(self):
+        _SlowHandler.hits.append(self.command)
+        if self.path == "/fail":
+            status, body = 500, b"error"
+        else:
+            time.sleep(0.3)  # länger als das Read-Timeout des Clients
+            status, body = 200, b"late"
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _answer
+
+    def log_message(self, *args):
+        pass
+
+
+def test_read_timeouts_are_retried_only_for_idempotent_methods():
+    """
+    Test: Ein GET wird nach einem Read-Timeout wiederholt, ein POST nicht, weil der Server ihn schon ausgeführt haben kann.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = HttpClient(connect_timeout=1, read_timeout=0.1, breaker=CircuitBreaker(failure_threshold=10))
+    url = f"http://127.0.0.1:{server.server_address[1]}/slow"
+    retry = RetryPolicy(attempts=3, base_delay=0)
+    try:
+        with pytest.raises(requests.ReadTimeout):
+            client.post(url, json={"subject": "once"}, retry=retry)
+        time.sleep(0.3)
+        posts = _SlowHandler.hits.count("POST")
+        with pytest.raises(requests.ReadTimeout):
+            client.get(url, retry=retry)
+        time.sleep(0.3)
+        gets = _SlowHandler.hits.count("GET")
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert posts == 1
+    assert gets == 3
+
+
+def test_server_errors_count_as_circuit_failures():
+    """
+    Test: 5xx-Antworten zählen für den Circuit Breaker als Fehler und öffnen nach dem Schwellwert den Circuit.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = HttpClient(connect_timeout=1, read_timeout=1, breaker=CircuitBreaker(failure_threshold=2))
+    destination = f"127.0.0.1:{server.server_address[1]}"
+    try:
+        responses = [client.get(f"http://{destination}/fail") for _ in range(2)]
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert [r.status_code for r in responses] == [500, 500]
+    assert client.breaker.state(destination) == OPEN
@@ -0,0 +1,225 @@
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+from flask import Flask, request
+
+from app.config import Config
+from service.tcp_service import HttpClient
+from utils import http_server
+from utils.http_server import KeepAliveWSGIRequestHandler, PooledWSGIServer
+
+
+def _start(app, **kwargs):
+    server = PooledWSGIServer("127.0.0.1", 0, app, **kwargs)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+def _wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def _stop(server):
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_are_served_over_keep_alive_connections():
+    """
+    Test: Mehrere Requests eines Clients laufen über eine Verbindung und werden in den Metriken gezählt.
+    """
+    app = Flask(__name__)
+    app.add_url_rule("/ping", "ping", lambda: "pong")
+    server = _start(app, workers=2, queue_size=4)
+    client = HttpClient(connect_timeout=1, read_timeout=1)
+    try:
+        responses = [client.get(f"http://127.0.0.1:{server.port}/ping") for _ in range(5)]
+        stats = server.stats()
+    finally:
+        client.close()
+        _stop(server)
+
+    assert [r.text for r in responses] == ["pong"] * 5
+    assert stats["accepted"] == 1
+    assert stats["workers"] == 2
+
+
+def test_full_queue_is_answered_with_503():
+    """
+    Test: Sind alle Worker belegt und ist die Warteschlange voll, wird sofort mit 503 geantwortet.
+    """
+    release = threading.Event()
+    app = Flask(__name__)
+    app.add_url_rule("/slow", "slow", lambda: (release.wait(2), "done")[1])
+    server = _start(app, workers=1, queue_size=1)
+    request = b"GET /slow HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+    connections = []
+    try:
+        for _ in range(3):
+            conn = socket.create_connection(("127.0.0.1", server.port), timeout=2)
+            conn.sendall(request)
+            connections.append(conn)
+            _wait_until(lambda: server.stats()["busy_workers"] == 1)
+        # die dritte Verbindung findet weder Worker noch Platz in der Warteschlange
+        rejected = connections[2].recv(1024)
+        release.set()
+        served = connections[0].recv(1024)
+        stats = server.stats()
+    finally:
+        release.set()
+        for conn in connections:
+            conn.close()
+        _stop(server)
+
+    assert rejected.startswith(b"HTTP/1.1 503")
+    assert served.startswith(b"HTTP/1.1 200")
+    assert stats["rejected"] == 1
+    assert stats["queue_capacity"] == 1
+
+
+def _read_response(conn):
+    """Read one response with Content-Length from a raw socket."""
+    data = b""
+    while b"\r\n\r\n" not in data:
+        data += conn.recv(4096)
+    head, _, body = data.partition(b"\r\n\r\n")
+    length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+    while len(body) < length:
+        body += conn.recv(4096)
+    return body
+
+
+def test_idle_keep_alive_connections_do_not_hold_a_worker():
+    """
+    Test: Eine offene, inaktive Keep-Alive-Verbindung wird geparkt; der einzige Worker bedient sofort die nächste Verbindung.
+    """
+    app = Flask(__name__)
+    app.add_url_rule("/ping", "ping", lambda: "pong")
+    server = _start(app, workers=1, queue_size=4)
+    request = b"GET /ping HTTP/1.1\r\nHost: x\r\n\r\n"
+    first = socket.create_connection(("127.0.0.1", server.port), timeout=2)
+    second = socket.create_connection(("127.0.0.1", server.port), timeout=2)
+    try:
+        first.sendall(request)
+        assert _read_response(first) == b"pong"
+        started = time.monotonic()
+        second.sendall(request)
+        assert _read_response(second) == b"pong"
+        waited = time.monotonic() - started
+        # beide Verbindungen bleiben offen und werden weiter bedient, auch mit zwei Requests am Stück
+        first.sendall(request * 2)
+        pipelined = b""
+        while pipelined.count(b"pong") < 2:
+            pipelined += first.recv(4096)
+        _wait_until(lambda: server.stats()["idle_connections"] == 2 and server.stats()["busy_workers"] == 0)
+        stats = server.stats()
+    finally:
+        first.close()
+        second.close()
+        _stop(server)
+
+    assert waited < 1
+    assert pipelined.count(b"HTTP/1.1 200 OK") == 2
+    assert stats["busy_workers"] == 0
+    assert stats["idle_connections"] == 2
+    assert stats["accepted"] == 2
+
+
+def test_parked_connections_are_closed_after_the_keep_alive_timeout():
+    """
+    Test: Eine geparkte Verbindung ohne neuen Request wird nach HTTP_SERVER_KEEPALIVE_TIMEOUT geschlossen.
+    """
+    app = Flask(__name__)
+    app.add_url_rule("/ping", "ping", lambda: "pong")
+    with patch.object(Config, "HTTP_SERVER_KEEPALIVE_TIMEOUT", 0.1):
+        server = _start(app, workers=1)
+        conn = socket.create_connection(("127.0.0.1", server.port), timeout=2)
+        try:
+            conn.sendall(b"GET /ping HTTP/1.1\r\nHost: x\r\n\r\n")
+            _read_response(conn)
+            closed = conn.recv(1) == b""
+        finally:
+            conn.close()
+            _stop(server)
+
+    assert closed
+    assert server.stats()["idle_connections"] == 0
+
+
+class _ShortTimeoutHandler(KeepAliveWSGIRequestHandler):
+    timeout = 0.2
+
+
+def test_client_stalling_in_the_headers_is_closed_without_an_error():
+    """
+    Test: Bleibt ein Client mitten in den Headern hängen, wird die Verbindung nach dem Timeout still geschlossen.
+    """
+    app = Flask(__name__)
+    app.add_url_rule("/ping", "ping", lambda: "pong")
+    server = _start(app, workers=1, handler=_ShortTimeoutHandler)
+    conn = socket.create_connection(("127.0.0.1", server.port), timeout=2)
+    try:
+        with patch.object(server, "handle_error") as handle_error:
+            conn.sendall(b"GET /ping HTTP/1.1\r\nHost: x\r\n")
+            closed = conn.recv(1) == b""
+            _wait_until(lambda: server.stats()["handled"] == 1)
+    finally:
+        conn.close()
+        _stop(server)
+
+    assert closed
+    handle_error.assert_not_called()
+
+
+def test_invalid_content_length_is_answered_with_400():
+    """
+    Test: Negative oder nicht numerische Content-Length wird sofort mit 400 beantwortet statt bis zum Timeout zu lesen.
+    """
+    app = Flask(__name__)
+    app.add_url_rule("/echo", "echo", lambda: request.get_data(), methods=["POST"])
+    server = _start(app, workers=1)
+    responses = []
+    try:
+        started = time.monotonic()
+        for length in (b"-1", b"abc"):
+            with socket.create_connection(("127.0.0.1", server.port), timeout=2) as conn:
+                conn.sendall(b"POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: " + length + b"\r\n\r\nabc")
+                responses.append(conn.recv(4096))
+        elapsed = time.monotonic() - started
+        with socket.create_connection(("127.0.0.1", server.port), timeout=2) as conn:
+            conn.sendall(b"POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: 3\r\n\r\nabc")
+            echoed = _read_response(conn)
+    finally:
+        _stop(server)
+
+    assert responses[0].startswith(b"HTTP/1.1 400")
+    assert responses[1].startswith(b"HTTP/1.1 400")
+    assert echoed == b"abc"
+    assert elapsed < 1
+
+
+def test_serve_signals_ready_once_the_port_accepts_connections(free_tcp_port):
+    """
+    Test: serve() setzt `ready` erst, wenn der Port lauscht; ein direkt danach gesendeter Request wird beantwortet.
+    """
+    app = Flask(__name__)
+    app.add_url_rule("/ping", "ping", lambda: "pong")
+    port = free_tcp_port()
+    ready = threading.Event()
+    threading.Thread(target=http_server.serve, args=(app, "127.0.0.1", port), kwargs={"ready": ready}, daemon=True).start()
+
+    assert ready.wait(2)
+    conn = socket.create_connection(("127.0.0.1", port), timeout=2)
+    try:
+        conn.sendall(b"GET /ping HTTP/1.1\r\nHost: x\r\n\r\n")
+        body = _read_response(conn)
+    finally:
+        conn.close()
+        server = next(s for s in http_server.active_servers if s.port == port)
+        server.shutdown()
+
+    assert body == b"pong"
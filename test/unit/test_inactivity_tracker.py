@@ -0,0 +1,70 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from model.peer import Peer
+from model.sol import SOL
+from service.inactivity_tracker import InactivityTracker
+from service.sol_service import SolService
+from utils.scheduler import Scheduler
+
+
+def test_only_entries_without_touch_expire():
+    """
+    Test: Ein Eintrag, der regelmäßig angefasst wird, läuft nicht ab; der andere genau einmal.
+    """
+    scheduler = Scheduler(max_workers=2)
+    expired = []
+    done = threading.Event()
+    tracker = InactivityTracker(
+        0.1, lambda key, item: (expired.append(key), done.set()), scheduler=scheduler
+    )
+    active, idle = object(), object()
+    tracker.touch("active", active)
+    tracker.touch("idle", idle)
+
+    for _ in range(6):
+        time.sleep(0.03)
+        tracker.touch("active", active)
+
+    assert done.wait(1)
+    assert expired == ["idle"]
+    assert "active" in tracker and "idle" not in tracker
+
+    tracker.forget("active")
+    time.sleep(0.15)
+    assert expired == ["idle"]
+    scheduler.stop()
+
+
+def test_idle_peer_is_probed_when_its_deadline_passes():
+    """
+    Test: Die SOL prüft eine Komponente, sobald deren Frist abläuft, und nur diese.
+    """
+    sol_service = SolService(MagicMock(com_uuid=1000), star_port=8121)
+    sol_service.sol = SOL(1000, "test-star-uuid")
+    sol_service.inactivity.threshold = 0.1
+    idle = Peer("127.0.0.1", 9000, com_uuid=2000, com_tcp=9000)
+    busy = Peer("127.0.0.1", 9001, com_uuid=2001, com_tcp=9001)
+    for peer in (idle, busy):
+        sol_service.sol.add_peer(peer)
+        sol_service.touch_peer(peer)
+
+    probed = threading.Event()
+
+    def failing_probe(peer):
+        sol_service.inactivity.threshold = 60  # nächste Frist liegt außerhalb des Tests
+        probed.set()
+        return None, OSError("down")
+
+    with patch.object(sol_service, "probe_component", side_effect=failing_probe) as probe:
+        for _ in range(5):
+            time.sleep(0.03)
+            sol_service.touch_peer(busy)
+        assert probed.wait(1)
+        time.sleep(0.02)
+
+    probe.assert_called_once_with(idle)
+    assert idle.status == "disconnected"
+    assert 2000 in sol_service.inactivity  # wird weiter überwacht
+    sol_service.inactivity.clear()
@@ -0,0 +1,141 @@
+import shutil
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Config
+from model.message import Message
+from service.message_service import MessageService
+from service.message_store import MessageStore
+from utils import record_log
+from utils.record_log import RecordLog
+
+
+def _open(directory, **kwargs):
+    return MessageService(MessageStore(str(directory), **kwargs))
+
+
+def _state(message_service):
+    messages, _ = message_service.list_messages(scope="all", view="header")
+    return messages
+
+
+def test_messages_survive_a_restart(tmp_path):
+    """
+    Test: Nach einem Neustart sind erstellte, geänderte und gelöschte Nachrichten in gleicher Reihenfolge wiederhergestellt.
+    """
+    message_service = _open(tmp_path)
+    for _ in range(3):
+        msg_id = message_service.generate_msg_id(1000)
+        message_service.add_message(Message("1000", "", f"subject {msg_id}", "text", msg_id))
+    message_service.update_message("2@1000", "changed", "text")
+    message_service.delete_message("1@1000")
+    before = _state(message_service)
+    message_service.close()
+
+    restored = _open(tmp_path)
+    assert _state(restored) == before
+    assert restored.count_messages("active") == 2
+    assert restored.get_message("2@1000").version == 2
+    assert restored.generate_msg_id(1000) == "4@1000"
+    restored.close()
+
+
+def test_torn_tail_is_truncated_and_appends_are_group_committed(tmp_path):
+    """
+    Test: Ein halb geschriebener Datensatz am Log-Ende wird verworfen; viele Appends teilen sich wenige fsyncs.
+    """
+    path = str(tmp_path / "records.log")
+    log = RecordLog(path, sync_interval=0.05)
+    log.open()
+    for i in range(200):
+        log.append(b"record %d" % i)
+    log.sync()
+    stats = log.stats()
+    log.close()
+    assert stats["unsynced_bytes"] == 0
+    assert 1 <= stats["syncs"] < 20
+
+    with open(path, "ab") as f:
+        f.write(b"\x20\x00\x00\x00\x01\x02")  # Header ohne Nutzdaten, wie nach einem Absturz
+    replayed = []
+    log = RecordLog(path)
+    assert log.open(replayed.append) == 200
+    log.append(b"after crash", durable=True)
+    log.close()
+    replayed.clear()
+    RecordLog(path).open(replayed.append)
+    assert replayed[0] == b"record 0" and replayed[-1] == b"after crash" and len(replayed) == 201
+
+
+def test_snapshot_shortens_the_log_and_replay_is_idempotent(tmp_path):
+    """
+    Test: Ein Snapshot kürzt das Log; auch ein Absturz zwischen Snapshot und Kürzen führt zum selben Zustand.
+    """
+    message_service = _open(tmp_path, compact_bytes=1)
+    for i in range(1, 6):
+        message_service.add_message(Message("1000", "", f"subject {i}", "text", f"{i}@1000"))
+    message_service.delete_message("3@1000")
+    old_log = tmp_path / "old.log"
+    shutil.copy(tmp_path / "messages.log", old_log)
+
+    message_service.snapshot_if_needed()
+    assert message_service.store.log.file_size() == 0
+    message_service.update_message("4@1000", "after snapshot", "text")
+    before = _state(message_service)
+    message_service.close()
+
+    restored = _open(tmp_path)
+    assert _state(restored) == before
+    restored.close()
+
+    # Absturz vor dem Kürzen: das alte Log liegt noch komplett neben dem Snapshot
+    shutil.copy(old_log, tmp_path / "messages.log")
+    replayed = _open(tmp_path)
+    assert [m["msg-id"] for m in _state(replayed)] == [m["msg-id"] for m in before]
+    assert replayed.count_messages("active") == 4
+    replayed.close()
+
+
+def test_store_directory_is_per_star_port_and_locked(tmp_path):
+    """
+    Test: Ohne Verzeichnis liegt der Store unter MESSAGE_STORE_DIR/<STAR_PORT>; ein zweiter Prozess bekommt ihn nicht.
+    """
+    with patch.object(Config, "MESSAGE_STORE_DIR", str(tmp_path)), patch.object(Config, "STAR_PORT", 8123):
+        store = MessageStore()
+    assert store.directory == str(tmp_path / "8123")
+    message_service = MessageService(store)
+
+    # flock gilt pro geöffneter Datei: ein zweites Öffnen verhält sich wie ein anderer Prozess
+    with pytest.raises(RuntimeError):
+        MessageService(MessageStore(store.directory))
+    message_service.close()
+    _open(store.directory).close()
+
+
+def test_rewrite_releases_a_durable_append_waiting_for_the_old_file(tmp_path):
+    """
+    Test: Ein durable append, der auf fsync wartet, wird durch ein gleichzeitiges rewrite freigegeben statt ewig zu warten.
+    """
+    log = RecordLog(str(tmp_path / "records.log"), sync_interval=0.01)
+    log.open()
+    log.append(b"before snapshot")
+
+    def stuck_disk(fd):
+        raise OSError("disk stuck")
+
+    with patch.object(record_log, "_fdatasync", stuck_disk):
+        waiter = threading.Thread(target=log.append, args=(b"waits for fsync",), kwargs={"durable": True})
+        waiter.start()
+        while log.stats()["appended"] < 2:
+            time.sleep(0.01)
+        log.rewrite(log.size() - len(b"waits for fsync") - 8)
+        waiter.join(timeout=2)
+        assert not waiter.is_alive()
+    log.close()
+
+    replayed = []
+    RecordLog(log.path).open(replayed.append)
+    assert replayed == [b"waits for fsync"]
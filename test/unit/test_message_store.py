@@ -0,0 +1,79 @@
+import json
+from unittest.mock import MagicMock
+
+from flask import Flask
+
+from app.config import Config
+from controller import sol_controller
+from model.message import Message
+from service.message_service import MessageService
+from service.sol_service import SolService
+
+
+def _store(count):
+    message_service = MessageService()
+    for i in range(1, count + 1):
+        message_service.add_message(Message("1000", "", f"subject {i}", "text", msg_id=f"{i}@1000"))
+    return message_service
+
+
+def test_pages_follow_the_cursor_and_skip_deleted_messages():
+    """
+    Test: list_messages liefert Seiten in Einfügereihenfolge; gelöschte Nachrichten fehlen nur im Scope active.
+    """
+    message_service = _store(5)
+    message_service.delete_message("2@1000")
+    message_service.delete_message("2@1000")
+
+    first, cursor = message_service.list_messages(limit=2)
+    second, cursor = message_service.list_messages(limit=2, cursor=cursor)
+    assert [m["msg-id"] for m in first + second] == ["1@1000", "3@1000", "4@1000", "5@1000"]
+    assert cursor is None
+    assert message_service.count_messages("active") == 4
+    assert message_service.count_messages("all") == 5
+
+    everything, cursor = message_service.list_messages(scope="all")
+    assert len(everything) == 5 and cursor is None
+    assert everything[1] == {"msg-id": "2@1000", "status": "deleted"}
+
+
+def test_list_route_accepts_limit_and_cursor():
+    """
+    Test: GET messages reicht limit und cursor durch, meldet die Gesamtzahl und lehnt ungültige Werte ab.
+    """
+    sol_service = SolService(MagicMock(com_uuid=1000), star_port=Config.STAR_PORT)
+    sol_service.star_uuid = "test-star-uuid"
+    app = Flask(__name__)
+    sol_controller.initialize_sol_endpoints(app, sol_service, _store(3))
+    client = app.test_client()
+    base_url = f"http://localhost:{Config.STAR_PORT}"
+    url = f"{Config.API_BASE_URL}/messages?star=test-star-uuid&limit=2"
+    headers = client.get(f"{url}&view=header", base_url=base_url)
+
+    first = client.get(url, base_url=base_url).get_json()
+    second = client.get(f"{url}&cursor={first['nextCursor']}", base_url=base_url).get_json()
+    invalid = client.get(f"{url}&cursor=abc", base_url=base_url)
+
+    assert first["totalResults"] == 3
+    assert [m["msg-id"] for m in first["messages"]] == ["1@1000", "2@1000"]
+    assert [m["msg-id"] for m in second["messages"]] == ["3@1000"]
+    assert second["nextCursor"] is None
+    assert invalid.status_code == 400
+    assert headers.mimetype == "application/json"
+    assert headers.get_json()["messages"][1]["subject"] == "subject 2"
+
+
+def test_json_fragments_are_cached_until_the_message_changes():
+    """
+    Test: Message.to_json liefert bis zu update/mark_deleted dasselbe Fragment und danach den neuen Stand.
+    """
+    message = Message("1000", "", "subject", "text", msg_id="1@1000")
+
+    header = message.to_json("header")
+    assert message.to_json("header") is header
+    assert json.loads(header) == message.to_dict("header")
+
+    message.update("new subject", "text")
+    assert json.loads(message.to_json("header"))["subject"] == "new subject"
+    message.mark_deleted()
+    assert json.loads(message.to_json("id")) == {"msg-id": "1@1000", "status": "deleted"}
@@ -0,0 +1,36 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Config
+from service.udp_service import UdpDiscoveryEngine, UdpService
+
+
+@patch.object(Config, "MULTICAST_INTERFACE", "127.0.0.1")
+@patch.object(Config, "DISCOVERY_MODE", "multicast")
+def test_multicast_hello_reaches_group_member(free_udp_port):
+    """
+    Test: Im Multicast-Modus wird HELLO? an die Gruppe gesendet und vom beigetretenen Listener empfangen.
+    """
+    port = free_udp_port()
+    received = threading.Event()
+    engine = UdpDiscoveryEngine(max_workers=1)
+    engine.add_listener(port, lambda message, addr: received.set())
+    try:
+        engine.start()
+        if not engine._transports:
+            pytest.skip("multicast not available in this environment")
+        UdpService.broadcast_message(port, "HELLO?")
+        assert received.wait(2)
+    finally:
+        engine.stop()
+        UdpService.close_sender_sockets()
+
+
+@patch.object(Config, "DISCOVERY_MODE", "multicast")
+def test_discovery_target_uses_group_in_multicast_mode():
+    """
+    Test: Discovery-Nachrichten gehen im Multicast-Modus an die konfigurierte Gruppe.
+    """
+    assert UdpService.discovery_target(8121) == (Config.MULTICAST_GROUP, 8121)
@@ -0,0 +1,55 @@
+from model.peer import Peer
+from model.registry import ADDED, DUPLICATE, FULL
+from model.sol import SOL
+
+
+def _sol_with_peers(*peers):
+    sol = SOL(1000, "test-star-uuid")
+    for peer in peers:
+        sol.add_peer(peer)
+    return sol
+
+
+def test_lookup_by_uuid_and_ip():
+    """
+    Test: Komponenten werden über com_uuid und über die IP gefunden, Abmelden pflegt beide Indizes.
+    """
+    first = Peer("10.0.0.1", 8001, com_uuid=2001, com_tcp=8001)
+    second = Peer("10.0.0.1", 8002, com_uuid=2002, com_tcp=8002)
+    sol = _sol_with_peers(first, second)
+
+    assert sol.find_peer(2002) is second
+    assert sol.find_peers_by_ip("10.0.0.1") == (first, second)
+
+    sol.remove_peer(first)
+    assert sol.find_peer(2001) is None
+    assert sol.find_peers_by_ip("10.0.0.1") == (second,)
+    assert len(sol.registered_peers) == 1
+
+
+def test_add_checks_capacity_and_duplicates_atomically():
+    """
+    Test: Volle SOL und doppelte com_uuid werden beim Einfügen erkannt.
+    """
+    sol = _sol_with_peers(Peer("10.0.0.1", 8001, com_uuid=2001))
+
+    assert sol.add_peer(Peer("10.0.0.2", 8002, com_uuid=2001)) == DUPLICATE
+    assert sol.add_peer(Peer("10.0.0.2", 8002, com_uuid=2002), capacity=2) == ADDED
+    assert sol.add_peer(Peer("10.0.0.3", 8003, com_uuid=2003), capacity=2) == FULL
+    assert [p.com_uuid for p in sol.registered_peers] == [2001, 2002]
+
+
+def test_snapshots_are_not_affected_by_later_writes():
+    """
+    Test: Ein Snapshot bleibt unverändert, während danach registriert und abgemeldet wird.
+    """
+    peer = Peer("10.0.0.1", 8001, com_uuid=2001)
+    sol = _sol_with_peers(peer)
+    snapshot = sol.registered_peers
+
+    sol.add_peer(Peer("10.0.0.2", 8002, com_uuid=2002))
+    sol.remove_peer(peer)
+
+    assert [p.com_uuid for p in snapshot] == [2001]
+    assert snapshot.get(2001) is peer
+    assert [p.com_uuid for p in sol.registered_peers] == [2002]
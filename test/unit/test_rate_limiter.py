@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock, patch
+
+from service.sol_service import SolService
+from utils.rate_limiter import DedupCache, TokenBucketLimiter
+
+
+def test_token_bucket_limits_per_key_and_refills():
+    """
+    Test: Nach dem Burst werden weitere Anfragen derselben Quelle abgelehnt, andere Quellen nicht.
+    """
+    limiter = TokenBucketLimiter(rate=1, burst=2, max_keys=10)
+
+    assert limiter.allow("10.0.0.1", now=0)
+    assert limiter.allow("10.0.0.1", now=0)
+    assert not limiter.allow("10.0.0.1", now=0)
+    assert limiter.allow("10.0.0.2", now=0)
+    assert limiter.allow("10.0.0.1", now=1.0)
+    assert limiter.limited == 1
+
+
+def test_dedup_cache_expires_and_evicts_lru():
+    """
+    Test: Einträge laufen nach dem Fenster ab; bei voller Kapazität wird der älteste verdrängt.
+    """
+    cache = DedupCache(window=2, max_entries=2)
+    cache.put("a", 1, now=0)
+    cache.put("b", 2, now=0)
+    assert cache.get("a", now=1) == 1
+    cache.put("c", 3, now=1)
+
+    assert cache.get("b", now=1) is None
+    assert cache.evictions == 1
+    assert cache.get("a", now=3) is None
+
+
+def test_repeated_hello_gets_cached_com_uuid():
+    """
+    Test: Ein wiederholtes HELLO? innerhalb des Fensters erhält dieselbe COM-UUID ohne neue Vergabe.
+    """
+    sol_service = SolService(MagicMock())
+    sol_service.star_uuid = "star"
+    sol_service.sol_uuid = 1000
+
+    with patch("service.sol_service.UdpService.send_bytes") as send_bytes, patch(
+        "service.sol_service.UuidGenerator.generate_com_uuid", side_effect=[4242, 4343]
+    ) as generate:
+        sol_service.handle_hello("HELLO?", ("10.0.0.9", 5000))
+        sol_service.handle_hello("HELLO?", ("10.0.0.9", 5000))
+
+    assert generate.call_count == 1
+    assert send_bytes.call_args_list[0] == send_bytes.call_args_list[1]
+    assert sol_service.get_hello_stats()["deduplicated"] == 1
+
+
+def test_hello_from_two_ports_on_one_ip_gets_two_com_uuids():
+    """
+    Test: HELLO? von zwei Quell-Ports derselben IP sind verschiedene Komponenten und erhalten je eine eigene COM-UUID.
+    """
+    sol_service = SolService(MagicMock())
+    sol_service.star_uuid = "star"
+    sol_service.sol_uuid = 1000
+
+    with patch("service.sol_service.UdpService.send_bytes") as send_bytes, patch(
+        "service.sol_service.UuidGenerator.generate_com_uuid", side_effect=[4242, 4343]
+    ) as generate:
+        sol_service.handle_hello("HELLO?", ("10.0.0.9", 5000))
+        sol_service.handle_hello("HELLO?", ("10.0.0.9", 5001))
+
+    assert generate.call_count == 2
+    assert send_bytes.call_args_list[0] != send_bytes.call_args_list[1]
+    assert sol_service.get_hello_stats()["deduplicated"] == 0
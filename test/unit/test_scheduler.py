@@ -0,0 +1,81 @@
+import threading
+import time
+
+from utils.scheduler import Scheduler
+
+
+def test_one_shot_timers_fire_in_deadline_order():
+    """
+    Test: Einmalige Timer laufen nach ihrer Fälligkeit, nicht nach der Reihenfolge des Einplanens.
+    """
+    scheduler = Scheduler(max_workers=1)
+    fired = []
+    done = threading.Event()
+
+    scheduler.schedule(0.15, lambda: (fired.append("late"), done.set()))
+    scheduler.schedule(0.05, fired.append, "early")
+
+    assert done.wait(2)
+    assert fired == ["early", "late"]
+    scheduler.stop()
+
+
+def test_cancel_and_reschedule():
+    """
+    Test: Abgebrochene Timer feuern nicht, verschobene Timer feuern erst zum neuen Zeitpunkt.
+    """
+    scheduler = Scheduler(max_workers=2)
+    fired = []
+    done = threading.Event()
+
+    cancelled = scheduler.schedule(0.05, fired.append, "cancelled")
+    moved = scheduler.schedule(0.05, lambda: (fired.append("moved"), done.set()))
+    cancelled.cancel()
+    start = time.monotonic()
+    moved.reschedule(0.2)
+
+    assert done.wait(2)
+    assert time.monotonic() - start >= 0.2
+    assert fired == ["moved"]
+    assert scheduler.stats()["pending"] == 0
+    scheduler.stop()
+
+
+def test_periodic_timer_runs_until_cancelled():
+    """
+    Test: Periodische Timer werden nach jedem Lauf neu eingeplant, bis sie abgebrochen werden.
+    """
+    scheduler = Scheduler(max_workers=2)
+    runs = []
+    third_run = threading.Event()
+
+    def tick():
+        runs.append(time.monotonic())
+        if len(runs) == 3:
+            third_run.set()
+
+    handle = scheduler.schedule_periodic(0.05, tick, initial_delay=0)
+    assert third_run.wait(2)
+    handle.cancel()
+    count = len(runs)
+    time.sleep(0.15)
+
+    assert len(runs) == count
+    scheduler.stop()
+
+
+def test_many_timers_are_cheap():
+    """
+    Test: Tausende Timer pro Peer belegen keinen eigenen Thread und lassen sich wieder abbrechen.
+    """
+    scheduler = Scheduler(max_workers=2)
+    threads_before = threading.active_count()
+
+    handles = [scheduler.schedule(60, lambda: None) for _ in range(5000)]
+    assert scheduler.stats()["pending"] == 5000
+    assert threading.active_count() <= threads_before + 1
+
+    for handle in handles:
+        handle.cancel()
+    assert scheduler.stats()["pending"] == 0
+    scheduler.stop()
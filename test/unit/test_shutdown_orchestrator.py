@@ -0,0 +1,116 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from model.peer import Peer
+from model.sol import SOL
+from service.shutdown_orchestrator import (
+    FAILED,
+    REJECTED,
+    SUCCESS,
+    TIMED_OUT,
+    ShutdownOrchestrator,
+    ShutdownTarget,
+)
+from service.sol_service import SolService
+
+
+class _FakeClient:
+    """Antwortet je URL mit einer Folge von Statuscodes bzw. Exceptions; 'hang' blockiert."""
+
+    def __init__(self, script):
+        self.script = {url: list(answers) for url, answers in script.items()}
+        self.calls = []
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+
+    def delete(self, url, timeout=None):
+        with self.lock:
+            self.calls.append(url)
+            answer = self.script[url].pop(0)
+        if answer == "hang":
+            self.release.wait(timeout)
+            raise requests.Timeout("read timed out")
+        if isinstance(answer, Exception):
+            raise answer
+        return MagicMock(status_code=answer)
+
+
+def _target(name, final_statuses=(401,)):
+    return ShutdownTarget(name=name, url=f"http://{name}/", final_statuses=final_statuses)
+
+
+def test_outcomes_are_reported_per_target():
+    """
+    Test: Erfolg, Ablehnung ohne Wiederholung und Fehlschlag nach allen Versuchen werden je Ziel gemeldet.
+    """
+    client = _FakeClient(
+        {
+            "http://ok/": [200],
+            "http://retry/": [requests.ConnectionError("refused"), 200],
+            "http://denied/": [401],
+            "http://broken/": [500, 500],
+        }
+    )
+    orchestrator = ShutdownOrchestrator(deadline=2, attempts=2, retry_delay=0.01, client=client)
+
+    report = orchestrator.run(
+        [_target("ok"), _target("retry"), _target("denied"), _target("broken")]
+    )
+
+    assert report["ok"] == (SUCCESS, 200)
+    assert report["retry"] == (SUCCESS, 200)
+    assert report["denied"] == (REJECTED, 401)
+    assert report["broken"] == (FAILED, 500)
+    assert client.calls.count("http://denied/") == 1
+
+
+def test_shutdown_is_bounded_by_the_deadline():
+    """
+    Test: Hängende Ziele verzögern den Shutdown nicht über die Deadline hinaus, alle Ziele laufen parallel.
+    """
+    script = {f"http://dead-{i}/": ["hang", "hang"] for i in range(10)}
+    script["http://ok/"] = [200]
+    client = _FakeClient(script)
+    orchestrator = ShutdownOrchestrator(deadline=0.5, max_workers=16, client=client)
+
+    start = time.monotonic()
+    report = orchestrator.run([_target("ok")] + [_target(f"dead-{i}") for i in range(10)])
+    elapsed = time.monotonic() - start
+    client.release.set()
+
+    assert elapsed < 1.0
+    assert report["ok"] == (SUCCESS, 200)
+    assert all(report[f"dead-{i}"][0] == TIMED_OUT for i in range(10))
+
+
+def test_sol_unregisters_stars_and_peers_in_one_run():
+    """
+    Test: shutdown_and_exit meldet aktive Sterne und alle Komponenten in einem gemeinsamen Lauf ab.
+    """
+    sol_service = SolService(MagicMock(com_uuid=1000), star_port=8121)
+    sol_service.star_uuid = "test-star-uuid"
+    sol_service.sol = SOL(1000, "test-star-uuid")
+    reachable = Peer("127.0.0.1", 9000, com_uuid=2000, com_tcp=9000)
+    unreachable = Peer("127.0.0.1", 9001, com_uuid=2001, com_tcp=9001)
+    for peer in (reachable, unreachable):
+        sol_service.sol.add_peer(peer)
+    sol_service.add_star("active-star", 3000, "10.0.0.1", 8000, 1, 200)
+    sol_service.add_star("gone-star", 3001, "10.0.0.2", 8000, 1, 410)
+    runs = []
+
+    def run(targets):
+        runs.append([target.name for target in targets])
+        return {"peer 2000": (SUCCESS, 200), "peer 2001": (FAILED, 500)}
+
+    with patch("service.sol_service.ShutdownOrchestrator") as orchestrator, \
+            patch.object(sol_service, "_exit") as exit_sol:
+        orchestrator.return_value.run.side_effect = run
+        sol_service.shutdown_and_exit()
+
+    assert runs == [["star active-star", "peer 2000", "peer 2001"]]
+    assert unreachable.status == "disconnected" and reachable.status == 200
+    assert len(sol_service.sol.peers) == 0
+    exit_sol.assert_called_once()
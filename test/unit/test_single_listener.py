@@ -0,0 +1,53 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from app.config import Config
+from controller import sol_controller
+from model.peer import Peer
+from model.sol import SOL
+from service.message_service import MessageService
+from service.sol_service import SolService
+from service.tcp_service import HttpClient
+from utils.http_server import PooledWSGIServer
+
+
+def test_one_server_serves_star_and_galaxy_routes_on_their_own_port(free_tcp_port):
+    """
+    Test: Ein Server lauscht auf STAR_PORT und GALAXY_PORT; Star-Routen antworten nur über STAR_PORT,
+    Galaxy-Routen nur über GALAXY_PORT.
+    """
+    star_port, galaxy_port = free_tcp_port(), free_tcp_port()
+    with patch.object(Config, "STAR_PORT", star_port), patch.object(Config, "GALAXY_PORT", galaxy_port):
+        sol_service = SolService(MagicMock(com_uuid=1000), star_port=star_port)
+        sol_service.star_uuid = "test-star-uuid"
+        sol_service.sol = SOL(1000, "test-star-uuid")
+        sol_service.sol.add_peer(Peer("127.0.0.1", 9000, com_uuid=2000, com_tcp=9000))
+        app = Flask(__name__)
+        sol_controller.initialize_sol_endpoints(app, sol_service, MessageService())
+
+        server = PooledWSGIServer("127.0.0.1", [star_port, galaxy_port], app, workers=2)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        client = HttpClient(connect_timeout=1, read_timeout=1)
+        star_patch = {"sol": 1, "sol-ip": "10.0.0.9", "sol-tcp": 8000, "no-com": 1, "status": 200}
+        try:
+            status_url = f"{Config.API_BASE_URL}/2000?star=test-star-uuid"
+            star_url = f"{Config.API_BASE_URL_STAR}/other-star"
+            on_star_port = client.get(f"http://127.0.0.1:{star_port}{status_url}")
+            status_on_galaxy_port = client.get(f"http://127.0.0.1:{galaxy_port}{status_url}")
+            on_galaxy_port = client.patch(f"http://127.0.0.1:{galaxy_port}{star_url}", json=star_patch)
+            galaxy_on_star_port = client.patch(f"http://127.0.0.1:{star_port}{star_url}", json=star_patch)
+            stats = server.stats()
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+    assert on_star_port.status_code == 200
+    assert status_on_galaxy_port.status_code == 404
+    assert on_galaxy_port.status_code == 200
+    assert galaxy_on_star_port.status_code == 404
+    assert [star.star_uuid for star in sol_service.get_star_list()] == ["other-star"]
+    assert stats["ports"] == [star_port, galaxy_port]
+    assert stats["accepted"] == 2  # eine Keep-Alive-Verbindung pro Port
@@ -142,7 +142,7 @@ class TestSOLService:
 
         # Act
         with pytest.raises(SystemExit) as e:
-            mock_sol_service.unregister_all_peers_and_exit()
+            mock_sol_service.shutdown_and_exit()
 
         # Assert
         assert e.value.code == Config.SOL_EXIT_CODE
@@ -165,7 +165,7 @@ class TestSOLService:
 
         # Act
         with pytest.raises(SystemExit) as e:
-            mock_sol_service.unregister_all_peers_and_exit()
+            mock_sol_service.shutdown_and_exit()
 
         # Assert
         assert e.value.code == Config.SOL_EXIT_CODE
@@ -187,7 +187,7 @@ class TestSOLService:
 
         # Act
         with pytest.raises(SystemExit) as e:
-            mock_sol_service.unregister_all_peers_and_exit()
+            mock_sol_service.shutdown_and_exit()
 
         # Assert
         assert e.value.code == Config.SOL_EXIT_CODE
@@ -206,7 +206,7 @@ class TestSOLService:
 
         # Act
         with pytest.raises(SystemExit) as e:
-            mock_sol_service.unregister_all_peers_and_exit()
+            mock_sol_service.shutdown_and_exit()
 
         # Assert
         assert e.value.code == Config.SOL_EXIT_CODE
@@ -228,7 +228,7 @@ class TestSOLService:
 
         # Act
         with pytest.raises(SystemExit) as e:
-            mock_sol_service.unregister_all_peers_and_exit()
+            mock_sol_service.shutdown_and_exit()
 
         # Assert
         assert e.value.code == Config.SOL_EXIT_CODE
@@ -0,0 +1,39 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from model.peer import Peer
+from service.peer_service import PeerService
+from service.sol_service import SolService
+
+
+def test_new_sol_waits_for_its_rest_api_and_manages_on_a_thread():
+    """
+    Test: initialize_as_sol wartet auf die Bereitschaft des HTTP-Servers und startet manage() in einem eigenen Thread.
+    """
+    peer = Peer("127.0.0.1", 8121)
+    peer_service = PeerService(peer, SolService(peer, star_port=8121))
+    ready = threading.Event()
+    managed = threading.Event()
+    calls = []
+
+    def manage():
+        calls.append(("manage", threading.current_thread(), ready.is_set()))
+        managed.set()
+
+    sol_manager = MagicMock()
+    sol_manager.wait_until_ready.side_effect = lambda timeout: (ready.set(), True)[1]
+    sol_manager.manage.side_effect = manage
+
+    with patch("service.peer_service.SolManager", return_value=sol_manager), \
+            patch("service.peer_service.time.sleep") as sleep:
+        with pytest.raises(SystemExit):
+            peer_service.initialize_as_sol(MagicMock())
+        assert managed.wait(1)
+
+    sleep.assert_not_called()
+    [(_, thread, was_ready)] = calls
+    assert thread is not threading.current_thread()
+    assert was_ready
+    assert peer_service.sol_service.sol.star_uuid == peer_service.sol_service.star_uuid
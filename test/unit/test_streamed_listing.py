@@ -0,0 +1,97 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from app.config import Config
+from controller import sol_controller
+from model.message import Message
+from model.sol import SOL
+from service.message_service import MessageService, send_list_messages_page_request
+from service.sol_service import SolService
+from utils.http_server import PooledWSGIServer
+from utils.json_stream import JsonArrayStream, iter_json_object
+
+
+def test_array_items_are_parsed_from_arbitrary_chunks():
+    """
+    Test: JsonArrayStream liefert die Array-Elemente und übrigen Felder auch bei Chunks, die mitten in Werten enden.
+    """
+    body = "".join(
+        iter_json_object(
+            {"star": "ä-star", "totalResults": 12345},
+            "messages",
+            [[json.dumps({"msg-id": f"{i}@1000", "subject": "ü" * i}) for i in range(10)], []],
+            lambda: {"nextCursor": 10},
+        )
+    ).encode()
+
+    for size in (1, 3, 64):
+        stream = JsonArrayStream((body[i : i + size] for i in range(0, len(body), size)), "messages")
+        messages = list(stream)
+        assert [m["msg-id"] for m in messages] == [f"{i}@1000" for i in range(10)]
+        assert stream.fields == {"star": "ä-star", "totalResults": 12345, "nextCursor": 10}
+
+
+def test_large_message_and_star_lists_are_streamed_chunked(free_tcp_port):
+    """
+    Test: Oberhalb von STREAM_THRESHOLD antworten messages und stars chunked; der Client liest die Seite inkl. nextCursor.
+    """
+    star_port, galaxy_port = free_tcp_port(), free_tcp_port()
+    message_service = MessageService()
+    for i in range(1, 8):
+        message_service.add_message(Message("1000", "", f"subject {i}", "text", msg_id=f"{i}@1000"))
+    message_service.delete_message("3@1000")
+
+    with patch.object(Config, "STAR_PORT", star_port), patch.object(Config, "GALAXY_PORT", galaxy_port), \
+            patch.object(Config, "STREAM_THRESHOLD", 2), patch.object(Config, "STREAM_BATCH_SIZE", 2):
+        sol_service = SolService(MagicMock(com_uuid=1000), star_port=star_port)
+        sol_service.star_uuid = "test-star-uuid"
+        for i in range(5):
+            sol_service.add_star(f"star-{i}", 1000 + i, f"10.0.0.{i}", 8000, 1, 200)
+        app = Flask(__name__)
+        sol_controller.initialize_sol_endpoints(app, sol_service, message_service)
+        server = PooledWSGIServer("127.0.0.1", [star_port, galaxy_port], app, workers=2)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        try:
+            first, cursor = send_list_messages_page_request("127.0.0.1", star_port, "test-star-uuid", limit=5)
+            rest, last_cursor = send_list_messages_page_request(
+                "127.0.0.1", star_port, "test-star-uuid", limit=5, cursor=cursor
+            )
+            stars = app.test_client().get(
+                Config.API_BASE_URL_STAR, base_url=f"http://localhost:{galaxy_port}"
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    assert [m["msg-id"] for m in first] == ["1@1000", "2@1000", "4@1000", "5@1000", "6@1000"]
+    assert [m["msg-id"] for m in rest] == ["7@1000"]
+    assert last_cursor is None
+    assert stars.is_streamed
+    assert stars.get_json()["totalResults"] == 5
+    assert [s["star"] for s in stars.get_json()["stars"]] == [f"star-{i}" for i in range(5)]
+
+
+def test_star_info_reports_the_registered_components():
+    """
+    Test: GET star/<uuid> liefert die eigene SOL mit der Zahl registrierter Komponenten; fremde Sterne sind 404.
+    """
+    sol_service = SolService(MagicMock(com_uuid=1000), star_port=Config.STAR_PORT)
+    sol_service.star_uuid = "test-star-uuid"
+    sol_service.sol = SOL(1000, "test-star-uuid")
+    for com_uuid in (1000, 2000, 3000):
+        sol_service.sol.add_peer(MagicMock(com_uuid=com_uuid, ip="127.0.0.1"))
+    app = Flask(__name__)
+    sol_controller.initialize_sol_endpoints(app, sol_service, MessageService())
+    client = app.test_client()
+    base_url = f"http://localhost:{Config.GALAXY_PORT}"
+
+    own = client.get(f"{Config.API_BASE_URL_STAR}/test-star-uuid", base_url=base_url)
+    unknown = client.get(f"{Config.API_BASE_URL_STAR}/other-star", base_url=base_url)
+
+    assert own.status_code == 200
+    assert own.get_json()["sol"] == 1000
+    assert own.get_json()["no-com"] == 3
+    assert unknown.status_code == 404
@@ -0,0 +1,56 @@
+import socket
+import threading
+
+from service.udp_service import UdpDiscoveryEngine
+
+
+def test_engine_serves_multiple_ports_from_one_loop(free_udp_port):
+    """
+    Test: Beide Ports werden von derselben Engine bedient und die Callbacks erhalten die dekodierte Nachricht.
+    """
+    star_port, galaxy_port = free_udp_port(), free_udp_port()
+    received = {}
+    done = threading.Event()
+
+    def handler(name):
+        def callback(message, addr):
+            received[name] = message
+            if len(received) == 2:
+                done.set()
+        return callback
+
+    engine = UdpDiscoveryEngine(max_workers=2)
+    engine.add_listener(star_port, handler("star"))
+    engine.add_listener(galaxy_port, handler("galaxy"))
+    engine.start()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            sender.sendto(b"HELLO?\0", ("127.0.0.1", star_port))
+            sender.sendto(b"HELLO? I AM abc\0", ("127.0.0.1", galaxy_port))
+        assert done.wait(2)
+    finally:
+        engine.stop()
+
+    assert received == {"star": "HELLO?", "galaxy": "HELLO? I AM abc"}
+
+
+def test_slow_handler_does_not_block_other_ports(free_udp_port):
+    """
+    Test: Ein blockierender Callback hält die Verarbeitung auf einem anderen Port nicht auf.
+    """
+    slow_port, fast_port = free_udp_port(), free_udp_port()
+    release = threading.Event()
+    fast_received = threading.Event()
+
+    engine = UdpDiscoveryEngine(max_workers=2)
+    engine.add_listener(slow_port, lambda message, addr: release.wait(2))
+    engine.add_listener(fast_port, lambda message, addr: fast_received.set())
+    engine.start()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            sender.sendto(b"HELLO?\0", ("127.0.0.1", slow_port))
+            sender.sendto(b"HELLO?\0", ("127.0.0.1", fast_port))
+        assert fast_received.wait(1)
+    finally:
+        release.set()
+        engine.stop()